@@ -1,5 +1,21 @@
 from .frame_buffer import FrameBuffer
 from .decode_fastnet import decode_frame, decode_ascii_frame
+from .batch import decode_frames, FrameColumns, ChannelColumn
+from .parallel import decode_file
 from .logger import logger, set_log_level  # Import set_log_level for user control
+from .sync import find_header_offsets, iter_frames
+from .records import ChannelValue, FrameRecord
+from .lazy_frame import LazyFrame
+from .cache import DecodeCache, FrameCache
+from .state import BoatState
+from .delta import DeltaFilter
+from .aio import AsyncFrameBuffer
+from .transport import SerialTransport
+from .pipeline import FramePipeline, BatchChannel
+from .capture import CaptureWriter, CaptureReader, iter_records
+from .channel_index import ChannelIndex
+from .export import CsvExporter, JsonLinesExporter
+from .columnar import to_arrow, to_dataframe
+from .backpressure import DropNewest, DropOldest, CoalesceLatest, DropStale, Block
 
-__all__ = ["FrameBuffer", "decode_frame", "decode_ascii_frame", "logger", "set_log_level"]
\ No newline at end of file
+__all__ = ["FrameBuffer", "AsyncFrameBuffer", "SerialTransport", "FramePipeline", "BatchChannel", "DropNewest", "DropOldest", "CoalesceLatest", "DropStale", "Block", "CaptureWriter", "CaptureReader", "ChannelIndex", "CsvExporter", "JsonLinesExporter", "to_arrow", "to_dataframe", "iter_records", "decode_frame", "decode_ascii_frame", "decode_frames", "decode_file", "FrameColumns", "ChannelColumn", "find_header_offsets", "iter_frames", "ChannelValue", "FrameRecord", "LazyFrame", "DecodeCache", "FrameCache", "BoatState", "DeltaFilter", "logger", "set_log_level"]
\ No newline at end of file
@@ -0,0 +1,170 @@
+import asyncio
+import time
+from .frame_buffer import FrameBuffer
+from .logger import logger
+
+
+"""
+asyncio Support
+===============
+
+`AsyncFrameBuffer` is a `FrameBuffer` for asyncio applications. Its `frame_queue` is an
+`asyncio.Queue`, so queueing a frame takes no thread lock and a waiting consumer is
+woken by the event loop instead of polling. Any `overflow` policy except `Block` can be used.
+
+Bytes can be fed in three ways:
+- `feed(data)` from any coroutine or callback running on the loop.
+- `read_from(reader)`, which reads an `asyncio.StreamReader` until EOF.
+- `protocol()`, which returns an `asyncio.Protocol` for `loop.create_connection` or
+  serial transports such as pyserial-asyncio.
+
+Consumers iterate the decoded frames with `async for`; iteration ends once the buffer is
+closed (at EOF, when the connection is lost, or on `close()`) and the queue is drained,
+for every consumer iterating it. The queue is created on first use inside the running loop.
+
+Example:
+--------
+reader, _ = await asyncio.open_connection("gateway.local", 10110)
+frame_buffer = AsyncFrameBuffer(compact=True)
+asyncio.create_task(frame_buffer.read_from(reader))
+async for frame in frame_buffer:
+    ...
+"""
+
+# Bytes requested per read from a StreamReader
+READ_CHUNK_SIZE = 4096
+
+# Put on the queue by close(), and put back by each consumer it wakes
+_CLOSED = object()
+
+
+class AsyncFrameBuffer(FrameBuffer):
+    """
+    A FrameBuffer that queues decoded frames on an `asyncio.Queue` and supports `async for`.
+
+    Accepts the same options as FrameBuffer, plus:
+
+    Args:
+        timestamps (bool): Stamp chunks fed by `read_from` and `protocol()` with `time.monotonic_ns()`.
+    """
+    def __init__(self, *args, timestamps=False, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.overflow.blocking:
+            raise ValueError("AsyncFrameBuffer cannot block the event loop on a full queue.")
+        self.timestamps = timestamps
+        self.closed = False
+
+    @property
+    def frame_queue(self):
+        """
+        The `asyncio.Queue` of decoded frames, created on first use. Up to Python 3.9 a
+        queue binds to the event loop current when it is created, so it is created from
+        inside the running loop rather than when the buffer is built.
+        """
+        if self._frame_queue is None:
+            self._frame_queue = asyncio.Queue(maxsize=self._max_queue_size)
+        return self._frame_queue
+
+    @frame_queue.setter
+    def frame_queue(self, frame_queue):
+        if isinstance(frame_queue, asyncio.Queue):
+            self._frame_queue = frame_queue
+        else:
+            # The queue.Queue made by FrameBuffer only gives the size of the asyncio.Queue
+            self._max_queue_size = frame_queue.maxsize
+            self._frame_queue = None
+
+    def feed(self, data, timestamp_ns=None):
+        """
+        Adds data to the buffer and queues every frame it completes.
+
+        Args:
+            data (bytes): New data from the bus.
+            timestamp_ns (int): Optional arrival time of the last byte, see `add_to_buffer`.
+        """
+        if timestamp_ns is None and self.timestamps:
+            timestamp_ns = time.monotonic_ns()
+        self.add_to_buffer(data, timestamp_ns)
+        self.get_complete_frames()
+
+    async def read_from(self, reader, chunk_size=READ_CHUNK_SIZE):
+        """
+        Feeds the buffer from a StreamReader until EOF, then closes it.
+
+        Args:
+            reader (asyncio.StreamReader): Source of raw bus bytes.
+            chunk_size (int): Maximum bytes per read.
+        """
+        try:
+            while True:
+                data = await reader.read(chunk_size)
+                if not data:
+                    break
+                self.feed(data)
+        finally:
+            self.close()
+
+    def protocol(self):
+        """
+        Returns:
+            FrameBufferProtocol: A protocol feeding this buffer, for `loop.create_connection` and similar.
+        """
+        return FrameBufferProtocol(self)
+
+    def close(self):
+        """Ends iteration once the frames already queued have been consumed."""
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            self.frame_queue.put_nowait(_CLOSED)  # Wake consumers waiting on the queue
+        except asyncio.QueueFull:
+            pass  # Nobody waits on a full queue; consumers stop once it is drained
+
+    async def get(self):
+        """
+        Waits for the next decoded frame.
+
+        Returns:
+            The decoded frame, or None once the buffer is closed and drained.
+        """
+        if self.closed and self.frame_queue.empty():
+            return None
+        frame = await self.frame_queue.get()
+        if frame is _CLOSED:
+            try:
+                self.frame_queue.put_nowait(_CLOSED)  # Left in place to wake the next consumer
+            except asyncio.QueueFull:
+                pass
+            return None
+        return frame
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        frame = await self.get()
+        if frame is None:
+            raise StopAsyncIteration
+        return frame
+
+
+class FrameBufferProtocol(asyncio.Protocol):
+    """An asyncio protocol that feeds received bytes into an `AsyncFrameBuffer`."""
+    def __init__(self, frame_buffer):
+        self.frame_buffer = frame_buffer
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def data_received(self, data):
+        self.frame_buffer.feed(data)
+
+    def eof_received(self):
+        self.frame_buffer.close()
+
+    def connection_lost(self, exc):
+        if exc is not None:
+            logger.error(f"FastNet connection lost: {exc}")
+        self.frame_buffer.close()
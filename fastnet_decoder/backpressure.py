@@ -0,0 +1,254 @@
+import asyncio
+import queue
+import time
+from .logger import logger
+
+
+"""
+Backpressure Policies
+=====================
+
+When consumers fall behind, FrameBuffer's `frame_queue` fills up. The policy passed as
+`FrameBuffer(overflow=...)` decides what happens to the next frame:
+
+- `DropNewest` (default): the new frame is dropped and the queue is left as it is.
+- `DropOldest`: the oldest queued frame is dropped to make room, so consumers always
+  see the most recent frames.
+- `CoalesceLatest`: queued frames are merged so only the newest frame per source, command
+  and channel set is kept. Every channel keeps its latest value; only superseded frames
+  are dropped. If nothing can be merged, the oldest frame is dropped.
+- `DropStale(max_age_ms)`: queued frames whose `timestamp_ns` is more than `max_age_ms`
+  behind `time.monotonic_ns()` are dropped to make room; if none are stale, the new
+  frame is dropped. Frames without timestamps are never considered stale.
+- `Block(timeout)`: ingest waits up to `timeout` seconds for room, then drops the new
+  frame. Only for a thread-safe `queue.Queue` drained by another thread.
+
+Each policy counts the frames it queued and dropped. Policies work with both the
+`queue.Queue` of FrameBuffer and the `asyncio.Queue` of AsyncFrameBuffer (except `Block`).
+Use one policy instance per FrameBuffer.
+"""
+
+QUEUE_FULL = (queue.Full, asyncio.QueueFull)
+QUEUE_EMPTY = (queue.Empty, asyncio.QueueEmpty)
+
+
+def _frame_timestamp(decoded_frame):
+    """The `timestamp_ns` of a decoded frame, None if it has none."""
+    if isinstance(decoded_frame, dict):
+        return decoded_frame.get("timestamp_ns")
+    return getattr(decoded_frame, "timestamp_ns", None)
+
+
+def _frame_key(decoded_frame):
+    """Frames with the same key carry the same channels from the same source."""
+    if isinstance(decoded_frame, dict):
+        return decoded_frame.get("from_address"), decoded_frame.get("command"), tuple(decoded_frame.get("values", ()))
+    if hasattr(decoded_frame, "channel_ids"):  # LazyFrame
+        return decoded_frame.from_address, decoded_frame.command, tuple(decoded_frame.channel_ids())
+    return decoded_frame.from_address, decoded_frame.command, tuple(decoded_frame.values)
+
+
+class OverflowPolicy:
+    """
+    Base class of the backpressure policies.
+
+    Attributes:
+        queued (int): Frames added to the queue.
+        dropped (int): Frames dropped, new or already queued.
+    """
+    blocking = False  # Needs a queue that another thread drains
+
+    def __init__(self):
+        self.queued = 0
+        self.dropped = 0
+
+    def put(self, frame_queue, decoded_frame):
+        """
+        Adds a decoded frame to the queue, applying the policy if it is full.
+
+        Args:
+            frame_queue: A `queue.Queue` or `asyncio.Queue`.
+            decoded_frame: The frame to add.
+
+        Returns:
+            bool: True if the frame was queued.
+        """
+        try:
+            frame_queue.put_nowait(decoded_frame)
+        except QUEUE_FULL:
+            if not self._overflow(frame_queue, decoded_frame):
+                self.dropped += 1
+                return False
+        self.queued += 1
+        return True
+
+    def _overflow(self, frame_queue, decoded_frame):
+        """Handles a full queue. Returns True if the frame was queued after all."""
+        return False
+
+    def _take(self, frame_queue):
+        """
+        Takes the oldest queued frame and marks it done, so `frame_queue.join()` does not
+        wait for frames removed by the policy. Raises QUEUE_EMPTY if there is none.
+        """
+        frame = frame_queue.get_nowait()
+        task_done = getattr(frame_queue, "task_done", None)
+        if task_done is not None:
+            task_done()
+        return frame
+
+    def _drop_queued(self, frame_queue):
+        """Drops the oldest queued frame. Returns False if the queue was emptied meanwhile."""
+        try:
+            self._take(frame_queue)
+        except QUEUE_EMPTY:
+            return False
+        self.dropped += 1
+        return True
+
+    def _drain(self, frame_queue):
+        """Takes every queued frame, oldest first."""
+        pending = []
+        while True:
+            try:
+                pending.append(self._take(frame_queue))
+            except QUEUE_EMPTY:
+                return pending
+
+    def _requeue(self, frame_queue, frames):
+        """Puts drained frames back, counting any that no longer fit as dropped."""
+        for frame in frames:
+            try:
+                frame_queue.put_nowait(frame)
+            except QUEUE_FULL:
+                self.dropped += 1
+
+    def _retry(self, frame_queue, decoded_frame):
+        """Queues the frame once room has been made."""
+        try:
+            frame_queue.put_nowait(decoded_frame)
+        except QUEUE_FULL:
+            return False
+        return True
+
+    def stats(self):
+        """
+        Returns:
+            dict: Counters of the policy.
+        """
+        return {"queued": self.queued, "dropped": self.dropped}
+
+    def __repr__(self):
+        return f"{type(self).__name__}(queued={self.queued}, dropped={self.dropped})"
+
+
+class DropNewest(OverflowPolicy):
+    """Drops the new frame when the queue is full."""
+    def _overflow(self, frame_queue, decoded_frame):
+        logger.warning("Frame queue is full. Dropping frame.")
+        return False
+
+
+class DropOldest(OverflowPolicy):
+    """Drops the oldest queued frame to make room for the new one."""
+    def _overflow(self, frame_queue, decoded_frame):
+        self._drop_queued(frame_queue)
+        return self._retry(frame_queue, decoded_frame)
+
+
+class CoalesceLatest(OverflowPolicy):
+    """
+    Keeps only the newest frame per source, command and channel set when the queue is full.
+
+    Attributes:
+        coalesced (int): Queued frames dropped because a newer frame carries the same channels.
+    """
+    def __init__(self):
+        super().__init__()
+        self.coalesced = 0
+
+    def _overflow(self, frame_queue, decoded_frame):
+        pending = self._drain(frame_queue)
+        pending.append(decoded_frame)
+
+        # Walk from newest to oldest, keeping the first (newest) frame seen per key
+        seen = set()
+        kept = []
+        for frame in reversed(pending):
+            key = _frame_key(frame)
+            if key not in seen:
+                seen.add(key)
+                kept.append(frame)
+        kept.reverse()
+        if len(kept) < len(pending):
+            self.coalesced += len(pending) - len(kept)
+        elif len(kept) > 1:
+            kept.pop(0)  # Nothing superseded, fall back to dropping the oldest
+        # Else a consumer emptied the queue meanwhile, and there is room for the new frame
+        self.dropped += len(pending) - len(kept)  # Only queued frames, the new frame is always kept
+        self._requeue(frame_queue, kept[:-1])
+        return self._retry(frame_queue, decoded_frame)
+
+    def stats(self):
+        return {"queued": self.queued, "dropped": self.dropped, "coalesced": self.coalesced}
+
+
+class DropStale(OverflowPolicy):
+    """
+    Drops queued frames older than `max_age_ms` to make room, else drops the new frame.
+
+    Attributes:
+        max_age_ms (float): Age after which a queued frame is stale.
+        stale (int): Queued frames dropped as stale.
+    """
+    def __init__(self, max_age_ms):
+        if max_age_ms <= 0:
+            raise ValueError("DropStale max_age_ms must be positive.")
+        super().__init__()
+        self.max_age_ms = max_age_ms
+        self.stale = 0
+
+    def _overflow(self, frame_queue, decoded_frame):
+        cutoff = time.monotonic_ns() - round(self.max_age_ms * 1_000_000)
+        pending = self._drain(frame_queue)
+        fresh = []
+        for frame in pending:
+            timestamp_ns = _frame_timestamp(frame)
+            if timestamp_ns is not None and timestamp_ns < cutoff:
+                self.stale += 1
+                self.dropped += 1
+            else:
+                fresh.append(frame)
+        self._requeue(frame_queue, fresh)
+        return len(fresh) < len(pending) and self._retry(frame_queue, decoded_frame)
+
+    def stats(self):
+        return {"queued": self.queued, "dropped": self.dropped, "stale": self.stale}
+
+
+class Block(OverflowPolicy):
+    """
+    Waits up to `timeout` seconds for room, then drops the new frame.
+
+    Attributes:
+        timeout (float): Seconds to wait, None to wait until there is room.
+        blocked (int): Frames that had to wait for room.
+    """
+    blocking = True
+
+    def __init__(self, timeout=None):
+        super().__init__()
+        self.timeout = timeout
+        self.blocked = 0
+
+    def _overflow(self, frame_queue, decoded_frame):
+        self.blocked += 1
+        try:
+            frame_queue.put(decoded_frame, timeout=self.timeout)
+        except queue.Full:
+            logger.warning(f"Frame queue still full after {self.timeout}s. Dropping frame.")
+            return False
+        return True
+
+    def stats(self):
+        return {"queued": self.queued, "dropped": self.dropped, "blocked": self.blocked}
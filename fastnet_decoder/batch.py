@@ -0,0 +1,333 @@
+from array import array
+from itertools import chain, repeat, takewhile
+import mmap
+from .mappings import COMMAND_LOOKUP, IGNORED_COMMANDS, CHANNEL_LOOKUP
+from .formats import FORMAT_SIZES, VALUE_DECODERS
+from .sync import iter_frames
+from . import numpy_engine
+
+
+"""
+Batch Decoding
+==============
+
+`decode_frames` validates and decodes many frames in one call and returns the values as
+columns rather than as one nested dictionary per frame. It is meant for offline analysis
+of long captures, where building and discarding millions of dictionaries dominates.
+
+The input is either a bytes-like object holding raw bus traffic, which is split into
+frames with the same resync rules as FrameBuffer, or an iterable of frames, where each
+item is a frame or a `(timestamp_ns, frame)` pair.
+
+Only numeric channels are collected: timers become seconds, while 7-segment text,
+unsupported formats and ASCII (LatLon) frames are skipped.
+
+With NumPy installed, the default `engine="auto"` decodes with the vectorised engine in
+`numpy_engine.py`, which groups frames by layout. Without NumPy it falls back to the
+pure Python engine; both give the same columns.
+
+Example:
+--------
+columns = decode_frames(open("capture.bin", "rb").read())
+boatspeed = columns[0x41]
+for frame_index, value in zip(boatspeed.frames, boatspeed.values):
+    ...
+"""
+
+NUMERIC_FORMATS = {0x01, 0x02, 0x03, 0x04, 0x07, 0x08, 0x0A}
+TIMER_FORMAT = 0x05
+
+# Commands whose frames carry no channel layout to decode into columns
+SKIPPED_COMMANDS = frozenset(command for command, name in COMMAND_LOOKUP.items()
+                             if name in IGNORED_COMMANDS or name == "LatLon")
+
+
+def _timer_seconds(value_decoder):
+    def value(data_bytes):
+        return value_decoder(data_bytes).total_seconds()
+    return value
+
+
+def _numeric_decoder(format_byte):
+    format_bits = format_byte & 0x0F
+    if format_bits in NUMERIC_FORMATS:
+        return VALUE_DECODERS[format_byte]
+    if format_bits == TIMER_FORMAT:
+        return _timer_seconds(VALUE_DECODERS[format_byte])
+    return None
+
+
+# Value decoder returning a float for each format byte, None for non-numeric formats
+NUMERIC_DECODERS = tuple(_numeric_decoder(format_byte) for format_byte in range(256))
+
+
+class ChannelColumn:
+    """
+    The values of one channel across a batch of frames.
+
+    Attributes:
+        channel_id (int): Channel ID (from `CHANNEL_LOOKUP`).
+        values (array): Interpreted values, `array('d')`.
+        frames (array): Index of the frame each value came from, `array('q')`.
+        timestamps (array): Timestamp of each value, `array('q')`, or None without timestamps.
+    """
+    __slots__ = ("channel_id", "values", "frames", "timestamps")
+
+    def __init__(self, channel_id, timestamps=False):
+        self.channel_id = channel_id
+        self.values = array("d")
+        self.frames = array("q")
+        self.timestamps = array("q") if timestamps else None
+
+    @property
+    def name(self):
+        return CHANNEL_LOOKUP.get(self.channel_id, f"Unknown (0x{self.channel_id:02X})")
+
+    def __len__(self):
+        return len(self.values)
+
+    def __repr__(self):
+        return f"ChannelColumn(channel_id=0x{self.channel_id:02X}, length={len(self.values)})"
+
+
+class FrameColumns:
+    """
+    Columns decoded from a batch of frames.
+
+    Attributes:
+        frame_count (int): Number of frames decoded into the columns.
+        sources (array): Source address of each frame, `array('B')`.
+        timestamps (array): Timestamp of each frame, `array('q')`, or None without timestamps.
+        columns (dict): `ChannelColumn` objects keyed by channel id.
+    """
+    __slots__ = ("frame_count", "sources", "timestamps", "columns")
+
+    def __init__(self, timestamps=False):
+        self.frame_count = 0
+        self.sources = array("B")
+        self.timestamps = array("q") if timestamps else None
+        self.columns = {}
+
+    def __getitem__(self, channel_id):
+        return self.columns[channel_id]
+
+    def __contains__(self, channel_id):
+        return channel_id in self.columns
+
+    def __iter__(self):
+        return iter(self.columns)
+
+    def __len__(self):
+        return len(self.columns)
+
+    def get(self, channel_id, default=None):
+        return self.columns.get(channel_id, default)
+
+    def to_arrow(self):
+        """
+        Returns:
+            pyarrow.Table: One row per frame, see `columnar.to_arrow`.
+        """
+        from .columnar import to_arrow
+        return to_arrow(self)
+
+    def to_dataframe(self):
+        """
+        Returns:
+            pandas.DataFrame: One row per frame, see `columnar.to_dataframe`.
+        """
+        from .columnar import to_dataframe
+        return to_dataframe(self)
+
+    def __repr__(self):
+        return f"FrameColumns(frame_count={self.frame_count}, channels={[f'0x{c:02X}' for c in self.columns]})"
+
+
+def _frame_has_valid_checksums(frame):
+    """Checks the header and body checksums of a standalone frame."""
+    return (len(frame) >= 6 and not sum(frame[:5]) & 0xFF
+            and len(frame) == frame[2] + 6 and not sum(frame[5:]) & 0xFF)
+
+
+def _iter_items(items):
+    for item in items:
+        if isinstance(item, tuple):
+            timestamp_ns, frame = item
+        else:
+            timestamp_ns, frame = None, item
+        frame = memoryview(frame)
+        if _frame_has_valid_checksums(frame):
+            yield timestamp_ns, frame
+
+
+def decode_frames(source, channels=None, engine="auto"):
+    """
+    Validates and decodes a batch of frames into per-channel columns.
+
+    Args:
+        source: Raw bus traffic as bytes, bytearray, memoryview or mmap, or an iterable
+            of frames or `(timestamp_ns, frame)` pairs. Either every item has a timestamp
+            or none has.
+        channels (set): Channel ids to collect, None for all.
+        engine (str): "python", "numpy", or "auto" to use NumPy when it is installed.
+
+    Returns:
+        FrameColumns: Per-channel value columns plus per-frame sources and timestamps.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview, mmap.mmap)):
+        return decode_stream_range(source, 0, len(source), channels, engine)
+    if _use_numpy(engine):
+        return _decode_items_numpy(source, channels)
+    return _decode_python(_iter_items(source), channels)
+
+
+def decode_stream_range(data, start, end, channels=None, engine="auto"):
+    """
+    Decodes the frames of raw bus traffic whose first byte lies in `data[start:end]`.
+
+    The whole of `data` is read as one stream, so the frames are the ones a sequential
+    reader would take, and a frame starting before `end` is decoded even if it ends after
+    it. Splitting a capture at any offsets and decoding each range this way gives the
+    same frames as decoding it in one piece.
+
+    Args:
+        data: Raw bus traffic as bytes, bytearray, memoryview or mmap.
+        start (int): First frame start offset to include.
+        end (int): Frame start offsets at or after this are excluded.
+        channels (set): Channel ids to collect, None for all.
+        engine (str): "python", "numpy", or "auto" to use NumPy when it is installed.
+
+    Returns:
+        FrameColumns: Per-channel value columns plus per-frame sources.
+    """
+    if _use_numpy(engine):
+        np = numpy_engine.np
+        buffer = np.frombuffer(data, dtype=np.uint8)
+        starts = numpy_engine.stream_frame_starts(buffer)
+        starts = starts[(starts >= start) & (starts < end)]
+        return _columns_from_numpy(*numpy_engine.decode_columns(buffer, starts, None, SKIPPED_COMMANDS, channels))
+    view = memoryview(data)
+    positions = takewhile(lambda position: position[0] < end, iter_frames(view))
+    frames = ((None, view[frame_start:frame_end]) for frame_start, frame_end in positions if frame_start >= start)
+    return _decode_python(frames, channels)
+
+
+def _use_numpy(engine):
+    """Checks the engine name and tells whether the NumPy engine is used."""
+    if engine not in ("auto", "python", "numpy"):
+        raise ValueError(f"Unknown decode engine: {engine}")
+    if engine == "numpy" and numpy_engine.np is None:
+        raise ImportError("NumPy is required for engine='numpy'")
+    return engine != "python" and numpy_engine.np is not None
+
+
+def _decode_python(frames, channels):
+    """Decodes `(timestamp_ns, frame)` pairs of validated frames into columns in pure Python."""
+    first = next(frames, None)
+    if first is None:
+        return FrameColumns()
+    timestamped = first[0] is not None
+    frames = chain((first,), frames)
+
+    result = FrameColumns(timestamped)
+    columns = result.columns
+    sources = result.sources
+    frame_timestamps = result.timestamps
+    frame_index = 0
+    for timestamp_ns, frame in frames:
+        if frame[3] in SKIPPED_COMMANDS or frame[2] < 2:
+            continue
+        index = 5
+        body_end = len(frame) - 1
+        while index + 1 < body_end:
+            channel_id = frame[index]
+            format_byte = frame[index + 1]
+            data_end = index + 2 + FORMAT_SIZES[format_byte]
+            if data_end > body_end:
+                break
+            decoder = NUMERIC_DECODERS[format_byte]
+            if decoder is not None and (channels is None or channel_id in channels):
+                column = columns.get(channel_id)
+                if column is None:
+                    column = columns[channel_id] = ChannelColumn(channel_id, timestamped)
+                column.values.append(decoder(frame[index + 2:data_end]))
+                column.frames.append(frame_index)
+                if timestamped:
+                    column.timestamps.append(timestamp_ns)
+            index = data_end
+
+        sources.append(frame[1])
+        if timestamped:
+            frame_timestamps.append(timestamp_ns)
+        frame_index += 1
+
+    result.frame_count = frame_index
+    return result
+
+
+def _decode_items_numpy(source, channels):
+    """Runs `decode_frames` on an iterable of frames with the NumPy engine."""
+    np = numpy_engine.np
+    items = [item if isinstance(item, tuple) else (None, item) for item in source]
+    if not items:
+        return FrameColumns()
+    lengths = np.fromiter((len(frame) for _, frame in items), dtype=np.int64, count=len(items))
+    starts = np.zeros(len(items), dtype=np.int64)
+    np.cumsum(lengths[:-1], out=starts[1:])
+    buffer = b"".join(frame for _, frame in items)
+    timestamps = None
+    if items[0][0] is not None:
+        timestamps = np.fromiter((timestamp_ns for timestamp_ns, _ in items), dtype=np.int64, count=len(items))
+    return decode_packed(buffer, starts, lengths, timestamps, channels, "numpy")
+
+
+def decode_packed(data, starts, lengths, timestamps=None, channels=None, engine="auto"):
+    """
+    Validates and decodes standalone frames stored at known offsets of one buffer, such as
+    the records of a mapped capture, without copying the frames out of it.
+
+    Args:
+        data: Bytes-like object or mmap holding the frames.
+        starts: Start offset of each frame, an integer array or sequence.
+        lengths: Length of each frame, aligned with `starts`.
+        timestamps: Timestamp of each frame aligned with `starts`, or None.
+        channels (set): Channel ids to collect, None for all.
+        engine (str): "python", "numpy", or "auto" to use NumPy when it is installed.
+
+    Returns:
+        FrameColumns: Per-channel value columns plus per-frame sources and timestamps.
+    """
+    if not len(starts):
+        return FrameColumns()
+    if not _use_numpy(engine):
+        view = memoryview(data)
+        if timestamps is None:
+            timestamps = repeat(None)
+        items = ((timestamp_ns, view[start:start + length])
+                 for timestamp_ns, start, length in zip(timestamps, starts, lengths))
+        return _decode_python(_iter_items(items), channels)
+
+    np = numpy_engine.np
+    buffer = np.frombuffer(data, dtype=np.uint8)
+    starts = np.asarray(starts, dtype=np.int64)
+    valid = numpy_engine.valid_items(buffer, starts, np.asarray(lengths, dtype=np.int64))
+    if timestamps is not None:
+        timestamps = np.asarray(timestamps, dtype=np.int64)[valid]
+    return _columns_from_numpy(*numpy_engine.decode_columns(buffer, starts[valid], timestamps, SKIPPED_COMMANDS, channels))
+
+
+def _columns_from_numpy(sources, timestamps, columns):
+    """Wraps the arrays returned by `numpy_engine.decode_columns` in `FrameColumns`."""
+    np = numpy_engine.np
+    result = FrameColumns(timestamps is not None)
+    result.frame_count = len(sources)
+    result.sources.frombytes(sources.tobytes())
+    if timestamps is not None:
+        result.timestamps.frombytes(timestamps.astype(np.int64).tobytes())
+    for channel_id, (frame_index, values) in columns.items():
+        column = result.columns[channel_id] = ChannelColumn(channel_id, timestamps is not None)
+        column.values.frombytes(values.astype(np.float64).tobytes())
+        column.frames.frombytes(frame_index.astype(np.int64).tobytes())
+        if timestamps is not None:
+            column.timestamps.frombytes(timestamps[frame_index].astype(np.int64).tobytes())
+    return result
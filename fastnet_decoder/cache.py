@@ -0,0 +1,183 @@
+from collections import OrderedDict
+
+
+"""
+Decode Caches
+=============
+
+Instrument values on a steady boat repeat constantly, so the same channel data is
+decoded frame after frame. `DecodeCache` is a bounded LRU cache of channel decodes keyed
+by `(channel_id, format_byte, data_bytes)`. Pass one to `decode_frame(cache=...)` or
+`FrameBuffer(decode_cache=...)` and repeated channel data returns the result built the
+first time instead of being decoded again.
+
+Cached results are shared between frames, so consumers must not modify them. Use one
+cache per output mode, as dictionary and compact results are stored under the same keys.
+
+The hit, miss and eviction counters help size the cache for the traffic on the bus.
+"""
+
+# Channel data is at most 4 bytes (see FORMAT_SIZE_MAP), which lets the key be packed into one int
+MAX_CACHED_DATA_SIZE = 4
+
+
+class DecodeCache:
+    """
+    A bounded LRU cache of channel decodes.
+
+    Attributes:
+        maxsize (int): Maximum number of cached channel decodes.
+        hits (int): Lookups answered from the cache.
+        misses (int): Lookups that had to decode.
+        evictions (int): Entries dropped to stay within `maxsize`.
+    """
+    def __init__(self, maxsize=1024):
+        if maxsize < 1:
+            raise ValueError("DecodeCache maxsize must be at least 1.")
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def lookup(self, channel_id, format_byte, data_bytes, decoder):
+        """
+        Returns the cached decode of a channel, decoding and caching it on a miss.
+
+        Args:
+            channel_id (int): Channel ID (from `CHANNEL_LOOKUP`).
+            format_byte (int): The format byte of the channel.
+            data_bytes (bytes): The raw data, as bytes or a memoryview.
+            decoder (callable): Called as `decoder(channel_id, format_byte, data_bytes)` on a miss.
+
+        Returns:
+            The cached or freshly decoded result.
+        """
+        size = len(data_bytes)
+        if size > MAX_CACHED_DATA_SIZE:
+            return decoder(channel_id, format_byte, data_bytes)
+
+        key = (channel_id << 43) | (format_byte << 35) | (size << 32) | int.from_bytes(data_bytes, byteorder="big")
+        entries = self._entries
+        try:
+            result = entries[key]
+        except KeyError:
+            pass
+        else:
+            entries.move_to_end(key)
+            self.hits += 1
+            return result
+
+        self.misses += 1
+        result = decoder(channel_id, format_byte, data_bytes)
+        entries[key] = result
+        if len(entries) > self.maxsize:
+            entries.popitem(last=False)
+            self.evictions += 1
+        return result
+
+    def stats(self):
+        """
+        Returns:
+            dict: Counters and current size of the cache.
+        """
+        return {"size": len(self._entries), "maxsize": self.maxsize,
+                "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+    def clear(self):
+        """Empties the cache and resets its counters."""
+        self._entries.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class FrameCache:
+    """
+    A bounded LRU cache of whole-frame decodes keyed by the raw frame bytes.
+
+    Several nodes rebroadcast byte-identical frames, such as static settings from the
+    Performance Processor. A repeated frame returns the result decoded the first time.
+    In `changed_only` mode, a frame identical to the previous frame with the same header
+    (addresses, size and command) is reported as unchanged so FrameBuffer can drop it.
+
+    Attributes:
+        maxsize (int): Maximum number of cached frames, and of headers tracked for `changed_only`.
+        changed_only (bool): Drop frames that repeat the previous frame with the same header.
+        hits (int): Frames answered from the cache.
+        misses (int): Frames that had to be decoded.
+        evictions (int): Entries dropped to stay within `maxsize`.
+        suppressed (int): Unchanged frames dropped in `changed_only` mode.
+    """
+    def __init__(self, maxsize=256, changed_only=False):
+        if maxsize < 1:
+            raise ValueError("FrameCache maxsize must be at least 1.")
+        self.maxsize = maxsize
+        self.changed_only = changed_only
+        self._entries = OrderedDict()
+        self._last_by_header = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.suppressed = 0
+
+    def lookup(self, frame, decoder, *args):
+        """
+        Returns the cached decode of a frame, decoding and caching it on a miss.
+
+        Args:
+            frame (bytes): The full frame, as bytes or a memoryview.
+            decoder (callable): Called as `decoder(frame, *args)` on a miss. None results are not cached.
+
+        Returns:
+            tuple: `(result, unchanged)`, where `unchanged` is True when the frame is identical
+            to the previous frame with the same header.
+        """
+        key = bytes(frame)
+
+        last_by_header = self._last_by_header
+        header = key[:5]
+        unchanged = last_by_header.get(header) == key
+        last_by_header[header] = key
+        last_by_header.move_to_end(header)
+        if len(last_by_header) > self.maxsize:
+            last_by_header.popitem(last=False)
+        if unchanged and self.changed_only:
+            self.suppressed += 1
+
+        entries = self._entries
+        try:
+            result = entries[key]
+        except KeyError:
+            pass
+        else:
+            entries.move_to_end(key)
+            self.hits += 1
+            return result, unchanged
+
+        self.misses += 1
+        result = decoder(frame, *args)
+        if result is not None:
+            entries[key] = result
+            if len(entries) > self.maxsize:
+                entries.popitem(last=False)
+                self.evictions += 1
+        return result, unchanged
+
+    def stats(self):
+        """
+        Returns:
+            dict: Counters and current size of the cache.
+        """
+        return {"size": len(self._entries), "maxsize": self.maxsize, "hits": self.hits,
+                "misses": self.misses, "evictions": self.evictions, "suppressed": self.suppressed}
+
+    def clear(self):
+        """Empties the cache and resets its counters."""
+        self._entries.clear()
+        self._last_by_header.clear()
+        self.hits = self.misses = self.evictions = self.suppressed = 0
+
+    def __len__(self):
+        return len(self._entries)
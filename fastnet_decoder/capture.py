@@ -0,0 +1,466 @@
+from array import array
+from bisect import bisect_left
+import mmap
+import os
+import struct
+import time
+from .logger import logger
+
+
+"""
+Capture Files
+=============
+
+A capture file records raw bus traffic for later replay or offline analysis. It is
+about a third of the size of a hex dump and needs no parsing beyond fixed-size headers.
+
+File layout (all integers little-endian):
+
+    File header, 8 bytes:
+        magic      5 bytes  b"FNCAP"
+        version    uint8    1
+        kind       uint8    0 = validated frames, 1 = raw chunks as read from the bus
+        reserved   1 byte
+
+    Records, repeated until the end of the file:
+        timestamp  int64    monotonic time in nanoseconds
+        length     uint32   number of data bytes
+        data       length bytes
+
+A frames capture holds one validated frame per record, stamped with its estimated arrival
+time. A chunks capture holds the bytes exactly as they were read, so replaying it through
+a FrameBuffer reproduces line noise and resyncs as well.
+
+`CaptureWriter` collects records in memory and writes them in large blocks. Pass one to
+`FrameBuffer(capture=...)` to tee every validated frame, or every raw chunk, into it.
+
+`CaptureReader` maps a capture into memory and returns records as zero-copy memoryviews.
+`seek(timestamp_ns)` uses a sparse sidecar index (`<capture>.idx`) holding the timestamp
+and offset of every 1024th record, built by `build_index` on the first seek, so jumping to any
+point of a long capture is a binary search plus at most 1024 record headers.
+
+Example:
+--------
+with CaptureWriter("race.fncap", kind="frames") as capture:
+    frame_buffer = FrameBuffer(capture=capture)
+    ...
+
+with CaptureReader("race.fncap") as reader:
+    reader.seek(start_ns)
+    for timestamp_ns, frame in reader.frames():
+        decoded = decode_frame(frame)
+"""
+
+MAGIC = b"FNCAP"
+VERSION = 1
+KIND_FRAMES = 0
+KIND_CHUNKS = 1
+KINDS = {"frames": KIND_FRAMES, "chunks": KIND_CHUNKS}
+
+FILE_HEADER = struct.Struct("<5sBBx")
+RECORD_HEADER = struct.Struct("<qI")
+
+# Bytes collected in memory before they are written out
+WRITE_BUFFER_SIZE = 1 << 16
+
+
+def read_header(data):
+    """
+    Parses the file header of a capture.
+
+    Args:
+        data (bytes): At least the first 8 bytes of the capture.
+
+    Returns:
+        str: The capture kind, "frames" or "chunks".
+
+    Raises:
+        ValueError: If the data does not start with a supported capture header.
+    """
+    if len(data) < FILE_HEADER.size:
+        raise ValueError("Capture is too short for a file header.")
+    magic, version, kind = FILE_HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Not a FastNet capture file.")
+    if version != VERSION:
+        raise ValueError(f"Unsupported capture version: {version}")
+    for name, value in KINDS.items():
+        if value == kind:
+            return name
+    raise ValueError(f"Unknown capture kind: {kind}")
+
+
+def iter_records(data, offset=FILE_HEADER.size):
+    """
+    Yields the records of a capture held in memory.
+
+    Args:
+        data (bytes): The capture, as bytes, a memoryview or an mmap.
+        offset (int): Offset of the first record to read.
+
+    Yields:
+        tuple: `(timestamp_ns, data)`, with `data` a memoryview slice of `data`.
+    """
+    view = memoryview(data)
+    end = len(view)
+    unpack_from = RECORD_HEADER.unpack_from
+    header_size = RECORD_HEADER.size
+    while offset + header_size <= end:
+        timestamp_ns, length = unpack_from(view, offset)
+        start = offset + header_size
+        offset = start + length
+        if offset > end:
+            logger.warning("Capture ends with a truncated record.")
+            return
+        yield timestamp_ns, view[start:offset]
+
+
+class CaptureWriter:
+    """
+    Writes a capture file with buffered, block-sized writes.
+
+    Args:
+        file: A path, or a binary file object opened for writing.
+        kind (str): "frames" to record validated frames, "chunks" to record raw reads.
+        buffer_size (int): Bytes collected before they are written out.
+
+    Attributes:
+        kind (str): The capture kind.
+        records (int): Records written.
+        bytes_written (int): Bytes written to the file, including headers.
+    """
+    def __init__(self, file, kind="frames", buffer_size=WRITE_BUFFER_SIZE):
+        if kind not in KINDS:
+            raise ValueError(f"Unknown capture kind: {kind}")
+        if isinstance(file, (str, os.PathLike)):
+            self._file = open(file, "wb")
+            self._owns_file = True
+        else:
+            self._file = file
+            self._owns_file = False
+        self.kind = kind
+        self.buffer_size = buffer_size
+        self.records = 0
+        self.bytes_written = 0
+        self._pending = bytearray(FILE_HEADER.pack(MAGIC, VERSION, KINDS[kind]))
+        self.closed = False
+
+    def write(self, data, timestamp_ns=None):
+        """
+        Adds one record.
+
+        Args:
+            data (bytes): A frame or raw chunk, as bytes or a memoryview. It is copied immediately.
+            timestamp_ns (int): Monotonic time of the record, `time.monotonic_ns()` if None.
+        """
+        if timestamp_ns is None:
+            timestamp_ns = time.monotonic_ns()
+        pending = self._pending
+        pending += RECORD_HEADER.pack(timestamp_ns, len(data))
+        pending += data
+        self.records += 1
+        if len(pending) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        """Writes the collected records to the file."""
+        if self._pending:
+            self._file.write(self._pending)
+            self.bytes_written += len(self._pending)
+            self._pending.clear()
+        self._file.flush()
+
+    def close(self):
+        """Flushes and, if the writer opened it, closes the file."""
+        if self.closed:
+            return
+        self.flush()
+        if self._owns_file:
+            self._file.close()
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+
+    def __repr__(self):
+        return f"CaptureWriter(kind={self.kind!r}, records={self.records})"
+
+
+# Records between entries of the sparse time index
+INDEX_INTERVAL = 1024
+
+INDEX_MAGIC = b"FNIDX"
+INDEX_VERSION = 1
+INDEX_HEADER = struct.Struct("<5sBxxIQq")
+INDEX_ENTRY = struct.Struct("<qQ")
+
+
+def index_path(path):
+    """The path of the sidecar time index of a capture."""
+    return os.fspath(path) + ".idx"
+
+
+def build_index(path, interval=INDEX_INTERVAL):
+    """
+    Scans a capture and writes its sparse time index next to it.
+
+    Every `interval`-th record contributes a `(timestamp_ns, offset)` entry. The index
+    header records the size and modification time of the capture, so an index left
+    behind by an older version of the file is detected and rebuilt.
+
+    Args:
+        path (str): Path of the capture.
+        interval (int): Records between index entries.
+
+    Returns:
+        tuple: `(timestamps, offsets)` as `array('q')` and `array('Q')`.
+    """
+    timestamps = array("q")
+    offsets = array("Q")
+    stat = os.stat(path)
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            read_header(data)
+            offset = FILE_HEADER.size
+            end = len(data)
+            unpack_from = RECORD_HEADER.unpack_from
+            record = 0
+            while offset + RECORD_HEADER.size <= end:
+                timestamp_ns, length = unpack_from(data, offset)
+                if record % interval == 0:
+                    timestamps.append(timestamp_ns)
+                    offsets.append(offset)
+                offset += RECORD_HEADER.size + length
+                record += 1
+
+    entries = bytearray(INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, interval, stat.st_size, stat.st_mtime_ns))
+    for entry in zip(timestamps, offsets):
+        entries += INDEX_ENTRY.pack(*entry)
+    try:
+        with open(index_path(path), "wb") as f:
+            f.write(entries)
+    except OSError as e:
+        logger.warning(f"Could not write capture index: {e}")
+    return timestamps, offsets
+
+
+def load_index(path):
+    """
+    Reads the sidecar time index of a capture, building it if it is missing or stale.
+
+    Args:
+        path (str): Path of the capture.
+
+    Returns:
+        tuple: `(timestamps, offsets)` as `array('q')` and `array('Q')`.
+    """
+    stat = os.stat(path)
+    try:
+        with open(index_path(path), "rb") as f:
+            data = f.read()
+    except OSError:
+        return build_index(path)
+
+    if len(data) < INDEX_HEADER.size:
+        return build_index(path)
+    magic, version, _, size, mtime_ns = INDEX_HEADER.unpack_from(data)
+    if magic != INDEX_MAGIC or version != INDEX_VERSION or size != stat.st_size or mtime_ns != stat.st_mtime_ns:
+        logger.debug("Capture index is stale, rebuilding it.")
+        return build_index(path)
+
+    timestamps = array("q")
+    offsets = array("Q")
+    for timestamp_ns, offset in INDEX_ENTRY.iter_unpack(memoryview(data)[INDEX_HEADER.size:]):
+        timestamps.append(timestamp_ns)
+        offsets.append(offset)
+    return timestamps, offsets
+
+
+class CaptureReader:
+    """
+    Reads a capture file through a memory map.
+
+    Records are returned as memoryview slices of the map, so a frame can be passed to
+    `decode_frame` without being copied. A view is valid until the reader is closed,
+    and the reader can only be closed once every view has been released.
+
+    Timestamps are expected not to decrease through the file, as written by one
+    recording session using `time.monotonic_ns()`.
+
+    Args:
+        path (str): Path of the capture.
+        index (bool): Let `seek` load the sidecar time index, building it on the first seek,
+            so a seek is a binary search plus at most `INDEX_INTERVAL` record headers.
+            Sequential reads never touch the index.
+
+    Attributes:
+        kind (str): The capture kind, "frames" or "chunks".
+    """
+    def __init__(self, path, index=True):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self.kind = read_header(self._map)
+        except (ValueError, OSError):
+            self._file.close()
+            raise
+        self._offset = FILE_HEADER.size
+        self._use_index = index
+        self._index = None  # Loaded by the first seek
+
+    def __iter__(self):
+        """Yields `(timestamp_ns, data)` records from the current position, advancing it."""
+        view = memoryview(self._map)
+        end = len(view)
+        unpack_from = RECORD_HEADER.unpack_from
+        header_size = RECORD_HEADER.size
+        try:
+            while self._offset + header_size <= end:
+                timestamp_ns, length = unpack_from(view, self._offset)
+                start = self._offset + header_size
+                if start + length > end:
+                    logger.warning("Capture ends with a truncated record.")
+                    return
+                self._offset = start + length
+                yield timestamp_ns, view[start:start + length]
+        finally:
+            view.release()
+
+    def record(self, offset):
+        """
+        Reads the record at a known offset, such as one from a channel index, without moving.
+
+        Args:
+            offset (int): Offset of the record header.
+
+        Returns:
+            tuple: `(timestamp_ns, data)`, with `data` a memoryview slice of the map.
+        """
+        timestamp_ns, length = RECORD_HEADER.unpack_from(self._map, offset)
+        start = offset + RECORD_HEADER.size
+        if start + length > len(self._map):
+            raise ValueError(f"Truncated capture record at offset {offset}.")
+        return timestamp_ns, memoryview(self._map)[start:start + length]
+
+    def record_table(self):
+        """
+        Reads the record headers from the current position to the end, advancing to it,
+        without touching the record data.
+
+        Returns:
+            tuple: `(timestamps, starts, lengths)` as `array('q')`, where `starts` are the
+            offsets of the record data in `buffer()`.
+        """
+        timestamps = array("q")
+        starts = array("q")
+        lengths = array("q")
+        data = self._map
+        end = len(data)
+        unpack_from = RECORD_HEADER.unpack_from
+        header_size = RECORD_HEADER.size
+        offset = self._offset
+        while offset + header_size <= end:
+            timestamp_ns, length = unpack_from(data, offset)
+            start = offset + header_size
+            if start + length > end:
+                logger.warning("Capture ends with a truncated record.")
+                break
+            timestamps.append(timestamp_ns)
+            starts.append(start)
+            lengths.append(length)
+            offset = start + length
+        self._offset = offset
+        return timestamps, starts, lengths
+
+    def buffer(self):
+        """
+        Returns:
+            memoryview: The whole mapped capture, to read records at the offsets of `record_table`.
+            Release it before closing the reader.
+        """
+        return memoryview(self._map)
+
+    def frames(self):
+        """
+        Yields `(timestamp_ns, frame)` for every frame of a frames capture, from the current position.
+
+        Raises:
+            ValueError: For a chunks capture, whose frames can span records; use `replay` instead.
+        """
+        if self.kind != "frames":
+            raise ValueError("A chunks capture holds raw reads; replay it through a FrameBuffer.")
+        return iter(self)
+
+    def replay(self, frame_buffer):
+        """
+        Feeds every record from the current position through a FrameBuffer, with its timestamp.
+
+        Args:
+            frame_buffer (FrameBuffer): Buffer to add the records to; decoded frames are queued as usual.
+        """
+        for timestamp_ns, data in self:
+            frame_buffer.add_to_buffer(bytes(data), timestamp_ns)
+            frame_buffer.get_complete_frames()
+
+    def seek(self, timestamp_ns):
+        """
+        Moves to the first record with a timestamp at or after `timestamp_ns`.
+
+        Args:
+            timestamp_ns (int): Monotonic time in nanoseconds.
+
+        Returns:
+            int: Offset of that record, the end of the file if there is none.
+        """
+        offset = FILE_HEADER.size
+        if self._index is None and self._use_index:
+            self._index = load_index(self.path)
+        if self._index is not None:
+            timestamps, offsets = self._index
+            # Start from the last indexed record before the target
+            position = bisect_left(timestamps, timestamp_ns) - 1
+            if position >= 0:
+                offset = offsets[position]
+
+        data = self._map
+        end = len(data)
+        unpack_from = RECORD_HEADER.unpack_from
+        while offset + RECORD_HEADER.size <= end:
+            record_timestamp_ns, length = unpack_from(data, offset)
+            if record_timestamp_ns >= timestamp_ns:
+                break
+            offset += RECORD_HEADER.size + length
+        self._offset = min(offset, end)
+        return self._offset
+
+    def rewind(self):
+        """Moves back to the first record."""
+        self._offset = FILE_HEADER.size
+
+    def tell(self):
+        """
+        Returns:
+            int: Offset of the next record.
+        """
+        return self._offset
+
+    def close(self):
+        """Unmaps and closes the file."""
+        try:
+            self._map.close()
+        except BufferError:
+            logger.warning("Capture records are still referenced; the map is released when they are.")
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+
+    def __repr__(self):
+        return f"CaptureReader(path={self.path!r}, kind={self.kind!r})"
@@ -0,0 +1,302 @@
+from array import array
+from bisect import bisect_left
+import mmap
+import os
+import struct
+from .capture import FILE_HEADER, RECORD_HEADER, read_header
+from .decode_fastnet import decode_ascii_frame
+from .formats import FORMAT_SIZES, VALUE_DECODERS
+from .logger import logger
+from .mappings import COMMAND_LOOKUP, IGNORED_COMMANDS
+from .records import ChannelValue
+
+
+"""
+Channel Index
+=============
+
+A channel index lists, for every channel id in a frames capture, the offsets and
+timestamps of the records whose frame carries that channel. With it, reading one channel
+over a week of data touches only the frames holding that channel, and decodes only that
+channel in each of them.
+
+The index is stored next to the capture as `<capture>.chx`:
+
+    Header:
+        magic          5 bytes  b"FNCHX"
+        version        uint8    1
+        reserved       2 bytes
+        capture size   uint64   size of the capture when indexed
+        capture mtime  int64    modification time of the capture in nanoseconds
+        channel count  uint32
+
+    Per channel:
+        channel id     uint8
+        reserved       3 bytes
+        entry count    uint32
+        offsets size   uint32   bytes of encoded offsets
+        times size     uint32   bytes of encoded timestamps
+        offsets        varints  record offsets, each stored as the difference from the previous one
+        timestamps     varints  timestamps, each stored as the zigzag difference from the previous one
+
+Consecutive frames of a channel are usually a few dozen bytes and a fraction of a second
+apart, so most differences fit in one to three bytes.
+
+Example:
+--------
+index = ChannelIndex.load("race.fncap")
+with CaptureReader("race.fncap") as reader:
+    for timestamp_ns, channel in index.read(reader, 0x41):
+        ...
+"""
+
+INDEX_MAGIC = b"FNCHX"
+INDEX_VERSION = 1
+INDEX_HEADER = struct.Struct("<5sBxxQqI")
+CHANNEL_HEADER = struct.Struct("<BxxxIII")
+
+# Channels of LatLon frames are ASCII text, found at the start of the body
+LATLON_COMMANDS = frozenset(command for command, name in COMMAND_LOOKUP.items() if name == "LatLon")
+IGNORED_COMMAND_IDS = frozenset(command for command, name in COMMAND_LOOKUP.items() if name in IGNORED_COMMANDS)
+
+
+def index_path(path):
+    """The path of the channel index of a capture."""
+    return os.fspath(path) + ".chx"
+
+
+def encode_deltas(values, signed=False):
+    """
+    Encodes ascending integers as varints of the differences between neighbours.
+
+    Args:
+        values: Iterable of integers.
+        signed (bool): Zigzag-encode the differences so decreasing values are allowed.
+
+    Returns:
+        bytearray: The encoded differences.
+    """
+    encoded = bytearray()
+    previous = 0
+    for value in values:
+        delta = value - previous
+        previous = value
+        if signed:
+            delta = (delta << 1) ^ (delta >> 63)
+        elif delta < 0:
+            raise ValueError("Unsigned delta encoding needs ascending values.")
+        while delta > 0x7F:
+            encoded.append((delta & 0x7F) | 0x80)
+            delta >>= 7
+        encoded.append(delta)
+    return encoded
+
+
+def decode_deltas(data, count, typecode, signed=False):
+    """
+    Decodes `count` values written by `encode_deltas`.
+
+    Returns:
+        array: The values, with the given array typecode.
+    """
+    values = array(typecode)
+    value = 0
+    delta = 0
+    shift = 0
+    for byte in data:
+        delta |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        if signed:
+            delta = (delta >> 1) ^ -(delta & 1)
+        value += delta
+        values.append(value)
+        delta = 0
+        shift = 0
+    if len(values) != count:
+        raise ValueError("Corrupt channel index.")
+    return values
+
+
+class ChannelIndex:
+    """
+    Offsets and timestamps of the records carrying each channel of a frames capture.
+
+    Attributes:
+        offsets (dict): `array('Q')` of record offsets per channel id.
+        timestamps (dict): `array('q')` of record timestamps per channel id.
+    """
+    def __init__(self, offsets=None, timestamps=None):
+        self.offsets = offsets if offsets is not None else {}
+        self.timestamps = timestamps if timestamps is not None else {}
+
+    @classmethod
+    def build(cls, path):
+        """
+        Scans a frames capture once and writes its channel index next to it.
+
+        Args:
+            path (str): Path of a capture written with `kind="frames"`.
+
+        Returns:
+            ChannelIndex: The index.
+        """
+        offsets = {}
+        timestamps = {}
+        with open(path, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                if read_header(data) != "frames":
+                    raise ValueError("Channel indexes need a frames capture.")
+                offset = FILE_HEADER.size
+                end = len(data)
+                unpack_from = RECORD_HEADER.unpack_from
+                while offset + RECORD_HEADER.size <= end:
+                    timestamp_ns, length = unpack_from(data, offset)
+                    start = offset + RECORD_HEADER.size
+                    if start + length > end:
+                        break
+                    for channel_id in _frame_channels(data, start, start + length):
+                        channel_offsets = offsets.get(channel_id)
+                        if channel_offsets is None:
+                            channel_offsets = offsets[channel_id] = array("Q")
+                            timestamps[channel_id] = array("q")
+                        channel_offsets.append(offset)
+                        timestamps[channel_id].append(timestamp_ns)
+                    offset = start + length
+
+        index = cls(offsets, timestamps)
+        try:
+            index.save(path)
+        except OSError as e:
+            logger.warning(f"Could not write channel index: {e}")
+        return index
+
+    @classmethod
+    def load(cls, path):
+        """
+        Reads the channel index of a capture, building it if it is missing or stale.
+
+        Args:
+            path (str): Path of the capture.
+
+        Returns:
+            ChannelIndex: The index.
+        """
+        stat = os.stat(path)
+        try:
+            with open(index_path(path), "rb") as f:
+                data = f.read()
+        except OSError:
+            return cls.build(path)
+        if len(data) < INDEX_HEADER.size:
+            return cls.build(path)
+        magic, version, size, mtime_ns, channel_count = INDEX_HEADER.unpack_from(data)
+        if magic != INDEX_MAGIC or version != INDEX_VERSION or size != stat.st_size or mtime_ns != stat.st_mtime_ns:
+            logger.debug("Channel index is stale, rebuilding it.")
+            return cls.build(path)
+
+        index = cls()
+        view = memoryview(data)
+        position = INDEX_HEADER.size
+        for _ in range(channel_count):
+            channel_id, count, offsets_size, times_size = CHANNEL_HEADER.unpack_from(data, position)
+            position += CHANNEL_HEADER.size
+            index.offsets[channel_id] = decode_deltas(view[position:position + offsets_size], count, "Q")
+            position += offsets_size
+            index.timestamps[channel_id] = decode_deltas(view[position:position + times_size], count, "q", signed=True)
+            position += times_size
+        return index
+
+    def save(self, path):
+        """
+        Writes the index next to the capture at `path`.
+        """
+        stat = os.stat(path)
+        data = bytearray(INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, stat.st_size, stat.st_mtime_ns, len(self.offsets)))
+        for channel_id, offsets in self.offsets.items():
+            encoded_offsets = encode_deltas(offsets)
+            encoded_times = encode_deltas(self.timestamps[channel_id], signed=True)
+            data += CHANNEL_HEADER.pack(channel_id, len(offsets), len(encoded_offsets), len(encoded_times))
+            data += encoded_offsets
+            data += encoded_times
+        with open(index_path(path), "wb") as f:
+            f.write(data)
+
+    def channel_ids(self):
+        """
+        Returns:
+            list: Channel ids present in the capture, ascending.
+        """
+        return sorted(self.offsets)
+
+    def count(self, channel_id):
+        """
+        Returns:
+            int: Number of frames carrying the channel.
+        """
+        offsets = self.offsets.get(channel_id)
+        return len(offsets) if offsets is not None else 0
+
+    def read(self, reader, channel_id, start_ns=None, end_ns=None):
+        """
+        Reads one channel from a capture, decoding nothing else.
+
+        Args:
+            reader (CaptureReader): An open reader of the indexed capture.
+            channel_id (int): Channel ID (from `CHANNEL_LOOKUP`).
+            start_ns (int): Only frames at or after this time, None for the start of the capture.
+            end_ns (int): Only frames before this time, None for the end of the capture.
+
+        Yields:
+            tuple: `(timestamp_ns, ChannelValue)` for every occurrence of the channel.
+        """
+        offsets = self.offsets.get(channel_id)
+        if offsets is None:
+            return
+        timestamps = self.timestamps[channel_id]
+        first = bisect_left(timestamps, start_ns) if start_ns is not None else 0
+        last = bisect_left(timestamps, end_ns) if end_ns is not None else len(offsets)
+        for position in range(first, last):
+            timestamp_ns, frame = reader.record(offsets[position])
+            for channel in _decode_channel(frame, channel_id):
+                yield timestamp_ns, channel
+
+
+def _frame_channels(data, start, end):
+    """The distinct channel ids of the frame at `data[start:end]`."""
+    command = data[start + 3]
+    if command in IGNORED_COMMAND_IDS or end - start < 8:
+        return ()
+    if command in LATLON_COMMANDS:
+        return (data[start + 5],)
+    channels = set()
+    index = start + 5
+    body_end = end - 1
+    while index + 1 < body_end:
+        data_end = index + 2 + FORMAT_SIZES[data[index + 1]]
+        if data_end > body_end:
+            break
+        channels.add(data[index])
+        index = data_end
+    return channels
+
+
+def _decode_channel(frame, channel_id):
+    """Decodes every occurrence of one channel in a frame, skipping the others by length."""
+    if frame[3] in LATLON_COMMANDS:
+        record = decode_ascii_frame(frame, compact=True)
+        if record is not None and channel_id in record.values:
+            yield record.values[channel_id]
+        return
+    index = 5
+    body_end = len(frame) - 1
+    while index + 1 < body_end:
+        format_byte = frame[index + 1]
+        data_end = index + 2 + FORMAT_SIZES[format_byte]
+        if data_end > body_end:
+            break
+        if frame[index] == channel_id:
+            data = bytes(frame[index + 2:data_end])
+            yield ChannelValue(channel_id, format_byte, data, VALUE_DECODERS[format_byte](data))
+        index = data_end
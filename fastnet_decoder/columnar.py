@@ -0,0 +1,230 @@
+from array import array
+import os
+from .batch import FrameColumns, _use_numpy, decode_frames, decode_packed
+from .capture import FILE_HEADER, MAGIC, CaptureReader
+from .frame_buffer import FASTNET_BAUD_RATE, FASTNET_BITS_PER_BYTE
+from .parallel import decode_file
+from .sync import iter_frames
+from . import numpy_engine
+
+
+"""
+Arrow and pandas Export
+=======================
+
+`to_arrow` and `to_dataframe` decode a capture into one table with a row per frame:
+
+- `timestamp_ns` (int64): Arrival time of the frame, only when the input has timestamps.
+- `source` (uint8): Source address of the frame.
+- One float64 column per channel, named as in `CHANNEL_LOOKUP`, NaN where a frame does
+  not carry the channel. If a frame carries a channel twice, the last value is kept.
+
+A frames capture is decoded in place: its record headers are read into offset arrays and
+the frames are decoded straight from the mapped file. A chunks capture is copied once
+into a contiguous stream of its record payloads, as frames can span records, and each
+frame is stamped from the record that completed it, as `FrameBuffer` does with
+timestamped chunks.
+
+The decoded `FrameColumns` are scattered into table columns allocated once at their final
+length, and handed to Arrow and pandas without a copy. With NumPy, no per-frame objects
+are built, so besides the result the peak memory holds about 24 bytes of offsets per
+record, plus the stream copy for a chunks capture.
+
+pyarrow and pandas are optional (`pip install pyfastnet[arrow]` or `pyfastnet[pandas]`)
+and imported on first use, so the rest of the package does not pay for loading them.
+
+Example:
+--------
+table = to_arrow("race.fncap", channels={0x41, 0x4D})
+frame = to_dataframe("season.bin", workers=16)
+"""
+
+
+def _require(module_name, extra, function_name):
+    """Imports an optional dependency, with an install hint if it is missing."""
+    try:
+        return __import__(module_name)
+    except ImportError:
+        raise ImportError(f"{module_name} is required for {function_name}(): pip install pyfastnet[{extra}]") from None
+
+
+def _is_capture(path):
+    with open(path, "rb") as f:
+        return f.read(FILE_HEADER.size).startswith(MAGIC)
+
+
+def _frames_capture_columns(reader, channels, engine):
+    """Decodes a frames capture in place: the frames are read from the mapped file at their record offsets."""
+    timestamps, starts, lengths = reader.record_table()
+    with reader.buffer() as view:
+        return decode_packed(view, starts, lengths, timestamps, channels, engine)
+
+
+def _chunks_capture_columns(reader, channels, engine):
+    """
+    Decodes a chunks capture as one stream of its record payloads, stamping each frame
+    with the timestamp of the record that completed it minus the wire time of the bytes
+    read after the frame.
+    """
+    chunk_timestamps, starts, lengths = reader.record_table()
+    # Frames can span records, so the payloads are copied once into a contiguous stream
+    stream = bytearray(sum(lengths))
+    chunk_ends = array("q")
+    position = 0
+    with reader.buffer() as view:
+        for start, length in zip(starts, lengths):
+            stream[position:position + length] = view[start:start + length]
+            position += length
+            chunk_ends.append(position)
+    byte_time_ns = round(FASTNET_BITS_PER_BYTE * 1_000_000_000 / FASTNET_BAUD_RATE)
+
+    if _use_numpy(engine):
+        np = numpy_engine.np
+        buffer = np.frombuffer(stream, dtype=np.uint8)
+        frame_starts = numpy_engine.stream_frame_starts(buffer)
+        frame_ends = frame_starts + buffer[frame_starts + 2].astype(np.int64) + 6
+        ends = np.frombuffer(chunk_ends, dtype=np.int64)
+        chunk = np.searchsorted(ends, frame_ends)
+        frame_timestamps = np.frombuffer(chunk_timestamps, dtype=np.int64)[chunk] - (ends[chunk] - frame_ends) * byte_time_ns
+        return decode_packed(stream, frame_starts, frame_ends - frame_starts, frame_timestamps, channels, "numpy")
+
+    frame_starts = array("q")
+    frame_lengths = array("q")
+    frame_timestamps = array("q")
+    chunk = 0
+    for frame_start, frame_end in iter_frames(stream):
+        while chunk_ends[chunk] < frame_end:
+            chunk += 1
+        frame_starts.append(frame_start)
+        frame_lengths.append(frame_end - frame_start)
+        frame_timestamps.append(chunk_timestamps[chunk] - (chunk_ends[chunk] - frame_end) * byte_time_ns)
+    return decode_packed(stream, frame_starts, frame_lengths, frame_timestamps, channels, "python")
+
+
+def _capture_columns(reader, channels, engine):
+    if reader.kind == "frames":
+        return _frames_capture_columns(reader, channels, engine)
+    return _chunks_capture_columns(reader, channels, engine)
+
+
+def load_columns(source, channels=None, engine="auto", workers=None):
+    """
+    Decodes any supported input into FrameColumns.
+
+    Args:
+        source: `FrameColumns`, an open `CaptureReader`, the path of a capture (frames or
+            chunks) or of a raw capture file, or anything `decode_frames` accepts.
+        channels (set): Channel ids to collect, None for all.
+        engine (str): Decode engine, see `decode_frames`.
+        workers (int): Processes used for a raw capture file, see `decode_file`.
+
+    Returns:
+        FrameColumns: The decoded columns.
+    """
+    if isinstance(source, FrameColumns):
+        return source
+    if isinstance(source, CaptureReader):
+        return _capture_columns(source, channels, engine)
+    if isinstance(source, (str, os.PathLike)):
+        if _is_capture(source):
+            with CaptureReader(source) as reader:
+                return _capture_columns(reader, channels, engine)
+        return decode_file(source, channels, workers, engine)
+    return decode_frames(source, channels, engine)
+
+
+def _channel_matrix(columns, channel_ids):
+    """Scatters the channels into one `(channels, frames)` float64 NumPy block, NaN where a frame lacks a channel."""
+    np = numpy_engine.np
+    matrix = np.full((len(channel_ids), columns.frame_count), np.nan)
+    for row, channel_id in zip(matrix, channel_ids):
+        column = columns.columns[channel_id]
+        row[np.frombuffer(column.frames, dtype=np.int64)] = np.frombuffer(column.values, dtype=np.float64)
+    return matrix
+
+
+def table_columns(columns):
+    """
+    Scatters per-channel columns into table columns with one row per frame.
+
+    Args:
+        columns (FrameColumns): Decoded columns.
+
+    Returns:
+        list: `(channel_id, values)` pairs in channel id order, where `values` holds
+        `frame_count` float64 values, a NumPy array when NumPy is installed, else an `array('d')`.
+    """
+    channel_ids = sorted(columns.columns)
+    if numpy_engine.np is not None:
+        return list(zip(channel_ids, _channel_matrix(columns, channel_ids)))
+
+    result = []
+    for channel_id in channel_ids:
+        column = columns.columns[channel_id]
+        values = array("d", [float("nan")]) * columns.frame_count
+        for frame_index, value in zip(column.frames, column.values):
+            values[frame_index] = value
+        result.append((channel_id, values))
+    return result
+
+
+def to_arrow(source, channels=None, engine="auto", workers=None):
+    """
+    Decodes a capture into a `pyarrow.Table` with one row per frame.
+
+    Args:
+        source: Input accepted by `load_columns`.
+        channels (set): Channel ids to collect, None for all.
+        engine (str): Decode engine, see `decode_frames`.
+        workers (int): Processes used for a raw capture file, see `decode_file`.
+
+    Returns:
+        pyarrow.Table: `timestamp_ns` (when timestamped), `source` and one float64 column per channel.
+    """
+    pa = _require("pyarrow", "arrow", "to_arrow")
+    columns = load_columns(source, channels, engine, workers)
+    frame_count = columns.frame_count
+
+    def wrap(data_type, values):
+        # Wraps the buffer as an Arrow array without copying it
+        return pa.Array.from_buffers(data_type, frame_count, [None, pa.py_buffer(values)])
+
+    names = []
+    arrays = []
+    if columns.timestamps is not None:
+        names.append("timestamp_ns")
+        arrays.append(wrap(pa.int64(), columns.timestamps))
+    names.append("source")
+    arrays.append(wrap(pa.uint8(), columns.sources))
+    for channel_id, values in table_columns(columns):
+        names.append(columns.columns[channel_id].name)
+        arrays.append(wrap(pa.float64(), values))
+    return pa.Table.from_arrays(arrays, names=names)
+
+
+def to_dataframe(source, channels=None, engine="auto", workers=None):
+    """
+    Decodes a capture into a `pandas.DataFrame` with one row per frame.
+
+    Args:
+        source: Input accepted by `load_columns`.
+        channels (set): Channel ids to collect, None for all.
+        engine (str): Decode engine, see `decode_frames`.
+        workers (int): Processes used for a raw capture file, see `decode_file`.
+
+    Returns:
+        pandas.DataFrame: `timestamp_ns` (when timestamped), `source` and one float64 column per channel.
+    """
+    pd = _require("pandas", "pandas", "to_dataframe")
+    np = numpy_engine.np
+    columns = load_columns(source, channels, engine, workers)
+
+    channel_ids = sorted(columns.columns)
+    names = [columns.columns[channel_id].name for channel_id in channel_ids]
+    # The transposed block becomes the single float64 block of the DataFrame, without a copy
+    matrix = _channel_matrix(columns, channel_ids)
+    frame = pd.DataFrame(matrix.T, columns=names, copy=False)
+    frame.insert(0, "source", np.frombuffer(columns.sources, dtype=np.uint8))
+    if columns.timestamps is not None:
+        frame.insert(0, "timestamp_ns", np.frombuffer(columns.timestamps, dtype=np.int64))
+    return frame
@@ -0,0 +1,114 @@
+import time
+from .formats import FORMAT_SIZES
+
+
+"""
+Delta Filtering
+===============
+
+On a steady boat most channels repeat the same data bytes frame after frame. A
+`DeltaFilter` remembers the last format byte and data bytes seen for every channel of
+every source and reports which channels of a new frame differ. Pass one to
+`FrameBuffer(delta=...)` and only the changed channels are decoded and queued, so a
+frame with nothing new produces no output at all.
+
+The comparison is made on the raw bytes before decoding, so unchanged channels cost a
+bytes comparison instead of a decode.
+
+A channel is also reported when it has not been sent for `heartbeat` seconds, so a
+consumer that joins late or misses a delta is brought up to date within one heartbeat.
+Call `reset()` to force every channel to be sent again with its next frame.
+
+Example:
+--------
+frame_buffer = FrameBuffer(compact=True, delta=DeltaFilter(heartbeat=5.0))
+"""
+
+
+class DeltaFilter:
+    """
+    Tracks the last raw data of every (source, channel) pair and reports changes.
+
+    Attributes:
+        heartbeat (float): Seconds after which an unchanged channel is sent again, None to never resend.
+        changed (int): Channels reported because their data changed or they were new.
+        refreshed (int): Unchanged channels reported because their heartbeat was due.
+        suppressed (int): Unchanged channels left out.
+    """
+    def __init__(self, heartbeat=None):
+        if heartbeat is not None and heartbeat <= 0:
+            raise ValueError("DeltaFilter heartbeat must be positive.")
+        self.heartbeat = heartbeat
+        self._heartbeat_ns = round(heartbeat * 1_000_000_000) if heartbeat is not None else None
+        self._last = {}  # (source << 8 | channel_id) -> [raw bytes, time sent in ns]
+        self.changed = 0
+        self.refreshed = 0
+        self.suppressed = 0
+
+    def _check(self, key, raw, now_ns):
+        """Records `raw` for `key` and returns True if it must be sent."""
+        entry = self._last.get(key)
+        if entry is None or entry[0] != raw:
+            self._last[key] = [raw, now_ns]
+            self.changed += 1
+            return True
+        if self._heartbeat_ns is not None and now_ns - entry[1] >= self._heartbeat_ns:
+            entry[1] = now_ns
+            self.refreshed += 1
+            return True
+        self.suppressed += 1
+        return False
+
+    def changed_channels(self, frame, timestamp_ns=None, channels=None):
+        """
+        Finds the channels of a validated frame that must be sent.
+
+        Args:
+            frame (bytes): The full frame, as bytes or a memoryview.
+            timestamp_ns (int): Arrival time of the frame, `time.monotonic_ns()` if None.
+            channels (frozenset): Channel ids to consider, None for all.
+
+        Returns:
+            set: Ids of the channels that changed, are new, or are due a heartbeat.
+        """
+        now_ns = time.monotonic_ns() if timestamp_ns is None else timestamp_ns
+        source = frame[1] << 8
+        result = set()
+        index = 5
+        body_end = len(frame) - 1
+        while index + 1 < body_end:
+            channel_id = frame[index]
+            data_end = index + 2 + FORMAT_SIZES[frame[index + 1]]
+            if data_end > body_end:
+                break
+            if (channels is None or channel_id in channels) and \
+                    self._check(source | channel_id, bytes(frame[index + 1:data_end]), now_ns):
+                result.add(channel_id)
+            index = data_end
+        return result
+
+    def ascii_changed(self, frame, timestamp_ns=None):
+        """
+        Checks whether an ASCII (LatLon) frame must be sent, comparing its whole body.
+
+        Args:
+            frame (bytes): The full frame, as bytes or a memoryview.
+            timestamp_ns (int): Arrival time of the frame, `time.monotonic_ns()` if None.
+
+        Returns:
+            bool: True if the body changed, is new, or is due a heartbeat.
+        """
+        now_ns = time.monotonic_ns() if timestamp_ns is None else timestamp_ns
+        return self._check((frame[1] << 8) | frame[5], bytes(frame[6:-1]), now_ns)
+
+    def reset(self):
+        """Forgets every channel, so each is sent again with its next frame."""
+        self._last.clear()
+
+    def stats(self):
+        """
+        Returns:
+            dict: Counters and number of tracked channels.
+        """
+        return {"tracked": len(self._last), "changed": self.changed,
+                "refreshed": self.refreshed, "suppressed": self.suppressed}
@@ -0,0 +1,266 @@
+from abc import ABC, abstractmethod
+from datetime import timedelta
+import json
+import math
+import os
+from .lazy_frame import LazyFrame
+from .mappings import ADDRESS_LOOKUP, CHANNEL_LOOKUP
+
+
+"""
+Exporters
+=========
+
+`CsvExporter` and `JsonLinesExporter` write decoded frames to text files as a stream.
+They accept any decoded frame: the dictionaries of `decode_frame`, compact `FrameRecord`s
+or `LazyFrame`s, from a FrameBuffer queue, an `on_frame` handler or a capture reader.
+
+Each row is assembled from pieces prepared once per channel or source, such as the CSV
+column position or the JSON-encoded key, instead of serialising the nested decode
+output. Only the interpreted values are written. Rows are collected and written in
+batches of `batch_size`.
+
+- CSV: a header row, then one row per frame with `timestamp_ns`, `source` and one column
+  per exported channel. Channels not carried by a frame are left empty.
+- JSON Lines: one object per frame, `{"timestamp_ns": ..., "source": ..., "values": {...}}`,
+  with values keyed by channel name. Timers are written in seconds and non-finite numbers
+  as null.
+
+Example:
+--------
+with CsvExporter("race.csv", channels=[0x41, 0x4D, 0x51]) as exporter:
+    frame_buffer.on_frame(exporter.write)
+    ...
+
+with JsonLinesExporter("race.jsonl") as exporter, CaptureReader("race.fncap") as reader:
+    exporter.write_frames(decode_frame(frame, compact=True) for _, frame in reader.frames())
+"""
+
+# Rows collected before they are written out
+EXPORT_BATCH_SIZE = 1000
+
+_CHANNEL_IDS_BY_NAME = {name: channel_id for channel_id, name in CHANNEL_LOOKUP.items()}
+
+
+def _channel_name(channel_id):
+    return CHANNEL_LOOKUP.get(channel_id, f"Unknown (0x{channel_id:02X})")
+
+
+def _frame_fields(frame):
+    """
+    Splits a decoded frame of any output type into its parts.
+
+    Returns:
+        tuple: `(timestamp_ns, source, values)`, with `source` an address id or name and
+        `values` an iterable of `(channel id or name, interpreted value)` pairs.
+    """
+    if isinstance(frame, dict):
+        values = frame.get("values", {})
+        return (frame.get("timestamp_ns"), frame.get("from_address"),
+                ((name, channel["interpreted"] if channel else None) for name, channel in values.items()))
+    if isinstance(frame, LazyFrame):
+        values = ((channel_id, frame[channel_id]) for channel_id in frame.channel_ids())
+        return (frame.timestamp_ns, frame.from_address,
+                ((channel_id, channel["interpreted"] if channel else None) for channel_id, channel in values))
+    return (frame.timestamp_ns, frame.from_address,
+            ((channel_id, channel.value) for channel_id, channel in frame.values.items()))
+
+
+def _source_name(source):
+    if isinstance(source, int):
+        return ADDRESS_LOOKUP.get(source, f"Unknown (0x{source:02X})")
+    return source
+
+
+class _Exporter(ABC):
+    """Buffered row writer shared by the exporters."""
+    def __init__(self, file, batch_size):
+        if isinstance(file, (str, os.PathLike)):
+            self._file = open(file, "w", newline="", encoding="utf-8")
+            self._owns_file = True
+        else:
+            self._file = file
+            self._owns_file = False
+        self.batch_size = batch_size
+        self.rows = 0
+        self._pending = []
+        self._sources = {}  # Encoded source per address id or name
+        self.closed = False
+
+    def write(self, frame):
+        """
+        Adds one decoded frame.
+
+        Args:
+            frame: A dictionary from `decode_frame`, a `FrameRecord` or a `LazyFrame`.
+        """
+        row = self._row(frame)
+        if row is None:
+            return
+        self._pending.append(row)
+        self.rows += 1
+        if len(self._pending) >= self.batch_size:
+            self._write_pending()
+
+    def write_frames(self, frames):
+        """
+        Adds every decoded frame of an iterable.
+
+        Args:
+            frames: Iterable of decoded frames, e.g. drained from `frame_queue` or decoded from a capture.
+        """
+        for frame in frames:
+            self.write(frame)
+
+    @abstractmethod
+    def _row(self, frame):
+        """Builds the text of one row, or returns None to skip the frame."""
+
+    @abstractmethod
+    def _encode_source(self, name):
+        """Encodes a source name for the rows."""
+
+    def _source(self, source):
+        encoded = self._sources.get(source)
+        if encoded is None:
+            encoded = self._sources[source] = self._encode_source(_source_name(source))
+        return encoded
+
+    def _write_pending(self):
+        if self._pending:
+            self._pending.append("")  # Ends the batch with a newline
+            self._file.write("\n".join(self._pending))
+            self._pending = []
+
+    def flush(self):
+        """Writes the collected rows to the file."""
+        self._write_pending()
+        self._file.flush()
+
+    def close(self):
+        """Flushes and, if the exporter opened it, closes the file."""
+        if self.closed:
+            return
+        self.flush()
+        if self._owns_file:
+            self._file.close()
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, float):
+        return repr(value) if math.isfinite(value) else ""
+    if isinstance(value, timedelta):
+        return repr(value.total_seconds())
+    return _csv_text(str(value))
+
+
+def _csv_text(text):
+    if "," in text or '"' in text or "\n" in text or "\r" in text:
+        return '"' + text.replace('"', '""') + '"'
+    return text
+
+
+class CsvExporter(_Exporter):
+    """
+    Writes decoded frames as CSV rows with one column per channel.
+
+    Args:
+        file: A path, or a text file object opened with `newline=""`.
+        channels (list): Channel ids to export, in column order.
+        batch_size (int): Rows collected before they are written out.
+
+    Attributes:
+        rows (int): Rows written, header excluded.
+    """
+    def __init__(self, file, channels, batch_size=EXPORT_BATCH_SIZE):
+        super().__init__(file, batch_size)
+        self.channels = list(channels)
+        # Column of each channel, looked up by id (records, lazy frames) or by name (dictionaries)
+        self._columns = {}
+        for position, channel_id in enumerate(self.channels):
+            self._columns[channel_id] = position
+            self._columns[_channel_name(channel_id)] = position
+        self._empty = [""] * len(self.channels)
+        self._pending.append(",".join(["timestamp_ns", "source"] + [_csv_text(_channel_name(c)) for c in self.channels]))
+
+    def _encode_source(self, name):
+        return _csv_text(name)
+
+    def _row(self, frame):
+        timestamp_ns, source, values = _frame_fields(frame)
+        cells = self._empty[:]
+        columns = self._columns
+        found = False
+        for key, value in values:
+            position = columns.get(key)
+            if position is not None:
+                cells[position] = _csv_value(value)
+                found = True
+        if not found:
+            return None  # The frame carries none of the exported channels
+        return f"{'' if timestamp_ns is None else timestamp_ns},{self._source(source)},{','.join(cells)}"
+
+
+def _json_value(value):
+    if value is None:
+        return "null"
+    if isinstance(value, float):
+        return repr(value) if math.isfinite(value) else "null"
+    if isinstance(value, timedelta):
+        return repr(value.total_seconds())
+    return json.dumps(value)
+
+
+class JsonLinesExporter(_Exporter):
+    """
+    Writes decoded frames as JSON Lines with values keyed by channel name.
+
+    Args:
+        file: A path, or a text file object.
+        channels (set): Channel ids to export, None for all.
+        batch_size (int): Lines collected before they are written out.
+
+    Attributes:
+        rows (int): Lines written.
+    """
+    def __init__(self, file, channels=None, batch_size=EXPORT_BATCH_SIZE):
+        super().__init__(file, batch_size)
+        self.channels = frozenset(channels) if channels is not None else None
+        self._keys = {}  # Encoded '"name":' per channel id or name, None for channels not exported
+
+    def _encode_source(self, name):
+        return json.dumps(name)
+
+    def _key(self, key):
+        if isinstance(key, int):
+            channel_id, name = key, _channel_name(key)
+        else:
+            channel_id, name = _CHANNEL_IDS_BY_NAME.get(key), key
+        if self.channels is not None and channel_id not in self.channels:
+            encoded = None
+        else:
+            encoded = json.dumps(name) + ":"
+        self._keys[key] = encoded
+        return encoded
+
+    def _row(self, frame):
+        timestamp_ns, source, values = _frame_fields(frame)
+        keys = self._keys
+        members = []
+        for key, value in values:
+            encoded = keys[key] if key in keys else self._key(key)
+            if encoded is not None:
+                members.append(encoded + _json_value(value))
+        if not members:
+            return None
+        timestamp = "null" if timestamp_ns is None else timestamp_ns
+        return f'{{"timestamp_ns":{timestamp},"source":{self._source(source)},"values":{{{",".join(members)}}}}}'
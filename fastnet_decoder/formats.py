@@ -0,0 +1,283 @@
+import datetime
+from .utils import convert_segment_a_to_char, convert_segment_b_to_char
+from .mappings import FORMAT_SIZE_MAP
+from .logger import logger
+
+
+"""
+Format Table
+============
+
+Every FastNet channel carries a format byte:
+- bits 7-6: divisor (1, 10, 100 or 1000)
+- bits 5-4: number of display digits (1 to 4)
+- bits 3-0: data format (16-bit signed, segment + unsigned, timer, ...)
+
+Rather than unpacking those bits on every channel, `FORMAT_DECODERS` holds one decode
+callable per possible format byte, built once at import with the divisor and the sign
+rules of its format already bound. Each callable takes the channel data bytes and
+returns `(raw_value, interpreted_value)`, or None when the data cannot be decoded.
+`FORMAT_INFO` holds the matching `(divisor, digits, format_bits)` for each format byte
+and `FORMAT_SIZES` the number of data bytes that follow it in a frame.
+
+`VALUE_DECODERS` is the lean counterpart used for compact output: it returns only the
+interpreted value and builds no raw detail. It relies on the data length coming from
+`FORMAT_SIZES`, as it does when walking a frame body, so it does not check it again.
+"""
+
+DIVISORS = (1, 10, 100, 1000)
+DIGITS = (1, 2, 3, 4)
+
+# Format 0x03 carries a sign in its segment byte, resolved once per segment code
+NEGATIVE_LAYOUTS = {"-[data]", "=[data]"}
+SEGMENT_A_LAYOUTS = tuple(convert_segment_a_to_char(code) for code in range(256))
+SEGMENT_A_NEGATIVE = tuple(layout in NEGATIVE_LAYOUTS for layout in SEGMENT_A_LAYOUTS)
+SEGMENT_B_CHARS = tuple(convert_segment_b_to_char(code) for code in range(256))
+
+
+def _length_ok(data_bytes, expected, mismatch_message):
+    """Checks the data length, logging the same warnings as the original decoder."""
+    size = len(data_bytes)
+    if size == expected:
+        return True
+    if size == 0:
+        logger.warning("decode_format_and_data: Empty data bytes; cannot decode.")
+    else:
+        logger.warning(mismatch_message)
+    return False
+
+
+def _signed_16(divisor):
+    """Format 0x01: 16-bit signed integer."""
+    def decode(data_bytes):
+        if not _length_ok(data_bytes, 2, "Data length mismatch for 16-bit signed integer (expected 2 bytes)."):
+            return None
+        raw_value = int.from_bytes(data_bytes, byteorder="big", signed=True)
+        return raw_value, raw_value / divisor
+    return decode
+
+
+def _segment_6_unsigned_10(divisor):
+    """Format 0x02: 6-bit segment + 10-bit unsigned value."""
+    def decode(data_bytes):
+        if not _length_ok(data_bytes, 2, "Data length mismatch for 6-bit segment + 10-bit unsigned (expected 2 bytes)."):
+            return None
+        segment_code = (data_bytes[0] >> 2) & 0b111111  # 6-bit segment code
+        unsigned_value = ((data_bytes[0] & 0b11) << 8) | data_bytes[1]  # 10-bit unsigned value
+        return {"segment_code": segment_code, "unsigned_value": unsigned_value}, unsigned_value / divisor
+    return decode
+
+
+def _segment_8_unsigned_8(divisor):
+    """Format 0x03: 8-bit segment (carrying the sign) + 8-bit unsigned value."""
+    def decode(data_bytes):
+        if not _length_ok(data_bytes, 2, "Data length mismatch for 7-bit segment + 9-bit unsigned (expected 2 bytes)."):
+            return None
+        # Documented as 7-bit segment + 9-bit unsigned, but observed data is 8+8
+        segment_code = data_bytes[0]
+        unsigned_value = data_bytes[1]
+        signed_value = -unsigned_value if SEGMENT_A_NEGATIVE[segment_code] else unsigned_value
+        raw_value = {"segment_code": hex(segment_code), "segment_code_bin": bin(segment_code),
+                     "unsigned_value": unsigned_value, "layout": SEGMENT_A_LAYOUTS[segment_code]}
+        return raw_value, signed_value / divisor
+    return decode
+
+
+def _segment_8_unsigned_24(divisor):
+    """Format 0x04: 8-bit segment + 24-bit unsigned value."""
+    def decode(data_bytes):
+        if not _length_ok(data_bytes, 4, "Data length mismatch for 8-bit + 24-bit unsigned (expected 4 bytes)."):
+            return None
+        segment_code = data_bytes[0]  # 8-bit segment code
+        unsigned_value = int.from_bytes(data_bytes[1:], byteorder="big", signed=False)  # 24-bit unsigned value
+        return {"segment_code": segment_code, "unsigned_value": unsigned_value}, unsigned_value / divisor
+    return decode
+
+
+def _timer(divisor):
+    """Format 0x05: timer (XX HH MM SS), the divisor does not apply."""
+    def decode(data_bytes):
+        if not _length_ok(data_bytes, 4, "Data length mismatch for timer format (expected 4 bytes)."):
+            return None
+        useless, hours, minutes, seconds = data_bytes  # First byte can be ignored, hours may exceed 24
+        raw_value = {"useless": useless, "hours": hours, "minutes": minutes, "seconds": seconds}
+        return raw_value, datetime.timedelta(hours=hours, minutes=minutes, seconds=seconds)
+    return decode
+
+
+def _segment_text(divisor):
+    """Format 0x06: 7-segment display text, the divisor does not apply."""
+    def decode(data_bytes):
+        if not _length_ok(data_bytes, 4, "Data length mismatch for 7-segment display text (expected 4 bytes)."):
+            return None
+        segment_text = "".join(SEGMENT_B_CHARS[byte] for byte in data_bytes)
+        return [f"{byte:02X}" for byte in data_bytes], segment_text
+    return decode
+
+
+def _unsigned_15(divisor):
+    """Format 0x07: 15-bit unsigned value in the last two of four bytes."""
+    def decode(data_bytes):
+        if not _length_ok(data_bytes, 4, "Data length mismatch for 15-bit unsigned (expected 4 bytes)."):
+            return None
+        msb = (data_bytes[2] >> 1) & 0b01111111  # 7 bits from third byte
+        unsigned_value = (msb << 8) | data_bytes[3]  # Combine with the full fourth byte
+        return unsigned_value, unsigned_value / divisor
+    return decode
+
+
+def _segment_7_unsigned_9(divisor):
+    """Format 0x08: 7-bit segment + 9-bit unsigned value."""
+    def decode(data_bytes):
+        if not _length_ok(data_bytes, 2, "decode_format_and_data: Data length mismatch for 0x08 (7-bit segment + 9-bit unsigned)."):
+            return None
+        segment_code = (data_bytes[0] >> 1) & 0b01111111  # 7-bit segment
+        unsigned_value = ((data_bytes[0] & 0b1) << 8) | data_bytes[1]  # 9-bit unsigned value
+        return {"segment_code": segment_code, "unsigned_value": unsigned_value}, unsigned_value / divisor
+    return decode
+
+
+def _signed_16_pair(divisor):
+    """Format 0x0A: two 16-bit signed values, the first one is the interpreted value."""
+    def decode(data_bytes):
+        if not _length_ok(data_bytes, 4, "Data length mismatch for 16-bit + 16-bit signed (expected 4 bytes)."):
+            return None
+        first_value = int.from_bytes(data_bytes[:2], byteorder="big", signed=True) / divisor
+        second_value = int.from_bytes(data_bytes[2:], byteorder="big", signed=True) / divisor
+        return {"first": first_value, "second": second_value}, first_value
+    return decode
+
+
+def _unsupported(format_bits):
+    """Formats without a known layout."""
+    def decode(data_bytes):
+        if not data_bytes:
+            logger.warning("decode_format_and_data: Empty data bytes; cannot decode.")
+        else:
+            logger.error(f"Unsupported format: 0x{format_bits:02X}.")
+        return None
+    return decode
+
+
+def _signed_16_value(divisor):
+    def value(data_bytes):
+        return int.from_bytes(data_bytes, byteorder="big", signed=True) / divisor
+    return value
+
+
+def _segment_6_unsigned_10_value(divisor):
+    def value(data_bytes):
+        return (((data_bytes[0] & 0b11) << 8) | data_bytes[1]) / divisor
+    return value
+
+
+def _segment_8_unsigned_8_value(divisor):
+    def value(data_bytes):
+        if SEGMENT_A_NEGATIVE[data_bytes[0]]:
+            return -data_bytes[1] / divisor
+        return data_bytes[1] / divisor
+    return value
+
+
+def _segment_8_unsigned_24_value(divisor):
+    def value(data_bytes):
+        return int.from_bytes(data_bytes[1:], byteorder="big", signed=False) / divisor
+    return value
+
+
+def _timer_value(divisor):
+    def value(data_bytes):
+        return datetime.timedelta(hours=data_bytes[1], minutes=data_bytes[2], seconds=data_bytes[3])
+    return value
+
+
+def _segment_text_value(divisor):
+    def value(data_bytes):
+        return "".join(SEGMENT_B_CHARS[byte] for byte in data_bytes)
+    return value
+
+
+def _unsigned_15_value(divisor):
+    def value(data_bytes):
+        return ((((data_bytes[2] >> 1) & 0b01111111) << 8) | data_bytes[3]) / divisor
+    return value
+
+
+def _segment_7_unsigned_9_value(divisor):
+    def value(data_bytes):
+        return (((data_bytes[0] & 0b1) << 8) | data_bytes[1]) / divisor
+    return value
+
+
+def _signed_16_pair_value(divisor):
+    def value(data_bytes):
+        return int.from_bytes(data_bytes[:2], byteorder="big", signed=True) / divisor
+    return value
+
+
+FORMAT_FACTORIES = {
+    0x01: _signed_16,
+    0x02: _segment_6_unsigned_10,
+    0x03: _segment_8_unsigned_8,
+    0x04: _segment_8_unsigned_24,
+    0x05: _timer,
+    0x06: _segment_text,
+    0x07: _unsigned_15,
+    0x08: _segment_7_unsigned_9,
+    0x0A: _signed_16_pair,
+}
+
+VALUE_FACTORIES = {
+    0x01: _signed_16_value,
+    0x02: _segment_6_unsigned_10_value,
+    0x03: _segment_8_unsigned_8_value,
+    0x04: _segment_8_unsigned_24_value,
+    0x05: _timer_value,
+    0x06: _segment_text_value,
+    0x07: _unsigned_15_value,
+    0x08: _segment_7_unsigned_9_value,
+    0x0A: _signed_16_pair_value,
+}
+
+
+def build_format_decoder(format_byte):
+    """
+    Builds the decode callable for a format byte.
+
+    Args:
+        format_byte (int): The format byte indicating divisor, digits, and data interpretation.
+
+    Returns:
+        callable: Takes the data bytes and returns `(raw_value, interpreted_value)` or None.
+    """
+    format_bits = format_byte & 0x0F
+    factory = FORMAT_FACTORIES.get(format_bits)
+    if factory is None:
+        return _unsupported(format_bits)
+    return factory(DIVISORS[(format_byte >> 6) & 0b11])
+
+
+def build_value_decoder(format_byte):
+    """
+    Builds the value-only decode callable for a format byte.
+
+    Args:
+        format_byte (int): The format byte indicating divisor, digits, and data interpretation.
+
+    Returns:
+        callable: Takes the data bytes and returns the interpreted value or None.
+    """
+    format_bits = format_byte & 0x0F
+    factory = VALUE_FACTORIES.get(format_bits)
+    if factory is None:
+        return _unsupported(format_bits)
+    return factory(DIVISORS[(format_byte >> 6) & 0b11])
+
+
+FORMAT_DECODERS = tuple(build_format_decoder(format_byte) for format_byte in range(256))
+VALUE_DECODERS = tuple(build_value_decoder(format_byte) for format_byte in range(256))
+FORMAT_INFO = tuple(
+    (DIVISORS[(format_byte >> 6) & 0b11], DIGITS[(format_byte >> 4) & 0b11], format_byte & 0x0F)
+    for format_byte in range(256)
+)
+FORMAT_SIZES = tuple(FORMAT_SIZE_MAP.get(format_byte & 0x0F, 0) for format_byte in range(256))
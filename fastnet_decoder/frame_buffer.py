@@ -1,9 +1,21 @@
 from .utils import calculate_checksum  # Import checksum function from utils.py
 from .mappings import COMMAND_LOOKUP, IGNORED_COMMANDS
-from .decode_fastnet import decode_frame, decode_ascii_frame
+from .decode_fastnet import decode_frame, decode_ascii_frame, frame_has_channel
+from .formats import FORMAT_SIZES, VALUE_DECODERS
+from .records import ChannelValue
+from .lazy_frame import LazyFrame
 from .logger import logger
+from .sync import find_header_offsets
+from .backpressure import DropNewest
+from collections import deque
+import copy
+import logging
 from queue import Queue
 
+# FastNet runs at 11520 baud with 8 data bits, odd parity and 2 stop bits: 12 bits per byte on the wire
+FASTNET_BAUD_RATE = 11520
+FASTNET_BITS_PER_BYTE = 12
+
 
 """
 FrameBuffer Class
@@ -16,15 +28,18 @@ it suitable for scenarios like serial communication with hardware devices.
 Core Responsibilities:
 -----------------------
 1. **Buffer Management**:
-   - The class maintains an internal `bytearray` buffer to store incoming raw data.
+   - The class maintains a preallocated `bytearray` with read and write cursors to store incoming raw data.
    - New data can be added to the buffer using the `add_to_buffer` method.
    - The buffer automatically trims its size to a configurable maximum (`max_buffer_size`) to avoid unbounded memory usage.
+   - Consuming a frame, skipping a bad byte or trimming old data moves the read cursor instead of copying the buffer.
 
 2. **Frame Extraction**:
    - The `get_complete_frames` method scans the buffer for complete frames based on the FastNet protocol structure:
      - A frame consists of a 5-byte header, a variable-length body, and a checksum.
      - Both the header and body checksums are validated before processing the frame.
    - Frames that are incomplete or fail checksum validation are skipped, and the buffer is adjusted to search for the next valid frame.
+   - After a checksum mismatch the buffer is scanned in one pass for candidate headers, so resyncing after line noise
+     costs one scan instead of one loop iteration per byte.
 
 3. **Frame Decoding**:
    - After extracting a valid frame, the method determines the appropriate decoder (ASCII or standard) based on the command type.
@@ -58,6 +73,39 @@ Configuration Parameters:
 -------------------------
 - `max_buffer_size`: Limits the size of the internal buffer. Older data is discarded when the buffer exceeds this size.
 - `max_queue_size`: Specifies the maximum number of frames that can be stored in the `frame_queue`.
+- `baud_rate` / `bits_per_byte`: Bus line settings used to estimate per-frame arrival times when
+  `add_to_buffer` is given a `timestamp_ns`. Decoded frames then carry a `timestamp_ns` key or attribute.
+- `compact`: Queue `FrameRecord` objects keyed by integer channel id instead of nested dictionaries
+  (see `records.py`). Names and hex strings are then only built when `as_dict()` is called.
+- `lazy`: Queue `LazyFrame` objects that keep the validated frame bytes and decode a channel only
+  when it is read (see `lazy_frame.py`). ASCII (LatLon) frames are still decoded eagerly.
+- `channels`: A set of channel ids to decode, e.g. `{0x41, 0x49, 0x4D, 0x51, 0xC1}`. Other channels are
+  skipped by length, and frames without any wanted channel are dropped once their checksums are validated.
+- `decode_cache`: A `DecodeCache` that returns earlier results for repeated `(channel, format byte, data)`
+  triples (see `cache.py`). Cached results are shared, so consumers must not modify them.
+- `frame_cache`: A `FrameCache` that returns the earlier result for a byte-identical frame without decoding
+  it. With `FrameCache(changed_only=True)`, a frame identical to the previous one with the same header is dropped.
+- `state`: A `BoatState` updated in place with the latest value of every numeric channel in each validated
+  frame (see `state.py`), before the channel filter and frame cache are applied.
+- `delta`: A `DeltaFilter` that compares each channel's raw data with the last data from the same source
+  (see `delta.py`). Only changed channels, and channels due a heartbeat, are decoded and queued; frames with
+  none are dropped. Combine with `compact=True` for the smallest output. Cannot be used with `frame_cache`.
+- `overflow`: What to do when `frame_queue` is full (see `backpressure.py`): `DropNewest()` (default),
+  `DropOldest()`, `CoalesceLatest()`, `DropStale(max_age_ms)` or `Block(timeout)`. Each policy keeps counters.
+- `capture`: A `CaptureWriter` (see `capture.py`). A "frames" capture records every validated frame, including
+  ignored commands, with its arrival time; a "chunks" capture records every chunk added to the buffer.
+- `queue_frames`: Set to False to deliver frames only to the handlers registered with `on_channel` and
+  `on_frame`. Frames are then not decoded at all unless an `on_frame` handler is registered.
+
+Callbacks:
+----------
+- `on_channel(channel_id, callback)` calls `callback(channel_value, from_address, timestamp_ns)` from the
+  decode loop for every occurrence of the channel, with a `ChannelValue` (see `records.py`). Handlers are
+  looked up in a 256-entry table indexed by channel id, and channels without handlers are skipped by length.
+  ASCII (LatLon) frames are not dispatched per channel.
+- `on_frame(callback)` calls `callback(decoded_frame)` with every decoded frame before it is queued.
+Handlers run on the thread calling `get_complete_frames`, so they should return quickly. Exceptions they
+raise are logged and do not stop frame extraction.
 
 Use Cases:
 ----------
@@ -87,92 +135,369 @@ class FrameBuffer:
     """
     A class that manages an incoming data stream, extracts valid frames,
     and decodes them using the FastNet protocol.
+
+    Incoming bytes are stored in a preallocated bytearray that is twice the size of
+    `max_buffer_size`. A read cursor (`_head`) and a write cursor (`_tail`) mark the
+    live data, so consuming a frame, skipping a bad byte or trimming the oldest data
+    only moves a cursor. The live data is moved back to the start of the storage
+    when a new chunk does not fit behind the write cursor, which happens at most
+    once per `max_buffer_size` bytes received.
+
+    Validated frames are passed to the decoder as memoryview slices of the storage,
+    so a frame is never copied between arriving and being decoded. A view is only
+    valid until the next `add_to_buffer` call and must not be kept by the decoder.
+
+    When chunks are added with a monotonic timestamp, each frame is stamped with an
+    estimate of when its last byte arrived: the chunk timestamp minus the time the
+    bytes after the frame took on the wire at `baud_rate`.
     """
-    def __init__(self, max_buffer_size=8192, max_queue_size=1000):
-        self.buffer = bytearray()
+    def __init__(self, max_buffer_size=8192, max_queue_size=1000, compact=False, lazy=False, channels=None,
+                 decode_cache=None, frame_cache=None, baud_rate=FASTNET_BAUD_RATE,
+                 bits_per_byte=FASTNET_BITS_PER_BYTE, state=None, delta=None, overflow=None, queue_frames=True,
+                 capture=None):
+        if compact and lazy:
+            raise ValueError("FrameBuffer output can be compact or lazy, not both.")
+        if delta is not None and frame_cache is not None:
+            raise ValueError("FrameBuffer delta output cannot be combined with a frame cache.")
         self.max_buffer_size = max_buffer_size
+        self.compact = compact  # Queue FrameRecord objects instead of nested dictionaries
+        self.lazy = lazy  # Queue LazyFrame objects that decode channels on access
+        self.channels = frozenset(channels) if channels is not None else None  # Channel ids to decode, None for all
+        self.decode_cache = decode_cache  # Optional DecodeCache for repeated channel data
+        self.frame_cache = frame_cache  # Optional FrameCache for byte-identical repeated frames
+        self.state = state  # Optional BoatState holding the latest value per channel
+        self.delta = delta  # Optional DeltaFilter limiting output to changed channels
+        self.overflow = overflow if overflow is not None else DropNewest()  # Backpressure policy for a full queue
+        self.queue_frames = queue_frames  # Add decoded frames to frame_queue, False for callbacks only
+        self.capture = capture  # Optional CaptureWriter recording frames or raw chunks
+        self._capture_frames = capture is not None and capture.kind == "frames"
+        self._capture_chunks = capture is not None and capture.kind == "chunks"
+        self._channel_handlers = [()] * 256  # Callbacks per channel id
+        self._handled_channels = False  # True once any channel has a handler
+        self._frame_handlers = ()  # Callbacks for whole decoded frames
+        self._storage = bytearray(max_buffer_size * 2)
+        self._view = memoryview(self._storage)  # Frames are handed to the decoder as slices of this view
+        self._head = 0  # Offset of the oldest unconsumed byte
+        self._tail = 0  # Offset one past the newest byte
+        self._base = 0  # Stream position of the first storage byte
+        self._received = 0  # Stream position one past the newest byte
+        self._arrivals = deque()  # (stream position of chunk end, timestamp_ns) per timestamped chunk
+        self.byte_time_ns = round(bits_per_byte * 1_000_000_000 / baud_rate)  # Wire time of one byte
         self.frame_queue = Queue(maxsize=max_queue_size)  # Shared instance for frames
 
-    def add_to_buffer(self, new_data):
+    @property
+    def buffer(self):
+        """
+        A copy of the unconsumed data, kept for callers that used to read the buffer directly.
+
+        Returns:
+            bytearray: The bytes currently waiting to be framed.
+        """
+        return self._storage[self._head:self._tail]
+
+    def _compact(self):
+        """Moves the live data to the start of the storage so new data can be appended."""
+        size = self._tail - self._head
+        if self._head:
+            self._view[:size] = self._view[self._head:self._tail]
+        self._base += self._head
+        self._head = 0
+        self._tail = size
+
+    def add_to_buffer(self, new_data, timestamp_ns=None):
         """
         Adds new data to the buffer.
 
         Args:
             new_data (bytes): New data from the serial input.
+            timestamp_ns (int): Optional arrival time of the last byte of the chunk, from
+                `time.monotonic_ns()`. Frames completed by this chunk are stamped from it.
         """
         if not isinstance(new_data, (bytes, bytearray)):
             logger.error("Invalid data type passed to add_to_buffer. Expected bytes or bytearray.")
             return
 
-        self.buffer.extend(new_data)
-        logger.debug(f"Added {len(new_data)} bytes to buffer. Buffer size: {len(self.buffer)} bytes.")
+        size = len(new_data)
+        self._received += size
+        if timestamp_ns is not None:
+            self._arrivals.append((self._received, timestamp_ns))
+        if self._capture_chunks:
+            self.capture.write(new_data, timestamp_ns)
+
+        if size >= self.max_buffer_size:
+            # The chunk alone fills the buffer, so only its newest bytes are kept
+            if self._tail > self._head or size > self.max_buffer_size:
+                logger.warning("Buffer size exceeded maximum limit. Trimming the oldest data.")
+            self._view[:self.max_buffer_size] = memoryview(new_data)[size - self.max_buffer_size:]
+            self._head = 0
+            self._tail = self.max_buffer_size
+            self._base = self._received - self.max_buffer_size
+            self._discard_arrivals()
+            logger.debug(f"Added {size} bytes to buffer. Buffer size: {self.max_buffer_size} bytes.")
+            return
+
+        if self._tail + size > len(self._storage):
+            self._compact()
+
+        self._view[self._tail:self._tail + size] = new_data
+        self._tail += size
+        logger.debug(f"Added {size} bytes to buffer. Buffer size: {self._tail - self._head} bytes.")
 
         # Prevent the buffer from growing indefinitely
-        if len(self.buffer) > self.max_buffer_size:
+        if self._tail - self._head > self.max_buffer_size:
             logger.warning("Buffer size exceeded maximum limit. Trimming the oldest data.")
-            self.buffer = self.buffer[-self.max_buffer_size:]  # Keep the latest data only
+            self._head = self._tail - self.max_buffer_size  # Keep the latest data only
+            self._discard_arrivals()
+
+    def get_write_buffer(self, size):
+        """
+        Returns free storage behind the write cursor, so a reader can fill it in place
+        (e.g. with `os.readv` or `readinto`) instead of passing a new bytes object.
+
+        Args:
+            size (int): Bytes wanted, at most `max_buffer_size`.
+
+        Returns:
+            memoryview: A writable view of `size` bytes. Call `commit_write` with the number
+            of bytes written; the view is only valid until then.
+        """
+        size = min(size, self.max_buffer_size)
+        if self._tail + size > len(self._storage):
+            self._compact()
+        return self._view[self._tail:self._tail + size]
+
+    def commit_write(self, count, timestamp_ns=None):
+        """
+        Adds bytes written into the view from `get_write_buffer` to the buffer.
+
+        Args:
+            count (int): Number of bytes written at the start of the view.
+            timestamp_ns (int): Optional arrival time of the last byte, see `add_to_buffer`.
+        """
+        self._received += count
+        if timestamp_ns is not None:
+            self._arrivals.append((self._received, timestamp_ns))
+        if self._capture_chunks:
+            self.capture.write(self._view[self._tail:self._tail + count], timestamp_ns)
+        self._tail += count
+
+        if self._tail - self._head > self.max_buffer_size:
+            logger.warning("Buffer size exceeded maximum limit. Trimming the oldest data.")
+            self._head = self._tail - self.max_buffer_size  # Keep the latest data only
+            self._discard_arrivals()
 
   
     def get_complete_frames(self):
         """
         Extract and validate complete frames from the buffer, then add them to the internal queue.
+
+        The header checksum is verified before waiting for the body, so a corrupt body size
+        cannot stall the buffer. On a checksum mismatch the rest of the buffer is scanned once
+        with `find_header_offsets` and the read cursor jumps to the next candidate header.
+        """
+        buffer = self._storage
+        view = self._view
+        candidates = None  # Header offsets from the bulk scan, consumed in ascending order
+        while self._tail - self._head >= 6:  # Minimum frame size (5 header + 1 body checksum)
+            start = self._head
+            body_size = buffer[start + 2]
+            command = buffer[start + 3]
+            header_checksum = buffer[start + 4]
+
+            # Verify the header checksum before trusting the body size
+            if calculate_checksum(view[start:start + 4]) != header_checksum:
+                reason = "Header checksum mismatch"
+            else:
+                # Calculate full frame length
+                full_frame_length = 5 + body_size + 1  # Header (5 bytes) + body + body checksum
+                if self._tail - start < full_frame_length:
+                    logger.debug(f"Incomplete frame: waiting for more bytes (needed {full_frame_length}, got {self._tail - start})")
+                    break
+
+                end = start + full_frame_length
+                if calculate_checksum(view[start + 5:end - 1]) == buffer[end - 1]:
+                    # Remove frame from buffer after validation
+                    self._head = end
+                    timestamp_ns = self._frame_timestamp(end) if self._arrivals else None
+                    if self._capture_frames:
+                        self.capture.write(view[start:end], timestamp_ns)
+
+                    # Identify command name from lookup and skip ignored commands
+                    command_name = COMMAND_LOOKUP.get(command, f"Unknown (0x{command:02X})")
+                    if command_name in IGNORED_COMMANDS:
+                        logger.debug(f"Skipping ignored command: {command_name}")
+                        continue
+
+                    # Decode the frame
+                    self.decode_and_queue_frame(view[start:end], command_name, timestamp_ns)
+                    continue
+                reason = "Body checksum mismatch"
+
+            # Resync: scan the rest of the buffer once, then jump from candidate to candidate
+            if candidates is None:
+                candidates = deque(find_header_offsets(view, start + 1, self._tail))
+            while candidates and candidates[0] <= start:
+                candidates.popleft()
+            # Without a candidate, keep the last 4 bytes as they may begin a header
+            self._head = candidates.popleft() if candidates else max(start + 1, self._tail - 4)
+            self._discard_arrivals()
+            logger.warning(f"{reason}. Skipped {self._head - start} bytes to resync.")
+
+
+    def _discard_arrivals(self):
+        """Drops the arrivals of chunks whose bytes were all skipped by a resync or a trim."""
+        position = self._base + self._head
+        arrivals = self._arrivals
+        while arrivals and arrivals[0][0] <= position:
+            arrivals.popleft()
+
+
+    def _frame_timestamp(self, end):
         """
-        while len(self.buffer) >= 6:  # Minimum frame size (5 header + 1 body checksum)
-            to_address = self.buffer[0]
-            from_address = self.buffer[1]
-            body_size = self.buffer[2]
-            command = self.buffer[3]
-            header_checksum = self.buffer[4]
+        Estimates the arrival time of a frame from the chunk that completed it.
 
-            # Identify command name from lookup
-            command_name = COMMAND_LOOKUP.get(command, f"Unknown (0x{command:02X})")
+        Args:
+            end (int): Storage offset one past the last byte of the frame.
 
-            # Calculate full frame length
-            full_frame_length = 5 + body_size + 1  # Header (5 bytes) + body + body checksum
-            if len(self.buffer) < full_frame_length:
-                logger.debug(f"Incomplete frame: waiting for more bytes (needed {full_frame_length}, got {len(self.buffer)})")
-                break
+        Returns:
+            int: Monotonic timestamp in nanoseconds, None if no later chunk had a timestamp.
+        """
+        position = self._base + end
+        arrivals = self._arrivals
+        # Frames are extracted in stream order, so earlier chunks are never needed again
+        while arrivals and arrivals[0][0] < position:
+            arrivals.popleft()
+        if not arrivals:
+            return None
+        chunk_end, timestamp_ns = arrivals[0]
+        return timestamp_ns - (chunk_end - position) * self.byte_time_ns
+
+
+    def decode_and_queue_frame(self, frame, command_name, timestamp_ns=None):
+        """Decode a frame (bytes or a memoryview of the buffer) and add it to the queue if valid."""
+        if self.state is not None and command_name != "LatLon":
+            self.state.update(frame, timestamp_ns)
+
+        if self._handled_channels and command_name != "LatLon":
+            self._dispatch_channels(frame, timestamp_ns)
+        if not self.queue_frames and not self._frame_handlers:
+            return  # Nothing else consumes the decoded frame
+
+        if self.channels is not None:
+            # Drop frames without a wanted channel before building any output
+            wanted = frame[5] in self.channels if command_name == "LatLon" else frame_has_channel(frame, self.channels)
+            if not wanted:
+                logger.debug(f"Skipping frame without subscribed channels: {command_name}")
+                return
+
+        channels = self.channels
+        if self.delta is not None:
+            # Decode only the channels whose raw data changed since the last frame from this source
+            if command_name == "LatLon":
+                changed = self.delta.ascii_changed(frame, timestamp_ns)
+            else:
+                channels = changed = self.delta.changed_channels(frame, timestamp_ns, self.channels)
+            if not changed:
+                logger.debug(f"Skipping frame without changed channels: {command_name}")
+                return
+
+        if self.frame_cache is None:
+            decoded_frame = self._decode(frame, command_name, channels)
+        else:
+            decoded_frame, unchanged = self.frame_cache.lookup(frame, self._decode, command_name, channels)
+            if unchanged and self.frame_cache.changed_only:
+                logger.debug(f"Skipping unchanged frame: {command_name}")
+                return
+            if decoded_frame is not None and timestamp_ns is not None:
+                decoded_frame = copy.copy(decoded_frame)  # The cached result is shared between frames
+
+        if decoded_frame is not None and timestamp_ns is not None:
+            if isinstance(decoded_frame, dict):
+                decoded_frame["timestamp_ns"] = timestamp_ns
+            else:
+                decoded_frame.timestamp_ns = timestamp_ns
+
+        if decoded_frame is None:
+            logger.warning(f"Failed to decode frame: {frame.hex()}")
+            return
+        for callback in self._frame_handlers:
+            try:
+                callback(decoded_frame)
+            except Exception as e:
+                logger.error(f"Frame handler {callback!r} failed: {e}")
+        if self.queue_frames:
+            self._queue_frame(decoded_frame)
 
-            # Extract frame data
-            frame = self.buffer[:full_frame_length]
-            body = self.buffer[5:full_frame_length - 1]
-            body_checksum = self.buffer[full_frame_length - 1]
 
-            # Verify header and body checksums
-            if calculate_checksum(self.buffer[:4]) != header_checksum:
-                logger.warning("Header checksum mismatch. Dropping first byte.")
-                self.buffer = self.buffer[1:]
-                continue
+    def on_channel(self, channel_id, callback):
+        """
+        Registers a callback for every occurrence of a channel.
 
-            if calculate_checksum(body) != body_checksum:
-                logger.warning("Body checksum mismatch. Dropping first byte.")
-                self.buffer = self.buffer[1:]
-                continue
+        Args:
+            channel_id (int): Channel ID (from `CHANNEL_LOOKUP`), e.g. 0x49 for Heading.
+            callback (callable): Called as `callback(channel_value, from_address, timestamp_ns)`.
 
-            # Remove frame from buffer after validation
-            self.buffer = self.buffer[full_frame_length:]
+        Returns:
+            callable: The callback.
+        """
+        if not 0 <= channel_id <= 0xFF:
+            raise ValueError(f"Invalid channel id: {channel_id}")
+        self._channel_handlers[channel_id] += (callback,)
+        self._handled_channels = True
+        return callback
 
-            # Skip ignored commands
-            if command_name in IGNORED_COMMANDS:
-                logger.debug(f"Skipping ignored command: {command_name}")
-                continue
 
-            # Decode the frame
-            self.decode_and_queue_frame(frame, command_name)
+    def on_frame(self, callback):
+        """
+        Registers a callback for every decoded frame.
 
+        Args:
+            callback (callable): Called as `callback(decoded_frame)` before the frame is queued.
 
-    def decode_and_queue_frame(self, frame, command_name):
-        """Decode a frame and add it to the queue if valid."""
-        decoder = decode_ascii_frame if command_name == "LatLon" else decode_frame
-        decoded_frame = decoder(frame)
-        if decoded_frame:
-            try:
-                self.frame_queue.put_nowait(decoded_frame)
-                logger.debug(f"Added frame to queue: {decoded_frame}")
-            except queue.Full:
-                logger.warning("Frame queue is full. Dropping frame.")
-        else:
-            logger.warning(f"Failed to decode frame: {frame.hex()}")
+        Returns:
+            callable: The callback.
+        """
+        self._frame_handlers += (callback,)
+        return callback
+
+
+    def _dispatch_channels(self, frame, timestamp_ns):
+        """Decode the channels of a frame that have handlers and call them."""
+        handlers = self._channel_handlers
+        source = frame[1]
+        index = 5
+        body_end = len(frame) - 1
+        while index + 1 < body_end:
+            channel_id = frame[index]
+            format_byte = frame[index + 1]
+            data_end = index + 2 + FORMAT_SIZES[format_byte]
+            if data_end > body_end:
+                break
+            callbacks = handlers[channel_id]
+            if callbacks:
+                data = bytes(frame[index + 2:data_end])
+                channel_value = ChannelValue(channel_id, format_byte, data, VALUE_DECODERS[format_byte](data))
+                for callback in callbacks:
+                    try:
+                        callback(channel_value, source, timestamp_ns)
+                    except Exception as e:
+                        logger.error(f"Handler for channel 0x{channel_id:02X} failed: {e}")
+            index = data_end
+
+
+    def _queue_frame(self, decoded_frame):
+        """Add a decoded frame to the queue, applying the overflow policy if the queue is full."""
+        if self.overflow.put(self.frame_queue, decoded_frame) and logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Added frame to queue: {decoded_frame}")
+
+
+    def _decode(self, frame, command_name, channels):
+        """Decode the wanted channels of a frame into the configured output type."""
+        if command_name == "LatLon":
+            return decode_ascii_frame(frame, compact=self.compact)
+        if self.lazy:
+            return LazyFrame(frame, channels, self.decode_cache)
+        return decode_frame(frame, compact=self.compact, channels=channels, cache=self.decode_cache)
 
         
                 
@@ -183,7 +508,7 @@ class FrameBuffer:
         Returns:
             int: The number of bytes currently in the buffer.
         """
-        return len(self.buffer)
+        return self._tail - self._head
 
 
     def get_buffer_contents(self):
@@ -193,6 +518,6 @@ class FrameBuffer:
         Returns:
             str: The hexadecimal representation of the buffer contents.
         """
-        hex_contents = self.buffer.hex()
+        hex_contents = self._storage[self._head:self._tail].hex()
         logger.debug(f"Buffer contents: {hex_contents}")
-        return hex_contents
\ No newline at end of file
+        return hex_contents
@@ -0,0 +1,147 @@
+from .mappings import ADDRESS_LOOKUP, COMMAND_LOOKUP, CHANNEL_LOOKUP
+from .formats import FORMAT_SIZES
+from .decode_fastnet import decode_format_and_data
+
+
+"""
+Lazy Frames
+===========
+
+A `LazyFrame` holds the raw bytes of a validated frame and decodes channels only when
+they are read. The channel offsets are indexed with the format sizes the first time any
+channel is touched, and each decoded channel is memoized, so a consumer that reads two
+channels of a ten-channel Broadcast frame pays for two calls to `decode_format_and_data`.
+
+Example:
+--------
+frame_buffer = FrameBuffer(lazy=True)
+...
+frame = frame_buffer.frame_queue.get()
+if 0x49 in frame:
+    heading = frame[0x49]["interpreted"]
+"""
+
+
+class LazyFrame:
+    """
+    A validated frame whose channels are decoded on access.
+
+    Channels are looked up by integer channel id and return the same dictionary as
+    `decode_format_and_data`.
+    """
+    __slots__ = ("frame", "channels", "cache", "timestamp_ns", "_offsets", "_decoded")
+
+    def __init__(self, frame, channels=None, cache=None, timestamp_ns=None):
+        self.frame = bytes(frame)  # Own copy, the FrameBuffer storage is reused
+        self.channels = channels  # Channel ids to expose, None for all
+        self.cache = cache  # Optional DecodeCache shared with the FrameBuffer
+        self.timestamp_ns = timestamp_ns  # Arrival time set by FrameBuffer, None if unknown
+        self._offsets = None
+        self._decoded = {}
+
+    @property
+    def to_address(self):
+        return self.frame[0]
+
+    @property
+    def from_address(self):
+        return self.frame[1]
+
+    @property
+    def command(self):
+        return self.frame[3]
+
+    def _index(self):
+        """
+        Maps each channel id to its format byte and data offsets in the frame.
+
+        Raises:
+            ValueError: The body ends in the middle of a channel.
+        """
+        if self._offsets is None:
+            offsets = {}
+            frame = self.frame
+            channels = self.channels
+            index = 5
+            body_end = len(frame) - 1
+            while index < body_end:
+                if index + 1 >= body_end:
+                    raise ValueError(f"Insufficient bytes to decode channel ID and format byte at index {index - 5}.")
+                channel_id = frame[index]
+                format_byte = frame[index + 1]
+                data_end = index + 2 + FORMAT_SIZES[format_byte]
+                if data_end > body_end:
+                    raise ValueError(f"Incomplete data for channel 0x{channel_id:02X}.")
+                if channels is None or channel_id in channels:
+                    offsets[channel_id] = (format_byte, index + 2, data_end)
+                index = data_end
+            self._offsets = offsets
+        return self._offsets
+
+    def channel_ids(self):
+        """
+        Returns:
+            list: The channel ids present in the frame, in frame order.
+        """
+        return list(self._index())
+
+    def __contains__(self, channel_id):
+        return channel_id in self._index()
+
+    def __iter__(self):
+        return iter(self._index())
+
+    def __len__(self):
+        return len(self._index())
+
+    def __getitem__(self, channel_id):
+        """
+        Decodes a channel on first access.
+
+        Args:
+            channel_id (int): Channel ID (from `CHANNEL_LOOKUP`).
+
+        Returns:
+            dict: The `decode_format_and_data` result, None if the data could not be decoded.
+
+        Raises:
+            KeyError: The channel is not in the frame.
+        """
+        try:
+            return self._decoded[channel_id]
+        except KeyError:
+            pass
+        format_byte, start, end = self._index()[channel_id]
+        data_bytes = memoryview(self.frame)[start:end]
+        if self.cache is None:
+            decoded = decode_format_and_data(channel_id, format_byte, data_bytes)
+        else:
+            decoded = self.cache.lookup(channel_id, format_byte, data_bytes, decode_format_and_data)
+        self._decoded[channel_id] = decoded
+        return decoded
+
+    def get(self, channel_id, default=None):
+        if channel_id not in self._index():
+            return default
+        return self[channel_id]
+
+    def as_dict(self):
+        """
+        Decodes every channel into the dictionary `decode_frame` returns.
+
+        Returns:
+            dict: Decoded data including addresses, command, and channel values.
+        """
+        decoded_data = {
+            "to_address": ADDRESS_LOOKUP.get(self.to_address, f"Unknown (0x{self.to_address:02X})"),
+            "from_address": ADDRESS_LOOKUP.get(self.from_address, f"Unknown (0x{self.from_address:02X})"),
+            "command": COMMAND_LOOKUP.get(self.command, f"Unknown (0x{self.command:02X})"),
+            "values": {CHANNEL_LOOKUP.get(channel_id, f"Unknown (0x{channel_id:02X})"): self[channel_id]
+                       for channel_id in self._index()}
+        }
+        if self.timestamp_ns is not None:
+            decoded_data["timestamp_ns"] = self.timestamp_ns
+        return decoded_data
+
+    def __repr__(self):
+        return f"LazyFrame({self.frame.hex()})"
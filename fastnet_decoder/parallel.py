@@ -0,0 +1,182 @@
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+import mmap
+import os
+from .batch import FrameColumns, ChannelColumn, _use_numpy, decode_packed
+from .logger import logger
+from .sync import iter_frames
+from . import numpy_engine
+
+
+"""
+Parallel Decoding
+=================
+
+`decode_file` decodes a raw capture (bus bytes as read from the serial port) on several
+processes. The file is split into byte ranges, each worker maps the file and decodes the
+frames that start inside its range, and the per-range columns are merged in file order.
+
+A worker does not know where the frames before its range ended, so it starts reading
+`LOOKBACK_SIZE` bytes early and resyncs with the same header and body checksum rules as
+`FrameBuffer.get_complete_frames`. Usually its reader joins the chain of frames a
+sequential reader follows within a few frames, but a false header that passes both
+checksums, e.g. a frame carried inside another frame's body, can keep it on a different
+chain. Each worker therefore reports its reader position at the start of its range and
+after it; when the position at the start does not match where the previous range's chain
+ended, the range is decoded again from that position. The merged columns are then the
+ones a single sequential decode finds. A frame that starts in one range and ends in the
+next belongs to the range it starts in; workers read up to `MAX_FRAME_SIZE` bytes past
+their range to complete it.
+
+Example:
+--------
+columns = decode_file("season.bin", channels={0x41, 0x4D}, workers=16)
+"""
+
+# Largest possible frame: 5 header bytes, up to 255 body bytes and the body checksum
+MAX_FRAME_SIZE = 5 + 255 + 1
+
+# Bytes read before a range to resync on the frame chain
+LOOKBACK_SIZE = 16 * MAX_FRAME_SIZE
+
+# Ranges smaller than this are not worth a separate task
+MIN_RANGE_SIZE = 1 << 20
+
+
+def _decode_range(path, start, end, channels, engine, exact=False):
+    """
+    Decodes the frames starting in `[start, end)` of the file at `path`.
+
+    Args:
+        exact (bool): `start` is a known reader position, so no lookback is read.
+
+    Returns:
+        tuple: `(columns, synced_at, cursor)`. `synced_at` is the reader position of the
+        worker's chain at `start`: the end of its last frame starting before `start`, or
+        where its window begins. `cursor` is the reader position after the range: the end of
+        its last frame, or `synced_at` if the range holds none.
+    """
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            window_start = start if exact else max(0, start - LOOKBACK_SIZE)
+            window = data[window_start:min(len(data), end + MAX_FRAME_SIZE)]
+    start -= window_start
+    end -= window_start
+
+    synced_at = 0
+    if _use_numpy(engine):
+        np = numpy_engine.np
+        buffer = np.frombuffer(window, dtype=np.uint8)
+        chain = numpy_engine.stream_frame_starts(buffer)
+        chain_ends = chain + buffer[chain + 2].astype(np.int64) + 6
+        before = int(np.searchsorted(chain, start))
+        if before:
+            synced_at = int(chain_ends[before - 1])
+        inside = slice(before, int(np.searchsorted(chain, end)))
+        starts = chain[inside]
+        lengths = chain_ends[inside] - starts
+        cursor = int(chain_ends[inside][-1]) if len(starts) else synced_at
+    else:
+        starts = array("q")
+        lengths = array("q")
+        for frame_start, frame_end in iter_frames(window):
+            if frame_start >= end:
+                break
+            if frame_start < start:
+                synced_at = frame_end
+            else:
+                starts.append(frame_start)
+                lengths.append(frame_end - frame_start)
+        cursor = starts[-1] + lengths[-1] if starts else synced_at
+
+    columns = decode_packed(window, starts, lengths, None, channels, engine)
+    return columns, window_start + synced_at, window_start + cursor
+
+
+def split_ranges(size, parts, min_range_size=MIN_RANGE_SIZE):
+    """
+    Splits `size` bytes into at most `parts` contiguous ranges of at least `min_range_size` bytes.
+
+    Returns:
+        list: `(start, end)` pairs covering `[0, size)`.
+    """
+    parts = max(1, min(parts, size // max(1, min_range_size)))
+    bounds = [size * part // parts for part in range(parts + 1)]
+    return list(zip(bounds, bounds[1:]))
+
+
+def merge_columns(parts):
+    """
+    Concatenates FrameColumns decoded from consecutive ranges.
+
+    Args:
+        parts (list): FrameColumns in stream order.
+
+    Returns:
+        FrameColumns: One set of columns with frame indices renumbered across the parts.
+    """
+    timestamped = bool(parts) and parts[0].timestamps is not None
+    result = FrameColumns(timestamped)
+    for part in parts:
+        offset = result.frame_count
+        result.sources.extend(part.sources)
+        if timestamped:
+            result.timestamps.extend(part.timestamps)
+        for channel_id, column in part.columns.items():
+            merged = result.columns.get(channel_id)
+            if merged is None:
+                merged = result.columns[channel_id] = ChannelColumn(channel_id, timestamped)
+            merged.values.extend(column.values)
+            if offset:
+                merged.frames.extend(frame_index + offset for frame_index in column.frames)
+            else:
+                merged.frames.extend(column.frames)
+            if timestamped:
+                merged.timestamps.extend(column.timestamps)
+        result.frame_count += part.frame_count
+    return result
+
+
+def decode_file(path, channels=None, workers=None, engine="auto", executor=None, min_range_size=MIN_RANGE_SIZE):
+    """
+    Decodes a raw capture file into per-channel columns using several processes.
+
+    Args:
+        path (str): Path of a file of raw bus traffic.
+        channels (set): Channel ids to collect, None for all.
+        workers (int): Number of processes, `os.cpu_count()` by default.
+        engine (str): Decode engine used by each worker, see `decode_frames`.
+        executor (Executor): Run the ranges on this executor instead of a new process pool.
+        min_range_size (int): Smallest range given to a worker. Small files are decoded in this process.
+
+    Returns:
+        FrameColumns: The same columns as `decode_frames` on the whole file.
+    """
+    workers = workers or os.cpu_count() or 1
+    size = os.path.getsize(path)
+    if not size:
+        return FrameColumns()
+    # A few ranges per worker keep every process busy when some ranges decode faster
+    ranges = split_ranges(size, workers * 4, min_range_size)
+    if len(ranges) == 1 and executor is None:
+        return _decode_range(path, 0, size, channels, engine, exact=True)[0]
+
+    count = len(ranges)
+    arguments = ([path] * count, [start for start, _ in ranges], [end for _, end in ranges],
+                 [channels] * count, [engine] * count)
+    if executor is not None:
+        results = list(executor.map(_decode_range, *arguments))
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, count)) as pool:
+            results = list(pool.map(_decode_range, *arguments))
+
+    # Keep a range only if its worker joined the frame chain where the previous range left it
+    parts = []
+    cursor = 0
+    for (_, end), (columns, synced_at, range_cursor) in zip(ranges, results):
+        if synced_at != cursor:
+            logger.debug(f"Range ending at {end} resynced on a different frame chain, decoding it again.")
+            columns, _, range_cursor = _decode_range(path, cursor, end, channels, engine, exact=True)
+        parts.append(columns)
+        cursor = range_cursor
+    return merge_columns(parts)
@@ -0,0 +1,261 @@
+from collections import deque
+from itertools import chain
+import threading
+import time
+from .frame_buffer import FrameBuffer
+from .logger import logger
+
+
+"""
+Threaded Pipeline
+=================
+
+`FramePipeline` splits reading and decoding into separate threads so a burst of traffic
+cannot hold up the serial reads:
+
+1. The reader thread only calls `read()` and hands each chunk, with its arrival time,
+   to the decoder. It never waits on the decoder, so the UART is drained on time.
+2. The decoder thread takes every chunk waiting for it at once, adds them to its
+   FrameBuffer and runs `get_complete_frames` once per batch.
+3. Consumers take every decoded frame waiting for them at once with `get_frames()`, or
+   iterate the pipeline frame by frame.
+
+Stages hand over work through `BatchChannel`s, bounded deques where a lock is taken once
+per batch instead of once per chunk or frame as with `queue.Queue`. If the decoder falls
+behind, the oldest raw chunks are dropped, as FrameBuffer would trim them anyway. If the
+consumers fall behind, new frames are dropped, as with FrameBuffer's `frame_queue` and
+its default `DropNewest` policy; other `overflow` policies are not supported.
+
+Example:
+--------
+with serial.Serial("/dev/ttyUSB0", 11520, parity="O", stopbits=2, timeout=0.1) as port:
+    with FramePipeline(lambda: port.read(port.in_waiting or 1), compact=True) as pipeline:
+        for frame in pipeline:
+            ...
+"""
+
+# Raw chunks waiting for the decoder before the oldest are dropped
+MAX_PENDING_CHUNKS = 1024
+
+# Seconds a stage waits for work before checking whether the pipeline is stopping
+POLL_INTERVAL = 0.1
+
+
+class BatchChannel:
+    """
+    A bounded, thread-safe handoff between pipeline stages that moves items in batches.
+
+    Attributes:
+        maxsize (int): Maximum number of items held.
+        drop_oldest (bool): Make room for new items by dropping the oldest, instead of dropping the new ones.
+        dropped (int): Items dropped because the channel was full.
+        closed (bool): No more items will be put.
+    """
+    def __init__(self, maxsize, drop_oldest=False):
+        if maxsize < 1:
+            raise ValueError("BatchChannel maxsize must be at least 1.")
+        self.maxsize = maxsize
+        self.drop_oldest = drop_oldest
+        self.dropped = 0
+        self.closed = False
+        self._batches = deque()
+        self._size = 0
+        self._ready = threading.Condition()
+
+    def put_batch(self, items):
+        """
+        Adds a list of items, taking the lock once.
+
+        Args:
+            items (list): Items to add. Items that do not fit are dropped according to `drop_oldest`.
+        """
+        if not items:
+            return
+        with self._ready:
+            overflow = self._size + len(items) - self.maxsize
+            if overflow > 0:
+                self.dropped += overflow
+                if not self.drop_oldest:
+                    items = items[:len(items) - overflow]
+                elif len(items) >= self.maxsize:
+                    self._batches.clear()
+                    self._size = 0
+                    items = items[len(items) - self.maxsize:]
+                else:
+                    self._drop_oldest(overflow)
+            if items:
+                self._batches.append(items)
+                self._size += len(items)
+                self._ready.notify()
+
+    def _drop_oldest(self, count):
+        """Drops the `count` oldest items held."""
+        batches = self._batches
+        self._size -= count
+        while count:
+            batch = batches[0]
+            if len(batch) <= count:
+                batches.popleft()
+                count -= len(batch)
+            else:
+                batches[0] = batch[count:]
+                count = 0
+
+    def get_batch(self, timeout=None):
+        """
+        Takes every waiting item, taking the lock once.
+
+        Args:
+            timeout (float): Seconds to wait for an item, None to wait until one arrives or the channel closes.
+
+        Returns:
+            list: The items in arrival order, empty on timeout or once closed and drained.
+        """
+        with self._ready:
+            if not self._batches and not self.closed:
+                self._ready.wait(timeout)
+            batches = self._batches
+            self._batches = deque()
+            self._size = 0
+        if len(batches) == 1:
+            return batches[0]
+        return list(chain.from_iterable(batches))
+
+    def close(self):
+        """Wakes waiting stages; `get_batch` returns what is left, then empty lists."""
+        with self._ready:
+            self.closed = True
+            self._ready.notify_all()
+
+    def __len__(self):
+        return self._size
+
+
+class _BatchingFrameBuffer(FrameBuffer):
+    """A FrameBuffer that collects decoded frames in a list instead of a queue."""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.decoded = []
+
+    def _queue_frame(self, decoded_frame):
+        self.decoded.append(decoded_frame)
+
+
+class FramePipeline:
+    """
+    Reader, decoder and consumer stages connected by batched handoffs.
+
+    Args:
+        read (callable): Returns the next chunk of bus bytes. An empty result (a serial read
+            timeout) is skipped; None or an exception from `read` stops the reader.
+        timestamps (bool): Stamp each chunk with `time.monotonic_ns()` as it is read.
+        max_pending_chunks (int): Raw chunks waiting for the decoder before the oldest are dropped.
+        **frame_buffer_options: Passed to the decoder's FrameBuffer, e.g. `compact=True`.
+            `max_queue_size` bounds the frames waiting for consumers. `overflow` is not
+            accepted, as frames are handed to consumers in batches rather than through `frame_queue`.
+
+    Attributes:
+        frame_buffer (FrameBuffer): The decoder stage's buffer.
+        chunks (BatchChannel): Raw `(data, timestamp_ns)` chunks from the reader to the decoder.
+        frames (BatchChannel): Decoded frames from the decoder to the consumers.
+    """
+    def __init__(self, read, timestamps=False, max_pending_chunks=MAX_PENDING_CHUNKS, **frame_buffer_options):
+        if "overflow" in frame_buffer_options:
+            raise ValueError("FramePipeline drops the newest frames when consumers fall behind; "
+                             "overflow policies are not supported.")
+        self.read = read
+        self.timestamps = timestamps
+        self.frame_buffer = _BatchingFrameBuffer(**frame_buffer_options)
+        self.chunks = BatchChannel(max_pending_chunks, drop_oldest=True)
+        self.frames = BatchChannel(self.frame_buffer.frame_queue.maxsize or MAX_PENDING_CHUNKS)
+        self._stopping = threading.Event()
+        self._reader = threading.Thread(target=self._read_loop, name="fastnet-reader", daemon=True)
+        self._decoder = threading.Thread(target=self._decode_loop, name="fastnet-decoder", daemon=True)
+
+    def start(self):
+        """Starts the reader and decoder threads."""
+        self._reader.start()
+        self._decoder.start()
+        return self
+
+    def stop(self, timeout=None):
+        """
+        Stops reading, lets the decoder finish the chunks already read and waits for both threads.
+
+        Args:
+            timeout (float): Seconds to wait for each thread.
+        """
+        self._stopping.set()
+        if self._reader.is_alive():
+            self._reader.join(timeout)
+        if self._decoder.is_alive():
+            self._decoder.join(timeout)
+
+    def _read_loop(self):
+        read = self.read
+        chunks = self.chunks
+        try:
+            while not self._stopping.is_set():
+                data = read()
+                if data is None:
+                    break
+                if data:
+                    chunks.put_batch([(data, time.monotonic_ns() if self.timestamps else None)])
+        except Exception as e:
+            logger.error(f"FastNet reader stopped: {e}")
+        finally:
+            chunks.close()
+
+    def _decode_loop(self):
+        chunks = self.chunks
+        frame_buffer = self.frame_buffer
+        try:
+            while True:
+                batch = chunks.get_batch(POLL_INTERVAL)
+                if not batch:
+                    if chunks.closed:
+                        break
+                    continue
+                for data, timestamp_ns in batch:
+                    frame_buffer.add_to_buffer(data, timestamp_ns)
+                frame_buffer.get_complete_frames()
+                decoded, frame_buffer.decoded = frame_buffer.decoded, []
+                self.frames.put_batch(decoded)
+        finally:
+            self.frames.close()
+
+    def get_frames(self, timeout=None):
+        """
+        Takes every decoded frame waiting for consumers.
+
+        Args:
+            timeout (float): Seconds to wait for a frame, None to wait until one arrives or the pipeline ends.
+
+        Returns:
+            list: Decoded frames in arrival order, empty on timeout or once the pipeline has ended.
+        """
+        return self.frames.get_batch(timeout)
+
+    def __iter__(self):
+        """Yields decoded frames until the pipeline has stopped and every frame has been consumed."""
+        frames = self.frames
+        while True:
+            batch = frames.get_batch(POLL_INTERVAL)
+            if batch:
+                yield from batch
+            elif frames.closed and not len(frames):
+                return
+
+    def stats(self):
+        """
+        Returns:
+            dict: Items waiting in and dropped from each handoff.
+        """
+        return {"pending_chunks": len(self.chunks), "dropped_chunks": self.chunks.dropped,
+                "pending_frames": len(self.frames), "dropped_frames": self.frames.dropped}
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.stop()
@@ -0,0 +1,147 @@
+from .mappings import ADDRESS_LOOKUP, COMMAND_LOOKUP, CHANNEL_LOOKUP
+from .formats import FORMAT_DECODERS, FORMAT_INFO
+
+
+"""
+Compact Records
+===============
+
+`decode_frame(frame, compact=True)` returns a `FrameRecord` instead of the nested
+dictionaries of the default output. A record keeps integer addresses, command and
+channel ids, and its values are `ChannelValue` records keyed by integer channel id.
+Each channel carries the interpreted value and its raw bytes; names, hex strings and
+the detailed `raw` breakdown are only computed when asked for, for example through
+`as_dict()`, which rebuilds the default dictionary output.
+"""
+
+
+class ChannelValue:
+    """
+    A single decoded channel.
+
+    Attributes:
+        channel_id (int): Channel ID (from `CHANNEL_LOOKUP`).
+        format_byte (int): The format byte of the channel.
+        data (bytes): The raw data bytes of the channel.
+        value: The interpreted value (float, timedelta or str), None if undecodable.
+    """
+    __slots__ = ("channel_id", "format_byte", "data", "value")
+
+    def __init__(self, channel_id, format_byte, data, value):
+        self.channel_id = channel_id
+        self.format_byte = format_byte
+        self.data = data
+        self.value = value
+
+    @property
+    def name(self):
+        """The channel name from `CHANNEL_LOOKUP`."""
+        return CHANNEL_LOOKUP.get(self.channel_id, f"Unknown (0x{self.channel_id:02X})")
+
+    @property
+    def interpreted(self):
+        """Alias of `value`, matching the key of the dictionary output."""
+        return self.value
+
+    def as_dict(self, ascii=False):
+        """
+        Builds the dictionary `decode_format_and_data` (or `decode_ascii_frame`) returns for this channel.
+
+        Args:
+            ascii (bool): The channel comes from an ASCII frame.
+
+        Returns:
+            dict: Decoded channel, or None if the data could not be decoded.
+        """
+        if ascii:
+            return {
+                "channel_id": f"0x{self.channel_id:02X}",
+                "format_byte": f"0x{self.format_byte:02X}",
+                "data_bytes": self.data.hex(),
+                "raw": self.value,
+                "interpreted": self.value
+            }
+        decoded = FORMAT_DECODERS[self.format_byte](self.data)
+        if decoded is None:
+            return None
+        divisor, digits, format_bits = FORMAT_INFO[self.format_byte]
+        return {
+            "channel_id": f"0x{self.channel_id:02X}",
+            "format_byte": f"0x{self.format_byte:02X}",
+            "data_bytes": self.data.hex(),
+            "divisor": divisor,
+            "digits": digits,
+            "format_bits": format_bits,
+            "raw": decoded[0],
+            "interpreted": decoded[1]
+        }
+
+    def __eq__(self, other):
+        if not isinstance(other, ChannelValue):
+            return NotImplemented
+        return (self.channel_id, self.format_byte, self.data, self.value) == \
+            (other.channel_id, other.format_byte, other.data, other.value)
+
+    def __repr__(self):
+        return f"ChannelValue(channel_id=0x{self.channel_id:02X}, format_byte=0x{self.format_byte:02X}, value={self.value!r})"
+
+
+class FrameRecord:
+    """
+    A decoded frame in compact form.
+
+    Attributes:
+        to_address (int): Destination address.
+        from_address (int): Source address.
+        command (int): Command byte.
+        values (dict): `ChannelValue` records keyed by integer channel id.
+        timestamp_ns (int): Arrival time set by FrameBuffer when timestamps are supplied, else None.
+    """
+    __slots__ = ("to_address", "from_address", "command", "values", "timestamp_ns")
+
+    def __init__(self, to_address, from_address, command, values, timestamp_ns=None):
+        self.to_address = to_address
+        self.from_address = from_address
+        self.command = command
+        self.values = values
+        self.timestamp_ns = timestamp_ns
+
+    @property
+    def to_address_name(self):
+        return ADDRESS_LOOKUP.get(self.to_address, f"Unknown (0x{self.to_address:02X})")
+
+    @property
+    def from_address_name(self):
+        return ADDRESS_LOOKUP.get(self.from_address, f"Unknown (0x{self.from_address:02X})")
+
+    @property
+    def command_name(self):
+        return COMMAND_LOOKUP.get(self.command, f"Unknown (0x{self.command:02X})")
+
+    def as_dict(self):
+        """
+        Builds the dictionary `decode_frame` returns in its default mode.
+
+        Returns:
+            dict: Decoded data including addresses, command, and channel values.
+        """
+        ascii = self.command_name == "LatLon"
+        decoded_data = {
+            "to_address": self.to_address_name,
+            "from_address": self.from_address_name,
+            "command": self.command_name,
+            "values": {channel.name: channel.as_dict(ascii) for channel in self.values.values()}
+        }
+        if self.timestamp_ns is not None:
+            decoded_data["timestamp_ns"] = self.timestamp_ns
+        return decoded_data
+
+    def __eq__(self, other):
+        if not isinstance(other, FrameRecord):
+            return NotImplemented
+        return (self.to_address, self.from_address, self.command, self.values) == \
+            (other.to_address, other.from_address, other.command, other.values)
+
+    def __repr__(self):
+        return (f"FrameRecord(to_address=0x{self.to_address:02X}, from_address=0x{self.from_address:02X}, "
+                f"command=0x{self.command:02X}, values={list(self.values.values())!r})")
@@ -0,0 +1,161 @@
+from array import array
+import math
+import time
+from .formats import FORMAT_SIZES
+from .batch import NUMERIC_DECODERS
+from .mappings import CHANNEL_LOOKUP
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, the state is always available as arrays and memoryviews
+    np = None
+
+
+"""
+Boat State
+==========
+
+`BoatState` holds the latest value of every channel in flat arrays indexed by channel id,
+so "what is the boat speed now" is a single array read instead of a walk through queued
+frames. Pass one to `FrameBuffer(state=...)` and it is updated in place as frames are
+validated, or call `update` with frames from another source.
+
+Each of the 256 slots holds:
+- `values`: The interpreted value as a float (timers in seconds), NaN until first seen.
+- `timestamps`: When the slot was last updated, in nanoseconds. The frame timestamp is used
+  when there is one, otherwise `time.monotonic_ns()` at the update.
+- `sources`: The address of the node that sent the last update.
+- `versions`: The number of updates, so a reader can tell whether a slot changed since it
+  last looked without comparing values.
+
+Only numeric channels are tracked; 7-segment text and ASCII (LatLon) frames are skipped.
+The arrays can be shared without copying through `memoryview(state.values)` or, with
+NumPy installed, `state.as_numpy()`.
+
+Example:
+--------
+state = BoatState()
+frame_buffer = FrameBuffer(state=state)
+...
+boatspeed = state.values[0x41]
+"""
+
+SLOT_COUNT = 256
+
+
+class BoatState:
+    """
+    The latest value, timestamp, source and version of every channel.
+
+    Attributes:
+        values (array): Latest value per channel id, `array('d')`, NaN when never seen.
+        timestamps (array): Time of the latest update per channel id in nanoseconds, `array('q')`, 0 when never seen.
+        sources (array): Source address of the latest update per channel id, `array('B')`.
+        versions (array): Number of updates per channel id, `array('Q')`.
+        channels (frozenset): Channel ids to track, None for all.
+    """
+    __slots__ = ("values", "timestamps", "sources", "versions", "channels")
+
+    def __init__(self, channels=None):
+        self.values = array("d", [math.nan]) * SLOT_COUNT
+        self.timestamps = array("q", [0]) * SLOT_COUNT
+        self.sources = array("B", [0]) * SLOT_COUNT
+        self.versions = array("Q", [0]) * SLOT_COUNT
+        self.channels = frozenset(channels) if channels is not None else None
+
+    def update(self, frame, timestamp_ns=None):
+        """
+        Stores the numeric channels of a validated frame.
+
+        Args:
+            frame (bytes): The full frame, as bytes or a memoryview. Checksums are not re-checked.
+            timestamp_ns (int): Arrival time of the frame, `time.monotonic_ns()` if None.
+
+        Returns:
+            int: Number of channels updated.
+        """
+        if timestamp_ns is None:
+            timestamp_ns = time.monotonic_ns()
+        source = frame[1]
+        channels = self.channels
+        values = self.values
+        versions = self.versions
+        updated = 0
+        index = 5
+        body_end = len(frame) - 1
+        while index + 1 < body_end:
+            channel_id = frame[index]
+            format_byte = frame[index + 1]
+            data_end = index + 2 + FORMAT_SIZES[format_byte]
+            if data_end > body_end:
+                break
+            decoder = NUMERIC_DECODERS[format_byte]
+            if decoder is not None and (channels is None or channel_id in channels):
+                values[channel_id] = decoder(frame[index + 2:data_end])
+                self.timestamps[channel_id] = timestamp_ns
+                self.sources[channel_id] = source
+                versions[channel_id] += 1
+                updated += 1
+            index = data_end
+        return updated
+
+    def get(self, channel_id, default=None):
+        """
+        Returns the latest value of a channel, or `default` if it has not been seen.
+        """
+        if not self.versions[channel_id]:
+            return default
+        return self.values[channel_id]
+
+    def __getitem__(self, channel_id):
+        return self.values[channel_id]
+
+    def __contains__(self, channel_id):
+        return bool(self.versions[channel_id])
+
+    def seen(self):
+        """
+        Returns:
+            list: Channel ids that have been updated at least once, ascending.
+        """
+        return [channel_id for channel_id, version in enumerate(self.versions) if version]
+
+    def as_dict(self):
+        """
+        Builds a snapshot of the seen channels keyed by channel name.
+
+        Returns:
+            dict: Channel names mapped to `{"value", "timestamp_ns", "source", "version"}`.
+        """
+        return {
+            CHANNEL_LOOKUP.get(channel_id, f"Unknown (0x{channel_id:02X})"): {
+                "value": self.values[channel_id],
+                "timestamp_ns": self.timestamps[channel_id],
+                "source": self.sources[channel_id],
+                "version": self.versions[channel_id]
+            }
+            for channel_id in self.seen()
+        }
+
+    def as_numpy(self):
+        """
+        Wraps the state arrays as NumPy arrays sharing their memory.
+
+        Returns:
+            tuple: `(values, timestamps, sources, versions)` arrays that follow later updates.
+        """
+        if np is None:
+            raise ImportError("NumPy is required for BoatState.as_numpy()")
+        return (np.frombuffer(self.values, dtype=np.float64), np.frombuffer(self.timestamps, dtype=np.int64),
+                np.frombuffer(self.sources, dtype=np.uint8), np.frombuffer(self.versions, dtype=np.uint64))
+
+    def clear(self):
+        """Forgets every channel."""
+        for channel_id in range(SLOT_COUNT):
+            self.values[channel_id] = math.nan
+            self.timestamps[channel_id] = 0
+            self.sources[channel_id] = 0
+            self.versions[channel_id] = 0
+
+    def __repr__(self):
+        return f"BoatState(channels={[f'0x{c:02X}' for c in self.seen()]})"
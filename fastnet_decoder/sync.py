@@ -0,0 +1,115 @@
+from collections import deque
+from itertools import accumulate, islice
+from operator import sub
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, the pure Python scanner is used without it
+    np = None
+
+
+"""
+Header Scanning
+===============
+
+A FastNet header is five bytes: to address, from address, body size, command and a
+checksum chosen so that the five bytes sum to a multiple of 256. When a stream loses
+sync, every offset whose next five bytes satisfy that rule is a candidate frame start.
+
+`find_header_offsets` checks a whole chunk in one pass with a rolling 5-byte sum instead
+of slicing and summing the bytes at each offset. With NumPy installed, large chunks are
+scanned as a single vectorised operation.
+
+`iter_frames` applies the same header and body checksum rules as FrameBuffer to a
+complete capture held in memory, yielding the offsets of every validated frame.
+"""
+
+HEADER_SIZE = 5
+
+# Below this many bytes the NumPy setup costs more than the pure Python scan
+NUMPY_MIN_SCAN_SIZE = 256
+
+
+def find_header_offsets(data, start=0, end=None, use_numpy=None):
+    """
+    Finds every offset in `data[start:end]` where a checksum-valid header begins.
+
+    Args:
+        data (bytes): Bytes, bytearray or memoryview to scan.
+        start (int): First offset to test.
+        end (int): End of the scanned region. A header must fit entirely before it.
+        use_numpy (bool): Force (True) or disable (False) the NumPy path. By default
+            NumPy is used when it is installed and the region is large enough.
+
+    Returns:
+        list: Ascending offsets into `data` of candidate headers.
+    """
+    if end is None:
+        end = len(data)
+    if end - start < HEADER_SIZE:
+        return []
+
+    if use_numpy is None:
+        use_numpy = np is not None and end - start >= NUMPY_MIN_SCAN_SIZE
+    elif use_numpy and np is None:
+        raise ImportError("NumPy is required for use_numpy=True")
+
+    if use_numpy:
+        window = np.frombuffer(data, dtype=np.uint8, count=end - start, offset=start)
+        # uint8 addition wraps at 256, so a zero sum marks a valid header
+        sums = window[:-4] + window[1:-3] + window[2:-2] + window[3:-1] + window[4:]
+        return (np.flatnonzero(sums == 0) + start).tolist()
+
+    # Rolling sum: prefix[i + 5] - prefix[i] is the sum of the 5 bytes starting at i
+    prefix = [0]
+    prefix.extend(accumulate(memoryview(data)[start:end]))  # accumulate(initial=) needs Python 3.8
+    sums = map(sub, islice(prefix, HEADER_SIZE, None), prefix)
+    return [offset for offset, total in enumerate(sums, start) if not total & 0xFF]
+
+
+# Bytes scanned per step when looking for the next header in a long capture
+SCAN_CHUNK_SIZE = 4096
+
+
+def iter_frames(data, start=0, end=None):
+    """
+    Yields the position of every validated frame in `data[start:end]`.
+
+    Uses the same rules as `FrameBuffer.get_complete_frames`: the header checksum is
+    checked first, then the body checksum, and after a mismatch the reader jumps to the
+    next candidate header found by `find_header_offsets`. The data is taken as complete,
+    so a header whose body runs past `end` is treated as a false match.
+
+    Args:
+        data (bytes): Bytes, bytearray, memoryview or mmap holding raw bus traffic.
+        start (int): Offset to start reading from.
+        end (int): End of the region. Frames must end at or before it.
+
+    Yields:
+        tuple: `(frame_start, frame_end)` offsets into `data`.
+    """
+    view = memoryview(data)
+    if end is None:
+        end = len(view)
+    position = start
+    candidates = deque()  # Candidate header offsets after `position`, ascending
+    scanned_to = start  # Offsets below this have been through the header scan
+    while end - position >= 6:  # Minimum frame size (5 header + 1 body checksum)
+        if not sum(view[position:position + HEADER_SIZE]) & 0xFF:
+            frame_end = position + HEADER_SIZE + view[position + 2] + 1
+            if frame_end <= end and not sum(view[position + HEADER_SIZE:frame_end]) & 0xFF:
+                yield position, frame_end
+                position = frame_end
+                continue
+
+        # Resync on the next candidate header, scanning ahead a chunk at a time
+        while candidates and candidates[0] <= position:
+            candidates.popleft()
+        scan_start = max(position + 1, scanned_to)
+        while not candidates and end - scan_start >= HEADER_SIZE:
+            scan_end = min(end, scan_start + SCAN_CHUNK_SIZE + HEADER_SIZE - 1)
+            candidates.extend(find_header_offsets(view, scan_start, scan_end))
+            scan_start = scanned_to = scan_end - HEADER_SIZE + 1
+        if not candidates:
+            return
+        position = candidates.popleft()
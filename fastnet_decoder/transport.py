@@ -0,0 +1,197 @@
+import errno
+import os
+import selectors
+import time
+from .logger import logger
+
+try:
+    import termios
+except ImportError:  # Not available on Windows, where only already configured descriptors can be used
+    termios = None
+
+
+"""
+Serial Transport
+================
+
+`SerialTransport` reads a tty, pty or any other file descriptor in non-blocking mode and
+feeds a `FrameBuffer` without the usual blocking read loop. Each wakeup reads everything
+the driver has buffered with `os.readv` straight into the FrameBuffer's storage (see
+`FrameBuffer.get_write_buffer`), then extracts and queues the completed frames. Where
+`os.readv` is missing, as on Windows, each read is copied into the storage instead.
+
+It can be driven in three ways:
+- `run()`, a selector loop that returns at end of file or when `stop()` is called.
+- `attach(loop)`, which registers the descriptor with `loop.add_reader` so an asyncio
+  application reads the bus on the event loop.
+- `fileno()` and `read_available()` from an existing selector or poll loop.
+
+With `configure=True` a tty is switched to raw mode with 8 data bits, odd parity and
+2 stop bits. FastNet's 11520 baud is not a standard termios speed, so the line speed is
+left as set by the adapter or its driver.
+
+Example:
+--------
+frame_buffer = FrameBuffer()
+with SerialTransport("/dev/ttyUSB0", frame_buffer) as transport:
+    threading.Thread(target=transport.run, daemon=True).start()
+    ...
+"""
+
+# Bytes requested per read; the FrameBuffer caps it at its max_buffer_size
+READ_SIZE = 4096
+
+
+def _read_into(fd, view):
+    """Reads from `fd` into `view`, returning the byte count."""
+    return os.readv(fd, [view])
+
+
+def _read_copy(fd, view):
+    """`_read_into` for platforms without `os.readv` such as Windows: reads, then copies into `view`."""
+    data = os.read(fd, len(view))
+    view[:len(data)] = data
+    return len(data)
+
+
+if not hasattr(os, "readv"):
+    _read_into = _read_copy
+
+
+class SerialTransport:
+    """
+    Non-blocking reader feeding a FrameBuffer from a file descriptor.
+
+    Args:
+        device (str or int): Path of the tty or pty to open, or an open file descriptor.
+        frame_buffer (FrameBuffer): Buffer to fill and extract frames from.
+        configure (bool): Put a tty in raw 8O2 mode. Ignored for descriptors that are not ttys.
+        timestamps (bool): Stamp each read with `time.monotonic_ns()`.
+        read_size (int): Bytes requested per read.
+
+    Attributes:
+        bytes_read (int): Bytes read from the descriptor.
+        reads (int): Number of reads that returned data.
+        eof (bool): True once the other side has closed.
+    """
+    def __init__(self, device, frame_buffer, configure=True, timestamps=False, read_size=READ_SIZE):
+        if isinstance(device, int):
+            self.fd = device
+            self._owns_fd = False
+        else:
+            self.fd = os.open(device, os.O_RDWR | os.O_NOCTTY | os.O_NONBLOCK)
+            self._owns_fd = True
+        os.set_blocking(self.fd, False)
+        if configure and termios is not None and os.isatty(self.fd):
+            self._configure_tty()
+        self.frame_buffer = frame_buffer
+        self.timestamps = timestamps
+        self.read_size = read_size
+        self.bytes_read = 0
+        self.reads = 0
+        self.eof = False
+        self._stopping = False
+        self._loop = None
+
+    def _configure_tty(self):
+        """Raw mode, 8 data bits, odd parity, 2 stop bits, no flow control."""
+        iflag, oflag, cflag, lflag, ispeed, ospeed, cc = termios.tcgetattr(self.fd)
+        iflag &= ~(termios.IGNBRK | termios.BRKINT | termios.PARMRK | termios.ISTRIP | termios.INLCR
+                   | termios.IGNCR | termios.ICRNL | termios.IXON | termios.IXOFF)
+        oflag &= ~termios.OPOST
+        lflag &= ~(termios.ECHO | termios.ECHONL | termios.ICANON | termios.ISIG | termios.IEXTEN)
+        cflag &= ~(termios.CSIZE | getattr(termios, "CRTSCTS", 0))
+        cflag |= termios.CS8 | termios.PARENB | termios.PARODD | termios.CSTOPB | termios.CREAD | termios.CLOCAL
+        cc[termios.VMIN] = 1
+        cc[termios.VTIME] = 0
+        termios.tcsetattr(self.fd, termios.TCSANOW, [iflag, oflag, cflag, lflag, ispeed, ospeed, cc])
+
+    def fileno(self):
+        return self.fd
+
+    def read_available(self):
+        """
+        Reads everything the driver has buffered, then extracts and queues complete frames.
+
+        Returns:
+            int: Bytes read during this call.
+        """
+        frame_buffer = self.frame_buffer
+        total = 0
+        while True:
+            view = frame_buffer.get_write_buffer(self.read_size)
+            size = len(view)
+            try:
+                count = _read_into(self.fd, view)
+            except BlockingIOError:
+                break
+            except OSError as e:
+                if e.errno != errno.EIO:  # A pty reports EIO once the other side is closed
+                    raise
+                count = 0
+            finally:
+                view.release()
+            if count == 0:
+                self.eof = True
+                break
+            frame_buffer.commit_write(count, time.monotonic_ns() if self.timestamps else None)
+            total += count
+            self.reads += 1
+            if count < size:
+                break  # The driver buffer is drained, wait for the next wakeup
+        self.bytes_read += total
+        if total:
+            frame_buffer.get_complete_frames()
+        if self.eof:
+            self.detach()
+        return total
+
+    def run(self, timeout=None):
+        """
+        Reads until end of file or `stop()`, waking only when the descriptor is readable.
+
+        Args:
+            timeout (float): Seconds between checks for `stop()`, None to rely on end of file.
+        """
+        self._stopping = False
+        with selectors.DefaultSelector() as selector:
+            selector.register(self.fd, selectors.EVENT_READ)
+            while not self.eof and not self._stopping:
+                if selector.select(timeout):
+                    self.read_available()
+
+    def stop(self):
+        """Makes `run()` return at its next wakeup or timeout."""
+        self._stopping = True
+
+    def attach(self, loop):
+        """
+        Reads the descriptor from an asyncio event loop.
+
+        Args:
+            loop (asyncio.AbstractEventLoop): A loop supporting `add_reader`.
+        """
+        self._loop = loop
+        loop.add_reader(self.fd, self.read_available)
+
+    def detach(self):
+        """Stops reading from the asyncio event loop."""
+        if self._loop is not None:
+            self._loop.remove_reader(self.fd)
+            self._loop = None
+
+    def close(self):
+        """Detaches and closes the descriptor if the transport opened it."""
+        self.detach()
+        if self._owns_fd and self.fd >= 0:
+            try:
+                os.close(self.fd)
+            except OSError as e:
+                logger.error(f"Failed to close FastNet device: {e}")
+            self.fd = -1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
@@ -16,5 +16,10 @@ setup(
         "Operating System :: OS Independent",
     ],
     python_requires=">=3.7",
-    install_requires=[]  # Add dependencies if required
+    install_requires=[],  # Add dependencies if required
+    extras_require={
+        "numpy": ["numpy"],  # Vectorised header scanning and batch decoding
+        "arrow": ["pyarrow"],  # to_arrow()
+        "pandas": ["pandas", "numpy"],  # to_dataframe()
+    },
 )
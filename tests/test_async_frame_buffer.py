@@ -0,0 +1,81 @@
+import asyncio
+import unittest
+from fastnet_decoder import AsyncFrameBuffer
+
+APPARENT_FRAME = bytes.fromhex("ff051801e34e0a02c402754d6100464f610024520af683f6835113a0064b")
+RUDDER_FRAME = bytes.fromhex("ff120e01e00b038c274908cc294a0a1cdd6067e5")
+
+
+class TestAsyncFrameBuffer(unittest.TestCase):
+    def test_stream_reader(self):
+        """
+        Frames read from a StreamReader are delivered through async for, which ends at EOF.
+        """
+        async def run():
+            reader = asyncio.StreamReader()
+            frame_buffer = AsyncFrameBuffer(compact=True, timestamps=True)
+            task = asyncio.create_task(frame_buffer.read_from(reader))
+            reader.feed_data(APPARENT_FRAME[:10])
+            await asyncio.sleep(0)
+            reader.feed_data(APPARENT_FRAME[10:] + b"\x01\x02" + RUDDER_FRAME)
+            reader.feed_eof()
+            frames = [frame async for frame in frame_buffer]
+            await task
+            return frames
+
+        frames = asyncio.run(run())
+        self.assertEqual([frame.from_address for frame in frames], [0x05, 0x12])
+        self.assertIsNotNone(frames[0].timestamp_ns)
+
+    def test_protocol_wakes_waiting_consumer(self):
+        """
+        A consumer waiting on an empty buffer is woken by data_received and ends on connection_lost.
+        """
+        async def run():
+            frame_buffer = AsyncFrameBuffer()
+            protocol = frame_buffer.protocol()
+
+            async def consume():
+                return [frame["from_address"] async for frame in frame_buffer]
+
+            consumer = asyncio.create_task(consume())
+            await asyncio.sleep(0)
+            protocol.data_received(RUDDER_FRAME)
+            await asyncio.sleep(0)
+            protocol.connection_lost(None)
+            return await asyncio.wait_for(consumer, 1)
+
+        self.assertEqual(asyncio.run(run()), ["Halcyon Gyro-Stabilised Compass (via Pilot ACP)"])
+
+    def test_close_wakes_every_consumer(self):
+        """
+        Every consumer waiting when the buffer closes ends, including one woken by the last frame.
+        """
+        frame_buffer = AsyncFrameBuffer(compact=True)  # Built outside the event loop
+        self.assertIsNone(frame_buffer._frame_queue)
+
+        async def run():
+            async def consume():
+                return [frame.from_address async for frame in frame_buffer]
+
+            consumers = [asyncio.create_task(consume()) for _ in range(3)]
+            await asyncio.sleep(0)
+            frame_buffer.feed(RUDDER_FRAME)
+            frame_buffer.close()
+            return await asyncio.wait_for(asyncio.gather(*consumers), 1)
+
+        results = asyncio.run(run())
+        self.assertEqual(sorted(len(frames) for frames in results), [0, 0, 1])
+
+    def test_full_queue_drops_frames(self):
+        async def run():
+            frame_buffer = AsyncFrameBuffer(max_queue_size=1)
+            frame_buffer.feed(RUDDER_FRAME * 3)
+            frame_buffer.close()
+            return [frame async for frame in frame_buffer]
+
+        self.assertEqual(len(asyncio.run(run())), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
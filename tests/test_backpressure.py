@@ -0,0 +1,147 @@
+import queue
+import threading
+import time
+import unittest
+from fastnet_decoder import FrameBuffer, AsyncFrameBuffer, DropNewest, DropOldest, CoalesceLatest, DropStale, Block
+
+APPARENT_FRAME = bytes.fromhex("ff051801e34e0a02c402754d6100464f610024520af683f6835113a0064b")
+RUDDER_FRAME = bytes.fromhex("ff120e01e00b038c274908cc294a0a1cdd6067e5")
+TIDE_FRAME = bytes.fromhex("ff600a019684070066010e8383bb023d")
+
+
+class TestBackpressure(unittest.TestCase):
+    def run_frames(self, frame_buffer, data, timestamp_ns=None):
+        frame_buffer.add_to_buffer(data, timestamp_ns)
+        frame_buffer.get_complete_frames()
+        frames = []
+        while not frame_buffer.frame_queue.empty():
+            frames.append(frame_buffer.frame_queue.get_nowait())
+        return frames
+
+    def test_drop_newest_is_default(self):
+        """
+        A full queue drops new frames with a warning instead of raising.
+        """
+        frame_buffer = FrameBuffer(max_queue_size=2, compact=True)
+        with self.assertLogs("fastnet_decoder", level="WARNING"):
+            frames = self.run_frames(frame_buffer, APPARENT_FRAME + RUDDER_FRAME + TIDE_FRAME)
+        self.assertEqual([frame.from_address for frame in frames], [0x05, 0x12])
+        self.assertIsInstance(frame_buffer.overflow, DropNewest)
+        self.assertEqual(frame_buffer.overflow.stats(), {"queued": 2, "dropped": 1})
+
+    def test_drop_oldest(self):
+        frame_buffer = FrameBuffer(max_queue_size=2, compact=True, overflow=DropOldest())
+        frames = self.run_frames(frame_buffer, APPARENT_FRAME + RUDDER_FRAME + TIDE_FRAME)
+        self.assertEqual([frame.from_address for frame in frames], [0x12, 0x60])
+        self.assertEqual(frame_buffer.overflow.dropped, 1)
+
+    def test_coalesce_latest(self):
+        """
+        Superseded frames with the same source and channels are merged away; other frames stay in order.
+        """
+        policy = CoalesceLatest()
+        frame_buffer = FrameBuffer(max_queue_size=3, compact=True, overflow=policy)
+        frames = self.run_frames(frame_buffer, RUDDER_FRAME + TIDE_FRAME + RUDDER_FRAME + APPARENT_FRAME + RUDDER_FRAME)
+        self.assertEqual([frame.from_address for frame in frames], [0x60, 0x05, 0x12])
+        self.assertEqual(policy.coalesced, 2)
+        self.assertEqual(policy.stats()["dropped"], 2)
+
+    def test_coalesce_latest_after_concurrent_drain(self):
+        """
+        If a consumer empties the queue between the full check and the merge, the new frame is still queued.
+        """
+        class DrainedQueue(queue.Queue):
+            def put_nowait(self, item):
+                if self.full():
+                    while not self.empty():  # A consumer takes every frame, then the put sees a full queue
+                        self.get_nowait()
+                        self.task_done()
+                    raise queue.Full
+                super().put_nowait(item)
+
+        policy = CoalesceLatest()
+        frame_queue = DrainedQueue(maxsize=2)
+        rudder, tide, apparent = ({"from_address": source, "values": {}} for source in (0x12, 0x60, 0x05))
+        self.assertTrue(policy.put(frame_queue, rudder))
+        self.assertTrue(policy.put(frame_queue, tide))
+        self.assertTrue(policy.put(frame_queue, apparent))
+        self.assertIs(frame_queue.get_nowait(), apparent)
+        self.assertEqual(policy.stats(), {"queued": 3, "dropped": 0, "coalesced": 0})
+
+    def test_coalesce_latest_with_consumer_thread(self):
+        """
+        With a consumer draining concurrently, every frame is either consumed, still queued or counted as dropped.
+        """
+        policy = CoalesceLatest()
+        frame_buffer = FrameBuffer(max_queue_size=4, compact=True, overflow=policy)
+        consumed = []
+        done = threading.Event()
+
+        def consume():
+            while not done.is_set() or not frame_buffer.frame_queue.empty():
+                try:
+                    consumed.append(frame_buffer.frame_queue.get(timeout=0.01))
+                except queue.Empty:
+                    pass
+
+        consumer = threading.Thread(target=consume)
+        consumer.start()
+        for _ in range(2000):
+            frame_buffer.add_to_buffer(RUDDER_FRAME + TIDE_FRAME + APPARENT_FRAME)
+            frame_buffer.get_complete_frames()
+        done.set()
+        consumer.join(5)
+        self.assertEqual(len(consumed) + policy.dropped, 6000)
+
+    def test_drop_stale(self):
+        """
+        Frames older than max_age_ms make room for new ones; fresh frames are not dropped.
+        """
+        policy = DropStale(max_age_ms=100)
+        frame_buffer = FrameBuffer(max_queue_size=1, compact=True, overflow=policy)
+        frame_buffer.add_to_buffer(RUDDER_FRAME, timestamp_ns=time.monotonic_ns() - 1_000_000_000)
+        frame_buffer.get_complete_frames()
+        frames = self.run_frames(frame_buffer, TIDE_FRAME + APPARENT_FRAME, time.monotonic_ns())
+        self.assertEqual([frame.from_address for frame in frames], [0x60])
+        self.assertEqual(policy.stats(), {"queued": 2, "dropped": 2, "stale": 1})
+
+    def test_dropped_frames_are_marked_done(self):
+        """
+        Frames a policy removes from the queue do not keep `frame_queue.join()` waiting.
+        """
+        for policy in (DropOldest(), CoalesceLatest(), DropStale(max_age_ms=100)):
+            frame_buffer = FrameBuffer(max_queue_size=2, compact=True, overflow=policy)
+            stale_ns = time.monotonic_ns() - 1_000_000_000
+            for frame in (RUDDER_FRAME, TIDE_FRAME, RUDDER_FRAME, APPARENT_FRAME, RUDDER_FRAME):
+                frame_buffer.add_to_buffer(frame, stale_ns)
+                frame_buffer.get_complete_frames()
+            frame_queue = frame_buffer.frame_queue
+            self.assertEqual(frame_queue.unfinished_tasks, frame_queue.qsize(), type(policy).__name__)
+            while not frame_queue.empty():
+                frame_queue.get_nowait()
+                frame_queue.task_done()
+            frame_queue.join()  # Returns at once as every frame is done
+
+    def test_block_waits_for_consumer(self):
+        frame_buffer = FrameBuffer(max_queue_size=1, overflow=Block(timeout=1))
+        consumed = []
+
+        def consume():
+            for _ in range(3):
+                consumed.append(frame_buffer.frame_queue.get(timeout=1))
+
+        consumer = threading.Thread(target=consume)
+        consumer.start()
+        frame_buffer.add_to_buffer(RUDDER_FRAME * 3)
+        frame_buffer.get_complete_frames()
+        consumer.join(2)
+        self.assertEqual(len(consumed), 3)
+        self.assertEqual(frame_buffer.overflow.dropped, 0)
+
+    def test_block_is_rejected_for_asyncio(self):
+        with self.assertRaises(ValueError):
+            AsyncFrameBuffer(overflow=Block())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+from array import array
+from fastnet_decoder import decode_frame, decode_frames
+
+APPARENT_FRAME = bytes.fromhex("ff051801e34e0a02c402754d6100464f610024520af683f6835113a0064b")
+RUDDER_FRAME = bytes.fromhex("ff120e01e00b038c274908cc294a0a1cdd6067e5")
+
+
+class TestBatchDecode(unittest.TestCase):
+    def test_stream_to_columns(self):
+        """
+        A raw stream is resynced and decoded into per-channel columns that match decode_frame.
+        """
+        stream = APPARENT_FRAME + b"\x01\x02\x03" + RUDDER_FRAME + APPARENT_FRAME
+        columns = decode_frames(stream)
+
+        self.assertEqual(columns.frame_count, 3)
+        self.assertEqual(list(columns.sources), [0x05, 0x12, 0x05])
+        self.assertIsNone(columns.timestamps)
+
+        awa = columns[0x51]
+        expected = decode_frame(APPARENT_FRAME)["values"]["Apparent Wind Angle"]["interpreted"]
+        self.assertIsInstance(awa.values, array)
+        self.assertEqual(list(awa.values), [expected, expected])
+        self.assertEqual(list(awa.frames), [0, 2])
+        self.assertEqual(list(columns[0x0B].values), [-39.0])
+
+    def test_timestamped_items(self):
+        """
+        Iterables of (timestamp_ns, frame) pairs keep their timestamps; invalid frames are skipped.
+        """
+        corrupt = RUDDER_FRAME[:-1] + b"\x00"
+        columns = decode_frames([(100, RUDDER_FRAME), (200, corrupt), (300, RUDDER_FRAME)], channels={0x49})
+
+        self.assertEqual(columns.frame_count, 2)
+        self.assertEqual(list(columns.timestamps), [100, 300])
+        self.assertEqual(list(columns), [0x49])
+        self.assertEqual(list(columns[0x49].timestamps), [100, 300])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import math
+import unittest
+from fastnet_decoder import BoatState, FrameBuffer, decode_frame
+
+APPARENT_FRAME = bytes.fromhex("ff051801e34e0a02c402754d6100464f610024520af683f6835113a0064b")
+RUDDER_FRAME = bytes.fromhex("ff120e01e00b038c274908cc294a0a1cdd6067e5")
+
+
+class TestBoatState(unittest.TestCase):
+    def test_frame_buffer_updates_state(self):
+        """
+        FrameBuffer writes the latest value, timestamp, source and version of each channel into the state.
+        """
+        state = BoatState()
+        frame_buffer = FrameBuffer(state=state)
+        frame_buffer.add_to_buffer(APPARENT_FRAME + RUDDER_FRAME + APPARENT_FRAME, timestamp_ns=10_000_000)
+        frame_buffer.get_complete_frames()
+
+        expected = decode_frame(APPARENT_FRAME)["values"]["Apparent Wind Angle"]["interpreted"]
+        self.assertEqual(state[0x51], expected)
+        self.assertEqual(state.versions[0x51], 2)
+        self.assertEqual(state.sources[0x51], 0x05)
+        self.assertEqual(state.timestamps[0x51], 10_000_000)
+        self.assertEqual(state.get(0x0B), -39.0)
+        self.assertEqual(state.sources[0x0B], 0x12)
+        self.assertLess(state.timestamps[0x0B], 10_000_000)
+        self.assertEqual(frame_buffer.frame_queue.qsize(), 3)
+
+    def test_unseen_channels_and_filter(self):
+        state = BoatState(channels={0x49})
+        state.update(RUDDER_FRAME, timestamp_ns=5)
+
+        self.assertEqual(state.seen(), [0x49])
+        self.assertNotIn(0x0B, state)
+        self.assertIsNone(state.get(0x0B))
+        self.assertTrue(math.isnan(state[0x0B]))
+        self.assertEqual(state.as_dict()["Heading"]["value"], 41.0)
+
+        state.clear()
+        self.assertEqual(state.seen(), [])
+
+    def test_shared_views(self):
+        """
+        Memoryviews and NumPy arrays share the state's memory and follow later updates.
+        """
+        state = BoatState()
+        view = memoryview(state.values)
+        state.update(RUDDER_FRAME)
+        self.assertEqual(view[0x49], 41.0)
+        try:
+            values, _, _, versions = state.as_numpy()
+        except ImportError:
+            self.skipTest("NumPy is not installed")
+        state.update(RUDDER_FRAME)
+        self.assertEqual(values[0x49], 41.0)
+        self.assertEqual(versions[0x49], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+from unittest import mock
+from fastnet_decoder import FrameBuffer
+
+APPARENT_FRAME = bytes.fromhex("ff051801e34e0a02c402754d6100464f610024520af683f6835113a0064b")
+RUDDER_FRAME = bytes.fromhex("ff120e01e00b038c274908cc294a0a1cdd6067e5")
+
+
+class TestCallbacks(unittest.TestCase):
+    def test_channel_handlers_without_queue(self):
+        """
+        Channel handlers receive their values directly and, without queueing, frames are never decoded.
+        """
+        frame_buffer = FrameBuffer(queue_frames=False)
+        received = []
+        frame_buffer.on_channel(0x49, lambda value, source, timestamp_ns: received.append((value.value, source, timestamp_ns)))
+        frame_buffer.on_channel(0x0B, lambda value, source, timestamp_ns: received.append((value.value, source, timestamp_ns)))
+
+        with mock.patch("fastnet_decoder.frame_buffer.decode_frame") as decode_frame:
+            frame_buffer.add_to_buffer(APPARENT_FRAME + RUDDER_FRAME, timestamp_ns=1_000_000)
+            frame_buffer.get_complete_frames()
+            decode_frame.assert_not_called()
+
+        self.assertEqual([(value, source) for value, source, _ in received], [(-39.0, 0x12), (41.0, 0x12)])
+        self.assertEqual(received[0][2], 1_000_000)
+        self.assertTrue(frame_buffer.frame_queue.empty())
+
+    def test_frame_handler_and_queue(self):
+        """
+        Frame handlers see every decoded frame, which is still queued by default.
+        """
+        frame_buffer = FrameBuffer(compact=True)
+        frames = []
+        frame_buffer.on_frame(frames.append)
+        frame_buffer.add_to_buffer(APPARENT_FRAME + RUDDER_FRAME)
+        frame_buffer.get_complete_frames()
+
+        self.assertEqual([frame.from_address for frame in frames], [0x05, 0x12])
+        self.assertEqual(frame_buffer.frame_queue.qsize(), 2)
+
+    def test_failing_handler_is_logged(self):
+        frame_buffer = FrameBuffer()
+        frame_buffer.on_channel(0x49, mock.Mock(side_effect=RuntimeError("boom")))
+        with self.assertLogs("fastnet_decoder", level="ERROR"):
+            frame_buffer.add_to_buffer(RUDDER_FRAME * 2)
+            frame_buffer.get_complete_frames()
+        self.assertEqual(frame_buffer.frame_queue.qsize(), 2)
+
+        with self.assertRaises(ValueError):
+            frame_buffer.on_channel(0x100, print)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+import io
+import os
+import tempfile
+import unittest
+from fastnet_decoder import CaptureReader, CaptureWriter, FrameBuffer, decode_frame, iter_records
+from fastnet_decoder.capture import read_header
+
+APPARENT_FRAME = bytes.fromhex("ff051801e34e0a02c402754d6100464f610024520af683f6835113a0064b")
+RUDDER_FRAME = bytes.fromhex("ff120e01e00b038c274908cc294a0a1cdd6067e5")
+
+
+class TestCapture(unittest.TestCase):
+    def test_frames_capture(self):
+        """
+        A frames capture holds each validated frame once, stamped with its arrival time.
+        """
+        output = io.BytesIO()
+        capture = CaptureWriter(output, kind="frames")
+        frame_buffer = FrameBuffer(capture=capture)
+        frame_buffer.add_to_buffer(APPARENT_FRAME + b"\x01\x02" + RUDDER_FRAME, timestamp_ns=5_000_000)
+        frame_buffer.get_complete_frames()
+        capture.close()
+
+        data = output.getvalue()
+        self.assertEqual(read_header(data), "frames")
+        records = [(timestamp_ns, bytes(frame)) for timestamp_ns, frame in iter_records(data)]
+        self.assertEqual([frame for _, frame in records], [APPARENT_FRAME, RUDDER_FRAME])
+        self.assertEqual(records[1][0], 5_000_000)
+        self.assertLess(records[0][0], 5_000_000)
+        self.assertEqual(len(data), 8 + 2 * 12 + len(APPARENT_FRAME) + len(RUDDER_FRAME))
+
+    def test_chunks_capture_replays(self):
+        """
+        A chunks capture written to a file replays through a FrameBuffer into the same frames.
+        """
+        chunks = [APPARENT_FRAME[:9], APPARENT_FRAME[9:] + b"\xff\x00", RUDDER_FRAME]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "bus.fncap")
+            with CaptureWriter(path, kind="chunks", buffer_size=16) as capture:
+                frame_buffer = FrameBuffer(compact=True, capture=capture)
+                for timestamp_ns, chunk in enumerate(chunks):
+                    frame_buffer.add_to_buffer(chunk, timestamp_ns)
+                    frame_buffer.get_complete_frames()
+            with open(path, "rb") as f:
+                data = f.read()
+
+        self.assertEqual(read_header(data), "chunks")
+        self.assertEqual([(timestamp_ns, bytes(chunk)) for timestamp_ns, chunk in iter_records(data)],
+                         list(enumerate(chunks)))
+        replay = FrameBuffer(compact=True)
+        for timestamp_ns, chunk in iter_records(data):
+            replay.add_to_buffer(bytes(chunk), timestamp_ns)
+            replay.get_complete_frames()
+        self.assertEqual(replay.frame_queue.qsize(), frame_buffer.frame_queue.qsize())
+
+    def test_invalid_header(self):
+        with self.assertRaises(ValueError):
+            read_header(b"NOTACAPTURE")
+        with self.assertRaises(ValueError):
+            CaptureWriter(io.BytesIO(), kind="hex")
+
+
+class TestCaptureReader(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "season.fncap")
+        with CaptureWriter(self.path, kind="frames") as capture:
+            for record in range(3000):
+                capture.write(RUDDER_FRAME if record % 2 else APPARENT_FRAME, record * 1000)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_zero_copy_frames(self):
+        with CaptureReader(self.path) as reader:
+            frames = reader.frames()
+            timestamp_ns, frame = next(frames)
+            self.assertIsInstance(frame, memoryview)
+            self.assertEqual(timestamp_ns, 0)
+            self.assertEqual(decode_frame(frame), decode_frame(APPARENT_FRAME))
+            self.assertEqual(sum(1 for _ in frames), 2999)
+            del frame, frames
+
+    def test_seek_by_time(self):
+        """
+        seek() builds the sidecar index once and positions on the first record at or after the time.
+        """
+        with CaptureReader(self.path) as reader:
+            self.assertEqual(sum(1 for _ in reader), 3000)
+            self.assertFalse(os.path.exists(self.path + ".idx"))  # Sequential reads do not need it
+            reader.seek(2_500_500)
+            self.assertTrue(os.path.exists(self.path + ".idx"))
+            timestamp_ns, frame = next(iter(reader))
+            self.assertEqual(timestamp_ns, 2_501_000)
+            self.assertEqual(bytes(frame), RUDDER_FRAME)
+            del frame
+
+            reader.seek(10**12)
+            self.assertEqual(list(reader), [])
+            reader.seek(-1)
+            self.assertEqual(next(iter(reader))[0], 0)
+
+        # The index is reused, and rebuilt once the capture changes
+        with CaptureReader(self.path) as reader:
+            reader.seek(0)
+            self.assertEqual(len(reader._index[0]), 3)
+        with CaptureWriter(self.path, kind="frames") as capture:
+            capture.write(RUDDER_FRAME, 7)
+        with CaptureReader(self.path) as reader:
+            reader.seek(0)
+            self.assertEqual(list(reader._index[0]), [7])
+
+    def test_replay_chunks(self):
+        path = os.path.join(self.directory.name, "raw.fncap")
+        with CaptureWriter(path, kind="chunks") as capture:
+            capture.write(APPARENT_FRAME[:10], 1)
+            capture.write(APPARENT_FRAME[10:], 2)
+        frame_buffer = FrameBuffer(compact=True)
+        with CaptureReader(path, index=False) as reader:
+            with self.assertRaises(ValueError):
+                reader.frames()
+            reader.replay(frame_buffer)
+        self.assertEqual(frame_buffer.frame_queue.get_nowait().timestamp_ns, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+from unittest import mock
+from fastnet_decoder import FrameBuffer, decode_frame
+from fastnet_decoder import decode_fastnet
+
+APPARENT_FRAME = bytes.fromhex("ff051801e34e0a02c402754d6100464f610024520af683f6835113a0064b")
+RUDDER_FRAME = bytes.fromhex("ff120e01e00b038c274908cc294a0a1cdd6067e5")
+
+
+class TestChannelFilter(unittest.TestCase):
+    def test_decode_frame_skips_unwanted_channels(self):
+        """
+        Only wanted channels are decoded; the rest are skipped by length.
+        """
+        with mock.patch.object(decode_fastnet, "decode_format_and_data",
+                               wraps=decode_fastnet.decode_format_and_data) as decoder:
+            decoded = decode_frame(APPARENT_FRAME, channels={0x4D, 0x51})
+        self.assertEqual(decoder.call_count, 2)
+        self.assertEqual(list(decoded["values"]), ["Apparent Wind Speed (Knots)", "Apparent Wind Angle"])
+        self.assertEqual(decoded["values"]["Apparent Wind Angle"], decode_frame(APPARENT_FRAME)["values"]["Apparent Wind Angle"])
+
+        record = decode_frame(APPARENT_FRAME, compact=True, channels={0x51})
+        self.assertEqual(list(record.values), [0x51])
+
+    def test_frame_buffer_drops_frames_without_wanted_channels(self):
+        """
+        FrameBuffer only queues frames that carry a subscribed channel.
+        """
+        frame_buffer = FrameBuffer(channels={0x49})
+        frame_buffer.add_to_buffer(APPARENT_FRAME + RUDDER_FRAME + APPARENT_FRAME)
+        frame_buffer.get_complete_frames()
+
+        self.assertEqual(frame_buffer.frame_queue.qsize(), 1)
+        decoded = frame_buffer.frame_queue.get_nowait()
+        self.assertEqual(list(decoded["values"]), ["Heading"])
+
+    def test_lazy_frame_filter(self):
+        """
+        Lazy frames only expose subscribed channels.
+        """
+        frame_buffer = FrameBuffer(lazy=True, channels={0x0B, 0x4A})
+        frame_buffer.add_to_buffer(RUDDER_FRAME)
+        frame_buffer.get_complete_frames()
+        self.assertEqual(frame_buffer.frame_queue.get_nowait().channel_ids(), [0x0B, 0x4A])
+
+
+if __name__ == "__main__":
+    unittest.main()
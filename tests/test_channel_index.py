@@ -0,0 +1,74 @@
+import os
+import tempfile
+import unittest
+from fastnet_decoder import CaptureReader, CaptureWriter, ChannelIndex, decode_frame
+from fastnet_decoder.channel_index import decode_deltas, encode_deltas, index_path
+
+APPARENT_FRAME = bytes.fromhex("ff051801e34e0a02c402754d6100464f610024520af683f6835113a0064b")
+RUDDER_FRAME = bytes.fromhex("ff120e01e00b038c274908cc294a0a1cdd6067e5")
+TIDE_FRAME = bytes.fromhex("ff600a019684070066010e8383bb023d")
+
+
+class TestChannelIndex(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "week.fncap")
+        with CaptureWriter(self.path, kind="frames") as capture:
+            for record in range(600):
+                frame = (APPARENT_FRAME, RUDDER_FRAME, TIDE_FRAME)[record % 3]
+                capture.write(frame, 1_000_000_000 + record * 50_000_000)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_read_one_channel(self):
+        """
+        Reading a channel visits only the frames carrying it and matches decode_frame.
+        """
+        index = ChannelIndex.load(self.path)
+        self.assertTrue(os.path.exists(index_path(self.path)))
+        self.assertEqual(index.count(0x51), 200)
+        self.assertEqual(index.count(0x49), 200)
+        self.assertNotIn(0x00, index.channel_ids())
+
+        expected = decode_frame(APPARENT_FRAME)["values"]["Apparent Wind Angle"]["interpreted"]
+        with CaptureReader(self.path, index=False) as reader:
+            values = list(index.read(reader, 0x51))
+        self.assertEqual(len(values), 200)
+        self.assertEqual(values[0][0], 1_000_000_000)
+        self.assertEqual(values[1][0], 1_150_000_000)
+        self.assertTrue(all(channel.value == expected for _, channel in values))
+
+    def test_time_window_and_reload(self):
+        """
+        A saved index is reloaded from its sidecar, and time windows select frames by bisection.
+        """
+        built = ChannelIndex.load(self.path)
+        loaded = ChannelIndex.load(self.path)
+        self.assertEqual(loaded.offsets, built.offsets)
+        self.assertEqual(loaded.timestamps, built.timestamps)
+
+        with CaptureReader(self.path, index=False) as reader:
+            window = [timestamp_ns for timestamp_ns, _ in loaded.read(reader, 0x0B, 2_000_000_000, 3_000_000_000)]
+        self.assertEqual(window[0], 2_100_000_000)
+        self.assertEqual(window[-1], 2_850_000_000)
+        self.assertEqual(len(window), 6)
+
+    def test_delta_encoding(self):
+        values = [0, 5, 300, 300, 2**40]
+        encoded = encode_deltas(values)
+        self.assertLess(len(encoded), 16)
+        self.assertEqual(list(decode_deltas(encoded, 5, "Q")), values)
+        signed = [10, -7, 2**50, 0]
+        self.assertEqual(list(decode_deltas(encode_deltas(signed, signed=True), 4, "q", signed=True)), signed)
+
+    def test_chunks_capture_is_rejected(self):
+        path = os.path.join(self.directory.name, "raw.fncap")
+        with CaptureWriter(path, kind="chunks") as capture:
+            capture.write(RUDDER_FRAME)
+        with self.assertRaises(ValueError):
+            ChannelIndex.load(path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+import math
+import os
+import tempfile
+import unittest
+from fastnet_decoder import CaptureWriter, FrameBuffer, decode_frame, decode_frames, to_arrow, to_dataframe
+from fastnet_decoder import numpy_engine
+from fastnet_decoder.columnar import load_columns, table_columns
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+try:
+    import pandas
+except ImportError:
+    pandas = None
+
+APPARENT_FRAME = bytes.fromhex("ff051801e34e0a02c402754d6100464f610024520af683f6835113a0064b")
+RUDDER_FRAME = bytes.fromhex("ff120e01e00b038c274908cc294a0a1cdd6067e5")
+TIDE_FRAME = bytes.fromhex("ff600a019684070066010e8383bb023d")
+
+AWA = decode_frame(APPARENT_FRAME)["values"]["Apparent Wind Angle"]["interpreted"]
+HEADING = decode_frame(RUDDER_FRAME)["values"]["Heading"]["interpreted"]
+
+
+class TestTableColumns(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.capture = os.path.join(self.directory.name, "race.fncap")
+        with CaptureWriter(self.capture, kind="frames") as capture:
+            for record in range(30):
+                capture.write((APPARENT_FRAME, RUDDER_FRAME, TIDE_FRAME)[record % 3], 1_000 + record)
+        self.raw = os.path.join(self.directory.name, "race.bin")
+        with open(self.raw, "wb") as f:
+            f.write((APPARENT_FRAME + RUDDER_FRAME + TIDE_FRAME) * 10)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_one_row_per_frame(self):
+        """
+        Every channel is spread over all frames, NaN where a frame does not carry it.
+        """
+        columns = load_columns(self.capture, channels={0x51, 0x49})
+        self.assertEqual(columns.frame_count, 30)
+        table = dict(table_columns(columns))
+        self.assertEqual(sorted(table), [0x49, 0x51])
+        self.assertEqual(len(table[0x51]), 30)
+        self.assertEqual(table[0x51][0], AWA)
+        self.assertTrue(math.isnan(table[0x51][1]))
+        self.assertEqual(table[0x49][1], HEADING)
+        self.assertTrue(math.isnan(table[0x49][2]))
+
+    def test_inputs(self):
+        """
+        Frames captures, raw capture files and decoded columns give the same channels.
+        """
+        from_capture = load_columns(self.capture)
+        from_raw = load_columns(self.raw)
+        self.assertIsNotNone(from_capture.timestamps)
+        self.assertIsNone(from_raw.timestamps)
+        self.assertEqual(from_capture.frame_count, from_raw.frame_count)
+        for (channel_id, values), (raw_id, raw_values) in zip(table_columns(from_capture), table_columns(from_raw)):
+            self.assertEqual(channel_id, raw_id)
+            self.assertEqual([v for v in values if v == v], [v for v in raw_values if v == v])
+        columns = decode_frames(APPARENT_FRAME)
+        self.assertIs(load_columns(columns), columns)
+
+    def test_chunks_capture(self):
+        """
+        A chunks capture is decoded as one stream, with frames split across records stamped from the later record.
+        """
+        chunks = os.path.join(self.directory.name, "raw.fncap")
+        stream = (APPARENT_FRAME + RUDDER_FRAME + TIDE_FRAME) * 10
+        byte_time_ns = FrameBuffer().byte_time_ns
+        with CaptureWriter(chunks, kind="chunks") as capture:
+            for start in range(0, len(stream), 7):
+                end = min(start + 7, len(stream))
+                capture.write(stream[start:end], 1_000_000 + end * byte_time_ns)
+        columns = load_columns(chunks, channels={0x51, 0x49})
+        self.assertEqual(columns.frame_count, 30)
+        table = dict(table_columns(columns))
+        self.assertEqual(table[0x51][0], AWA)
+        self.assertEqual(table[0x49][1], HEADING)
+
+        # Records are stamped at the wire time of their last byte, so each frame gets the wire time of its own
+        frame_ends = []
+        position = 0
+        for _ in range(10):
+            for frame in (APPARENT_FRAME, RUDDER_FRAME, TIDE_FRAME):
+                position += len(frame)
+                frame_ends.append(position)
+        self.assertEqual(list(columns.timestamps), [1_000_000 + end * byte_time_ns for end in frame_ends])
+        python = load_columns(chunks, channels={0x51, 0x49}, engine="python")
+        self.assertEqual(python.timestamps, columns.timestamps)
+        self.assertEqual(python[0x49].values, columns[0x49].values)
+
+    def test_engines_agree_on_captures(self):
+        """
+        Captures decoded in place give the same columns on both engines, skipping corrupt records.
+        """
+        with CaptureWriter(self.capture, kind="frames") as capture:
+            for record in range(30):
+                capture.write((APPARENT_FRAME, RUDDER_FRAME, TIDE_FRAME[:-1] + b"\x00")[record % 3], 1_000 + record)
+        engines = ["python", "numpy"] if numpy_engine.np is not None else ["python"]
+        results = [load_columns(self.capture, engine=engine) for engine in engines]
+        for columns in results:
+            self.assertEqual(columns.frame_count, 20)
+            self.assertEqual(list(columns.timestamps[:3]), [1_000, 1_001, 1_003])
+            self.assertEqual(dict(table_columns(columns))[0x51][2], AWA)
+        for channel_id in results[0]:
+            self.assertEqual(results[0][channel_id].values, results[-1][channel_id].values)
+
+    @unittest.skipIf(pyarrow is None, "pyarrow is not installed")
+    def test_to_arrow(self):
+        table = to_arrow(self.capture, channels={0x51, 0x49})
+        self.assertEqual(table.column_names, ["timestamp_ns", "source", "Heading", "Apparent Wind Angle"])
+        self.assertEqual(table.num_rows, 30)
+        self.assertEqual(table.schema.field("source").type, pyarrow.uint8())
+        self.assertEqual(table.column("timestamp_ns")[3].as_py(), 1_003)
+        self.assertEqual(table.column("Apparent Wind Angle")[0].as_py(), AWA)
+        self.assertEqual(table.column("Heading")[1].as_py(), HEADING)
+
+    @unittest.skipIf(pandas is None, "pandas is not installed")
+    def test_to_dataframe(self):
+        frame = to_dataframe(self.raw, channels={0x51, 0x49})
+        self.assertEqual(list(frame.columns), ["source", "Heading", "Apparent Wind Angle"])
+        self.assertEqual(len(frame), 30)
+        self.assertEqual(str(frame["Heading"].dtype), "float64")
+        self.assertEqual(frame["source"].iloc[1], 0x12)
+        self.assertEqual(frame["Apparent Wind Angle"].iloc[0], AWA)
+        self.assertTrue(math.isnan(frame["Heading"].iloc[0]))
+
+    @unittest.skipIf(pyarrow is not None, "pyarrow is installed")
+    def test_missing_pyarrow(self):
+        with self.assertRaisesRegex(ImportError, r"pyfastnet\[arrow\]"):
+            to_arrow(self.capture)
+
+    @unittest.skipIf(pandas is not None, "pandas is installed")
+    def test_missing_pandas(self):
+        with self.assertRaisesRegex(ImportError, r"pyfastnet\[pandas\]"):
+            decode_frames(APPARENT_FRAME).to_dataframe()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+from fastnet_decoder import FrameBuffer, FrameRecord, decode_frame, decode_ascii_frame
+from fastnet_decoder.utils import calculate_checksum
+
+FRAMES = [
+    "ff051801e34e0a02c402754d6100464f610024520af683f6835113a0064b",
+    "ff120e01e00b038c274908cc294a0a1cdd6067e5",
+    "ff600a019684070066010e8383bb023d",
+]
+
+
+class TestCompactRecords(unittest.TestCase):
+    def test_compact_matches_dict_output(self):
+        """
+        A compact record rebuilds exactly the default dictionary output.
+        """
+        for hex_string in FRAMES:
+            frame_data = bytes.fromhex(hex_string)
+            record = decode_frame(frame_data, compact=True)
+            self.assertIsInstance(record, FrameRecord)
+            self.assertEqual(record.as_dict(), decode_frame(frame_data))
+
+    def test_values_keyed_by_channel_id(self):
+        """
+        Values are keyed by integer channel id and carry the numeric value.
+        """
+        record = decode_frame(bytes.fromhex(FRAMES[1]), compact=True)
+        self.assertEqual(record.from_address, 0x12)
+        self.assertEqual(record.values[0x0B].value, -39.0)
+        self.assertEqual(record.values[0x0B].data, bytes.fromhex("8c27"))
+        self.assertEqual(record.values[0x0B].name, "Rudder Angle")
+
+    def test_compact_errors_return_none(self):
+        """
+        Invalid frames return None instead of an error dictionary.
+        """
+        self.assertIsNone(decode_frame(bytes.fromhex(FRAMES[2])[:-1] + b"\x00", compact=True))
+
+    def test_ascii_compact(self):
+        """
+        ASCII frames have a compact form too.
+        """
+        body = bytes([0x47, 0x00]) + b"5030.12N00112.34W"
+        header = bytes([0xFF, 0x05, len(body), 0x03])
+        frame_data = header + bytes([calculate_checksum(header)]) + body + bytes([calculate_checksum(body)])
+        record = decode_ascii_frame(frame_data, compact=True)
+        self.assertEqual(record.values[0x47].value, "5030.12N00112.34W")
+        self.assertEqual(record.as_dict(), decode_ascii_frame(frame_data))
+
+    def test_frame_buffer_compact(self):
+        """
+        A compact FrameBuffer queues FrameRecord objects.
+        """
+        frame_buffer = FrameBuffer(compact=True)
+        frame_buffer.add_to_buffer(bytes.fromhex(FRAMES[0]))
+        frame_buffer.get_complete_frames()
+        self.assertIsInstance(frame_buffer.frame_queue.get_nowait(), FrameRecord)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+from fastnet_decoder import DecodeCache, FrameBuffer, decode_frame
+from fastnet_decoder.decode_fastnet import decode_format_and_data
+
+APPARENT_FRAME = bytes.fromhex("ff051801e34e0a02c402754d6100464f610024520af683f6835113a0064b")
+
+
+class TestDecodeCache(unittest.TestCase):
+    def test_counters_and_eviction(self):
+        """
+        Repeated lookups hit, and the least recently used entry is evicted first.
+        """
+        cache = DecodeCache(maxsize=2)
+        first = cache.lookup(0x41, 0x51, b"\x00\x10", decode_format_and_data)
+        self.assertIs(cache.lookup(0x41, 0x51, b"\x00\x10", decode_format_and_data), first)
+        cache.lookup(0x41, 0x51, b"\x00\x11", decode_format_and_data)
+        cache.lookup(0x41, 0x51, b"\x00\x10", decode_format_and_data)
+        cache.lookup(0x41, 0x51, b"\x00\x12", decode_format_and_data)
+
+        self.assertEqual(cache.stats(), {"size": 2, "maxsize": 2, "hits": 2, "misses": 3, "evictions": 1})
+        self.assertIs(cache.lookup(0x41, 0x51, b"\x00\x10", decode_format_and_data), first)
+
+    def test_keys_distinguish_channel_and_format(self):
+        """
+        The same data under another channel or format byte is a different entry.
+        """
+        cache = DecodeCache()
+        a = cache.lookup(0x41, 0x51, b"\x00\x10", decode_format_and_data)
+        b = cache.lookup(0x42, 0x51, b"\x00\x10", decode_format_and_data)
+        c = cache.lookup(0x41, 0x01, b"\x00\x10", decode_format_and_data)
+        self.assertEqual((a["channel_id"], b["channel_id"], c["interpreted"]), ("0x41", "0x42", 16.0))
+        self.assertEqual(cache.misses, 3)
+
+    def test_cached_frames_match_uncached(self):
+        """
+        Decoding with a cache gives the same output, and repeats are served from the cache.
+        """
+        cache = DecodeCache()
+        self.assertEqual(decode_frame(APPARENT_FRAME, cache=cache), decode_frame(APPARENT_FRAME))
+        frame_buffer = FrameBuffer(compact=True, decode_cache=DecodeCache())
+        frame_buffer.add_to_buffer(APPARENT_FRAME * 3)
+        frame_buffer.get_complete_frames()
+        self.assertEqual(frame_buffer.decode_cache.hits, 10)
+        self.assertEqual(frame_buffer.decode_cache.misses, 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+from fastnet_decoder import DeltaFilter, FrameBuffer, FrameCache
+from fastnet_decoder.utils import calculate_checksum
+
+RUDDER_FRAME = bytes.fromhex("ff120e01e00b038c274908cc294a0a1cdd6067e5")
+
+
+def with_heading(frame, data):
+    """Returns the rudder frame with new 0x49 data bytes and a fixed body checksum."""
+    body = frame[5:11] + data + frame[13:-1]
+    return frame[:5] + body + bytes([calculate_checksum(body)])
+
+
+class TestDeltaFilter(unittest.TestCase):
+    def drain(self, frame_buffer):
+        frames = []
+        while not frame_buffer.frame_queue.empty():
+            frames.append(frame_buffer.frame_queue.get())
+        return frames
+
+    def test_only_changed_channels_are_queued(self):
+        """
+        A repeated frame is dropped and a frame with one new channel value queues only that channel.
+        """
+        delta = DeltaFilter()
+        frame_buffer = FrameBuffer(compact=True, delta=delta)
+        changed = with_heading(RUDDER_FRAME, b"\xcc\x30")
+        frame_buffer.add_to_buffer(RUDDER_FRAME + RUDDER_FRAME + changed)
+        frame_buffer.get_complete_frames()
+
+        first, second = self.drain(frame_buffer)
+        self.assertEqual(sorted(first.values), [0x0B, 0x49, 0x4A])
+        self.assertEqual(list(second.values), [0x49])
+        self.assertEqual(second.values[0x49].value, 48.0)
+        self.assertEqual(delta.stats(), {"tracked": 3, "changed": 4, "refreshed": 0, "suppressed": 5})
+
+    def test_heartbeat_and_reset(self):
+        """
+        Unchanged channels are sent again once their heartbeat is due, or after a reset.
+        """
+        frame_buffer = FrameBuffer(delta=DeltaFilter(heartbeat=1.0))
+        for timestamp_ns in (0, 500_000_000, 1_100_000_000):
+            frame_buffer.add_to_buffer(RUDDER_FRAME, timestamp_ns=timestamp_ns)
+            frame_buffer.get_complete_frames()
+        frames = self.drain(frame_buffer)
+        self.assertEqual(len(frames), 2)
+        self.assertEqual(len(frames[1]["values"]), 3)
+
+        frame_buffer.delta.reset()
+        frame_buffer.add_to_buffer(RUDDER_FRAME, timestamp_ns=1_200_000_000)
+        frame_buffer.get_complete_frames()
+        self.assertEqual(len(self.drain(frame_buffer)), 1)
+
+    def test_sources_are_tracked_separately(self):
+        delta = DeltaFilter()
+        other_source = RUDDER_FRAME[:1] + b"\x13" + RUDDER_FRAME[2:4] + bytes([calculate_checksum(b"\xff\x13\x0e\x01")]) + RUDDER_FRAME[5:]
+        self.assertEqual(delta.changed_channels(RUDDER_FRAME, 0), {0x0B, 0x49, 0x4A})
+        self.assertEqual(delta.changed_channels(other_source, 0, channels={0x49}), {0x49})
+        self.assertEqual(delta.changed_channels(RUDDER_FRAME, 0), set())
+
+    def test_frame_cache_is_rejected(self):
+        with self.assertRaises(ValueError):
+            FrameBuffer(delta=DeltaFilter(), frame_cache=FrameCache())
+
+
+if __name__ == "__main__":
+    unittest.main()
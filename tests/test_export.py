@@ -0,0 +1,98 @@
+import csv
+import io
+import json
+import os
+import tempfile
+import unittest
+from fastnet_decoder import CsvExporter, FrameBuffer, JsonLinesExporter, LazyFrame, decode_frame
+
+APPARENT_FRAME = bytes.fromhex("ff051801e34e0a02c402754d6100464f610024520af683f6835113a0064b")
+RUDDER_FRAME = bytes.fromhex("ff120e01e00b038c274908cc294a0a1cdd6067e5")
+TIDE_FRAME = bytes.fromhex("ff600a019684070066010e8383bb023d")
+
+
+class TestCsvExporter(unittest.TestCase):
+    def test_one_column_per_channel(self):
+        """
+        Every output type gives the same rows, with empty cells for channels a frame does not carry.
+        """
+        frames = [
+            decode_frame(APPARENT_FRAME),
+            decode_frame(RUDDER_FRAME, compact=True),
+            LazyFrame(APPARENT_FRAME, timestamp_ns=42),
+        ]
+        output = io.StringIO()
+        with CsvExporter(output, channels=[0x51, 0x49, 0x4D]) as exporter:
+            exporter.write_frames(frames)
+            exporter.write(decode_frame(TIDE_FRAME))  # No exported channel, no row
+        self.assertEqual(exporter.rows, 3)
+
+        rows = list(csv.reader(io.StringIO(output.getvalue())))
+        self.assertEqual(rows[0], ["timestamp_ns", "source", "Apparent Wind Angle", "Heading", "Apparent Wind Speed (Knots)"])
+        self.assertEqual(rows[1], ["", "Normal CPU (Wind Board in H2000)", "-6.0", "", "7.0"])
+        self.assertEqual(rows[2], ["", "Halcyon Gyro-Stabilised Compass (via Pilot ACP)", "", "41.0", ""])
+        self.assertEqual(rows[3], ["42", "Normal CPU (Wind Board in H2000)", "-6.0", "", "7.0"])
+
+    def test_batched_writes(self):
+        """
+        Rows reach the file in batches, and all of them once closed.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "race.csv")
+            exporter = CsvExporter(path, channels=[0x51], batch_size=100)
+            frame = decode_frame(APPARENT_FRAME, compact=True)
+            for _ in range(150):
+                exporter.write(frame)
+            exporter._file.flush()
+            with open(path) as f:
+                self.assertEqual(len(f.read().splitlines()), 100)
+            exporter.close()
+            with open(path) as f:
+                self.assertEqual(len(f.read().splitlines()), 151)
+
+    def test_frame_handler(self):
+        """
+        An exporter can consume frames straight from a FrameBuffer.
+        """
+        output = io.StringIO()
+        exporter = CsvExporter(output, channels=[0x0B])
+        frame_buffer = FrameBuffer(compact=True, queue_frames=False)
+        frame_buffer.on_frame(exporter.write)
+        frame_buffer.add_to_buffer(APPARENT_FRAME + RUDDER_FRAME, 7_000)
+        frame_buffer.get_complete_frames()
+        exporter.close()
+        self.assertEqual(output.getvalue().splitlines()[1:], ["7000,Halcyon Gyro-Stabilised Compass (via Pilot ACP),-39.0"])
+
+
+class TestJsonLinesExporter(unittest.TestCase):
+    def test_values_by_name(self):
+        """
+        Each line holds the interpreted values of a frame, keyed by channel name.
+        """
+        output = io.StringIO()
+        with JsonLinesExporter(output) as exporter:
+            exporter.write(decode_frame(APPARENT_FRAME))
+            exporter.write(LazyFrame(RUDDER_FRAME, timestamp_ns=5))
+        lines = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual(len(lines), 2)
+        expected = {name: channel["interpreted"] for name, channel in decode_frame(APPARENT_FRAME)["values"].items()}
+        self.assertEqual(lines[0], {"timestamp_ns": None, "source": "Normal CPU (Wind Board in H2000)", "values": expected})
+        self.assertEqual(lines[1]["timestamp_ns"], 5)
+        self.assertEqual(lines[1]["values"]["Rudder Angle"], -39.0)
+        self.assertEqual(lines[1]["values"]["Heading"], 41.0)
+
+    def test_channel_filter(self):
+        """
+        Only the selected channels are written, whichever output type is given.
+        """
+        output = io.StringIO()
+        with JsonLinesExporter(output, channels={0x49}) as exporter:
+            exporter.write(decode_frame(RUDDER_FRAME))
+            exporter.write(decode_frame(RUDDER_FRAME, compact=True))
+            exporter.write(decode_frame(APPARENT_FRAME, compact=True))
+        lines = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual([line["values"] for line in lines], [{"Heading": 41.0}, {"Heading": 41.0}])
+
+
+if __name__ == "__main__":
+    unittest.main()
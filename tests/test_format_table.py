@@ -0,0 +1,38 @@
+import datetime
+import unittest
+from fastnet_decoder.decode_fastnet import decode_format_and_data
+from fastnet_decoder.formats import FORMAT_DECODERS, FORMAT_INFO, FORMAT_SIZES
+
+
+class TestFormatTable(unittest.TestCase):
+    def test_table_covers_every_format_byte(self):
+        """
+        The precompiled tables have one entry per possible format byte.
+        """
+        self.assertEqual(len(FORMAT_DECODERS), 256)
+        self.assertEqual(FORMAT_INFO[0xC3], (1000, 1, 3))
+        self.assertEqual(FORMAT_SIZES[0x51], 2)
+        self.assertEqual(FORMAT_SIZES[0x0A], 4)
+
+    def test_divisor_and_sign(self):
+        """
+        Divisors are bound into the decoder and the 0x03 segment byte sets the sign.
+        """
+        self.assertEqual(FORMAT_DECODERS[0x51](bytes.fromhex("fff6"))[1], -1.0)
+        self.assertEqual(FORMAT_DECODERS[0x03](bytes.fromhex("8c27"))[1], -39.0)
+        self.assertEqual(FORMAT_DECODERS[0x83](bytes.fromhex("bb02"))[1], 0.02)
+
+    def test_decode_format_and_data(self):
+        """
+        decode_format_and_data keeps its dictionary output.
+        """
+        decoded = decode_format_and_data(0x75, 0x05, bytes.fromhex("00010203"))
+        self.assertEqual(decoded["interpreted"], datetime.timedelta(hours=1, minutes=2, seconds=3))
+        self.assertEqual(decoded["channel_id"], "0x75")
+        self.assertEqual(decoded["data_bytes"], "00010203")
+        self.assertIsNone(decode_format_and_data(0x41, 0x09, b"\x00\x00"))
+        self.assertIsNone(decode_format_and_data(0x41, 0x01, b"\x00"))
+
+
+if __name__ == "__main__":
+    unittest.main()
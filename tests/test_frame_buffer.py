@@ -0,0 +1,50 @@
+import unittest
+from fastnet_decoder import FrameBuffer
+
+APPARENT_FRAME = bytes.fromhex("ff051801e34e0a02c402754d6100464f610024520af683f6835113a0064b")
+TIDE_FRAME = bytes.fromhex("ff600a019684070066010e8383bb023d")
+
+
+class TestFrameBuffer(unittest.TestCase):
+    def test_frames_split_across_chunks(self):
+        """
+        Frames fed in arbitrary chunk sizes are all extracted and the buffer is fully consumed.
+        """
+        stream = (APPARENT_FRAME + TIDE_FRAME) * 20
+        frame_buffer = FrameBuffer(max_buffer_size=64)
+        for offset in range(0, len(stream), 7):
+            frame_buffer.add_to_buffer(stream[offset:offset + 7])
+            frame_buffer.get_complete_frames()
+
+        self.assertEqual(frame_buffer.frame_queue.qsize(), 40)
+        self.assertEqual(frame_buffer.get_buffer_size(), 0)
+
+    def test_resync_after_noise(self):
+        """
+        Garbage in front of a run of frames is skipped and the frames are still decoded.
+        """
+        frame_buffer = FrameBuffer()
+        frame_buffer.add_to_buffer(b"\x01" * 39 + TIDE_FRAME * 20)
+        frame_buffer.get_complete_frames()
+
+        self.assertGreater(frame_buffer.frame_queue.qsize(), 0)
+        while not frame_buffer.frame_queue.empty():
+            decoded = frame_buffer.frame_queue.get()
+            self.assertEqual(decoded["command"], "Broadcast")
+
+    def test_trim_keeps_newest_bytes(self):
+        """
+        When the buffer overflows only the newest `max_buffer_size` bytes are kept.
+        """
+        frame_buffer = FrameBuffer(max_buffer_size=32)
+        frame_buffer.add_to_buffer(bytes(20))
+        frame_buffer.add_to_buffer(bytes(range(20)))
+        self.assertEqual(frame_buffer.get_buffer_size(), 32)
+        self.assertEqual(frame_buffer.buffer, bytearray(12) + bytearray(range(20)))
+
+        frame_buffer.add_to_buffer(bytes(range(100)))
+        self.assertEqual(frame_buffer.buffer, bytearray(range(68, 100)))
+
+
+if __name__ == "__main__":
+    unittest.main()
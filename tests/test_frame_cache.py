@@ -0,0 +1,50 @@
+import unittest
+from fastnet_decoder import FrameBuffer, FrameCache
+
+APPARENT_FRAME = bytes.fromhex("ff051801e34e0a02c402754d6100464f610024520af683f6835113a0064b")
+RUDDER_FRAME = bytes.fromhex("ff120e01e00b038c274908cc294a0a1cdd6067e5")
+RUDDER_FRAME_2 = bytes.fromhex("ff120e01e00b038c284908cc294a0a1cdd6067e4")
+
+
+class TestFrameCache(unittest.TestCase):
+    def test_repeated_frames_reuse_result(self):
+        """
+        Byte-identical frames are decoded once and the same result is queued again.
+        """
+        frame_buffer = FrameBuffer(frame_cache=FrameCache())
+        frame_buffer.add_to_buffer(APPARENT_FRAME * 3)
+        frame_buffer.get_complete_frames()
+
+        frames = [frame_buffer.frame_queue.get_nowait() for _ in range(3)]
+        self.assertIs(frames[0], frames[2])
+        self.assertEqual(frame_buffer.frame_cache.stats()["hits"], 2)
+        self.assertEqual(frame_buffer.frame_cache.stats()["misses"], 1)
+
+    def test_changed_only(self):
+        """
+        In changed-only mode a frame is dropped only when it repeats the previous frame with its header.
+        """
+        frame_buffer = FrameBuffer(frame_cache=FrameCache(changed_only=True))
+        stream = RUDDER_FRAME + RUDDER_FRAME + APPARENT_FRAME + RUDDER_FRAME_2 + RUDDER_FRAME + RUDDER_FRAME
+        frame_buffer.add_to_buffer(stream)
+        frame_buffer.get_complete_frames()
+
+        rudder = [frame["values"]["Rudder Angle"]["interpreted"]
+                  for frame in list(frame_buffer.frame_queue.queue) if "Rudder Angle" in frame["values"]]
+        self.assertEqual(rudder, [-39.0, -40.0, -39.0])
+        self.assertEqual(frame_buffer.frame_queue.qsize(), 4)
+        self.assertEqual(frame_buffer.frame_cache.suppressed, 2)
+
+    def test_eviction_is_bounded(self):
+        """
+        The cache never holds more than maxsize frames.
+        """
+        cache = FrameCache(maxsize=1)
+        cache.lookup(APPARENT_FRAME, bytes)
+        cache.lookup(RUDDER_FRAME, bytes)
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.evictions, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+from unittest import mock
+from fastnet_decoder import FrameBuffer, LazyFrame, decode_frame
+from fastnet_decoder import lazy_frame
+
+APPARENT_FRAME = bytes.fromhex("ff051801e34e0a02c402754d6100464f610024520af683f6835113a0064b")
+
+
+class TestLazyFrame(unittest.TestCase):
+    def test_decodes_only_read_channels(self):
+        """
+        Only the channels that are read are decoded, and each only once.
+        """
+        frame = LazyFrame(APPARENT_FRAME)
+        with mock.patch.object(lazy_frame, "decode_format_and_data",
+                               wraps=lazy_frame.decode_format_and_data) as decoder:
+            self.assertEqual(frame.channel_ids(), [0x4E, 0x4D, 0x4F, 0x52, 0x51])
+            self.assertEqual(decoder.call_count, 0)
+
+            first = frame[0x51]
+            self.assertIs(frame[0x51], first)
+            self.assertEqual(decoder.call_count, 1)
+
+        self.assertEqual(first["interpreted"], -6.0)
+        self.assertNotIn(0x41, frame)
+        self.assertIsNone(frame.get(0x41))
+
+    def test_as_dict_matches_decode_frame(self):
+        """
+        Decoding every channel gives the same output as decode_frame.
+        """
+        self.assertEqual(LazyFrame(APPARENT_FRAME).as_dict(), decode_frame(APPARENT_FRAME))
+
+    def test_frame_buffer_lazy(self):
+        """
+        A lazy FrameBuffer queues LazyFrame objects holding their own copy of the frame.
+        """
+        frame_buffer = FrameBuffer(lazy=True)
+        frame_buffer.add_to_buffer(APPARENT_FRAME)
+        frame_buffer.get_complete_frames()
+        frame_buffer.add_to_buffer(bytes(len(APPARENT_FRAME)))
+
+        frame = frame_buffer.frame_queue.get_nowait()
+        self.assertIsInstance(frame, LazyFrame)
+        self.assertEqual(frame.frame, APPARENT_FRAME)
+        self.assertEqual(frame.from_address, 0x05)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,33 @@
+import unittest
+from fastnet_decoder.decode_fastnet import decode_frame, decode_ascii_frame
+from fastnet_decoder.utils import calculate_checksum
+
+
+def build_frame(to_address, from_address, command, body):
+    header = bytes([to_address, from_address, len(body), command])
+    return header + bytes([calculate_checksum(header)]) + body + bytes([calculate_checksum(body)])
+
+
+class TestMemoryviewDecode(unittest.TestCase):
+    def test_memoryview_matches_bytes(self):
+        """
+        Decoding a memoryview of a frame gives the same result as decoding the bytes.
+        """
+        frame_data = bytes.fromhex("ff051801e34e0a02c402754d6100464f610024520af683f6835113a0064b")
+        storage = bytearray(b"\x00" * 3 + frame_data)
+        view = memoryview(storage)[3:]
+
+        self.assertEqual(decode_frame(view), decode_frame(frame_data))
+
+    def test_ascii_memoryview(self):
+        """
+        ASCII frames decode from a memoryview without a bytes copy.
+        """
+        frame_data = build_frame(0xFF, 0x05, 0x03, bytes([0x47, 0x00]) + b"5030.12N00112.34W ")
+        decoded = decode_ascii_frame(memoryview(frame_data))
+
+        self.assertEqual(decoded["values"]["LatLon"]["interpreted"], "5030.12N00112.34W")
+
+
+if __name__ == "__main__":
+    unittest.main()
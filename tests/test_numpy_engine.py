@@ -0,0 +1,78 @@
+import random
+import unittest
+from fastnet_decoder import decode_frames
+from fastnet_decoder.numpy_engine import np
+from fastnet_decoder.utils import calculate_checksum
+
+APPARENT_FRAME = bytes.fromhex("ff051801e34e0a02c402754d6100464f610024520af683f6835113a0064b")
+RUDDER_FRAME = bytes.fromhex("ff120e01e00b038c274908cc294a0a1cdd6067e5")
+TIDE_FRAME = bytes.fromhex("ff600a019684070066010e8383bb023d")
+
+
+def build_frame(source, body):
+    header = bytes([0xFF, source, len(body), 0x01])
+    return header + bytes([calculate_checksum(header)]) + body + bytes([calculate_checksum(body)])
+
+
+def assert_same_columns(test, expected, actual):
+    test.assertEqual(actual.frame_count, expected.frame_count)
+    test.assertEqual(actual.sources, expected.sources)
+    test.assertEqual(actual.timestamps, expected.timestamps)
+    test.assertEqual(list(actual), list(expected))
+    for channel_id in expected:
+        test.assertEqual(actual[channel_id].values, expected[channel_id].values)
+        test.assertEqual(actual[channel_id].frames, expected[channel_id].frames)
+        test.assertEqual(actual[channel_id].timestamps, expected[channel_id].timestamps)
+
+
+def random_bytes(rng, count):
+    # Random.randbytes needs Python 3.9
+    return bytes(rng.randrange(256) for _ in range(count))
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestNumpyEngine(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(7)
+        # Random data for every numeric, timer and text format, with the layout varying per frame
+        format_bytes = [0x01, 0x42, 0x03, 0x84, 0x05, 0x06, 0xC7, 0x08, 0x0A, 0x51, 0x13]
+        sizes = {0x01: 2, 0x02: 2, 0x03: 2, 0x04: 4, 0x05: 4, 0x06: 4, 0x07: 4, 0x08: 2, 0x0A: 4}
+        self.frames = []
+        for _ in range(300):
+            body = b""
+            for channel_id in rng.sample(range(0x40, 0x50), 3):
+                format_byte = rng.choice(format_bytes)
+                body += bytes([channel_id, format_byte]) + random_bytes(rng, sizes[format_byte & 0x0F])
+            self.frames.append(build_frame(rng.choice([0x05, 0x12]), body))
+        self.frames += [APPARENT_FRAME, RUDDER_FRAME, TIDE_FRAME] * 50
+        rng.shuffle(self.frames)
+        self.stream = b"".join(random_bytes(rng, rng.choice([0, 0, 3, 20])) + frame for frame in self.frames)
+
+    def test_stream_matches_python_engine(self):
+        """
+        The NumPy engine resyncs and decodes a noisy stream exactly like the Python engine.
+        """
+        expected = decode_frames(self.stream, engine="python")
+        self.assertGreaterEqual(expected.frame_count, len(self.frames))
+        assert_same_columns(self, expected, decode_frames(self.stream, engine="numpy"))
+
+    def test_items_match_python_engine(self):
+        """
+        Timestamped items, including corrupt ones, and channel filters give the same columns.
+        """
+        items = [(index * 1000, frame) for index, frame in enumerate(self.frames)]
+        items.insert(5, (1, RUDDER_FRAME[:-1] + b"\x00"))
+        items.insert(9, (2, RUDDER_FRAME[:4]))
+        for channels in (None, {0x41, 0x4E, 0x51}):
+            assert_same_columns(self, decode_frames(items, channels, engine="python"),
+                                decode_frames(items, channels, engine="numpy"))
+
+    def test_empty_and_unknown_engine(self):
+        self.assertEqual(decode_frames(b"", engine="numpy").frame_count, 0)
+        self.assertEqual(decode_frames([], engine="numpy").frame_count, 0)
+        with self.assertRaises(ValueError):
+            decode_frames(b"", engine="fortran")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import os
+import random
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+from fastnet_decoder import decode_file, decode_frames
+from fastnet_decoder.parallel import split_ranges
+from fastnet_decoder.utils import calculate_checksum
+
+APPARENT_FRAME = bytes.fromhex("ff051801e34e0a02c402754d6100464f610024520af683f6835113a0064b")
+RUDDER_FRAME = bytes.fromhex("ff120e01e00b038c274908cc294a0a1cdd6067e5")
+TIDE_FRAME = bytes.fromhex("ff600a019684070066010e8383bb023d")
+
+
+def assert_same_columns(test, expected, actual):
+    test.assertEqual(actual.frame_count, expected.frame_count)
+    test.assertEqual(actual.sources, expected.sources)
+    test.assertEqual(list(actual), list(expected))
+    for channel_id in expected:
+        test.assertEqual(actual[channel_id].values, expected[channel_id].values)
+        test.assertEqual(actual[channel_id].frames, expected[channel_id].frames)
+
+
+def random_bytes(rng, count):
+    # Random.randbytes needs Python 3.9
+    return bytes(rng.randrange(256) for _ in range(count))
+
+
+class TestParallelDecode(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(3)
+        frames = [APPARENT_FRAME, RUDDER_FRAME, TIDE_FRAME]
+        stream = b"".join(random_bytes(rng, rng.choice([0, 0, 0, 5, 300])) + rng.choice(frames) for _ in range(3000))
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "raw.bin")
+        with open(self.path, "wb") as f:
+            f.write(stream)
+        self.expected = decode_frames(stream, engine="python")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_process_pool_matches_sequential_decode(self):
+        """
+        Ranges split through frames and noise decode, on separate processes, to the sequential result.
+        """
+        columns = decode_file(self.path, workers=3, min_range_size=4096)
+        assert_same_columns(self, self.expected, columns)
+
+    def test_python_engine_and_channel_filter(self):
+        with ThreadPoolExecutor(2) as executor:
+            columns = decode_file(self.path, channels={0x51}, engine="python", executor=executor, min_range_size=1000)
+        self.assertEqual(list(columns), [0x51])
+        self.assertEqual(columns[0x51].values, self.expected[0x51].values)
+        self.assertEqual(columns[0x51].frames, self.expected[0x51].frames)
+
+    def test_false_header_at_range_boundary(self):
+        """
+        A worker that resyncs on a frame carried inside another frame's body is decoded again from the real chain.
+        """
+        header = bytes([0xFF, 0x05, len(TIDE_FRAME), 0x01])
+        outer = header + bytes([calculate_checksum(header)]) + TIDE_FRAME + bytes([calculate_checksum(TIDE_FRAME)])
+        prefix = RUDDER_FRAME * 20
+        # The boundary falls in the outer frame's header, so the second range starts with the inner frame
+        suffix = RUDDER_FRAME * 5
+        suffix += b"\x55" * (len(prefix) + 6 - len(outer) - len(suffix))
+        stream = prefix + outer + suffix
+        self.assertEqual(split_ranges(len(stream), 4, len(stream) // 2)[1][0], len(prefix) + 3)
+        with open(self.path, "wb") as f:
+            f.write(stream)
+
+        expected = decode_frames(stream, engine="python")
+        self.assertNotIn(0x60, expected.sources)
+        for engine in ("python", "auto"):
+            with mock.patch("fastnet_decoder.parallel.LOOKBACK_SIZE", 2), ThreadPoolExecutor(2) as executor:
+                columns = decode_file(self.path, workers=1, engine=engine, executor=executor,
+                                      min_range_size=len(stream) // 2)
+            assert_same_columns(self, expected, columns)
+
+    def test_split_ranges(self):
+        self.assertEqual(split_ranges(10, 4, 3), [(0, 3), (3, 6), (6, 10)])
+        self.assertEqual(split_ranges(10, 4, 100), [(0, 10)])
+
+
+if __name__ == "__main__":
+    unittest.main()
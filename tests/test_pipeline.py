@@ -0,0 +1,69 @@
+import threading
+import unittest
+from fastnet_decoder import BatchChannel, DropOldest, FramePipeline
+
+RUDDER_FRAME = bytes.fromhex("ff120e01e00b038c274908cc294a0a1cdd6067e5")
+TIDE_FRAME = bytes.fromhex("ff600a019684070066010e8383bb023d")
+
+
+class TestFramePipeline(unittest.TestCase):
+    def test_frames_pass_through_all_stages(self):
+        """
+        Chunks read by the reader thread come out of the pipeline as decoded frames, in order.
+        """
+        stream = (RUDDER_FRAME + TIDE_FRAME) * 50
+        chunks = iter([stream[i:i + 7] for i in range(0, len(stream), 7)] + [b"", None])
+
+        with FramePipeline(lambda: next(chunks), compact=True, timestamps=True) as pipeline:
+            frames = list(pipeline)
+
+        self.assertEqual(len(frames), 100)
+        self.assertEqual([frame.from_address for frame in frames[:2]], [0x12, 0x60])
+        self.assertTrue(all(frame.timestamp_ns is not None for frame in frames))
+        self.assertEqual(pipeline.stats()["dropped_frames"], 0)
+
+    def test_reader_error_ends_pipeline(self):
+        def read():
+            raise OSError("device unplugged")
+
+        with self.assertLogs("fastnet_decoder", level="ERROR"):
+            with FramePipeline(read) as pipeline:
+                self.assertEqual(list(pipeline), [])
+
+    def test_overflow_policy_rejected(self):
+        """
+        Frames reach consumers through a BatchChannel, so a FrameBuffer overflow policy would be ignored.
+        """
+        with self.assertRaises(ValueError):
+            FramePipeline(lambda: None, overflow=DropOldest())
+
+
+class TestBatchChannel(unittest.TestCase):
+    def test_drop_policies(self):
+        newest = BatchChannel(4)
+        newest.put_batch([1, 2, 3])
+        newest.put_batch([4, 5, 6])
+        self.assertEqual(newest.get_batch(0), [1, 2, 3, 4])
+        self.assertEqual(newest.dropped, 2)
+
+        oldest = BatchChannel(4, drop_oldest=True)
+        oldest.put_batch([1, 2, 3])
+        oldest.put_batch([4, 5])
+        oldest.put_batch([6])
+        self.assertEqual(oldest.get_batch(0), [3, 4, 5, 6])
+        oldest.put_batch([1, 2, 3, 4, 5, 6])
+        self.assertEqual(oldest.get_batch(0), [3, 4, 5, 6])
+        self.assertEqual(oldest.dropped, 4)
+
+    def test_close_wakes_waiting_consumer(self):
+        channel = BatchChannel(10)
+        result = []
+        consumer = threading.Thread(target=lambda: result.append(channel.get_batch()))
+        consumer.start()
+        channel.close()
+        consumer.join(1)
+        self.assertEqual(result, [[]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import random
+import unittest
+from fastnet_decoder import FrameBuffer
+from fastnet_decoder.sync import find_header_offsets, np
+
+TIDE_FRAME = bytes.fromhex("ff600a019684070066010e8383bb023d")
+
+
+def slow_header_offsets(data):
+    return [i for i in range(len(data) - 4) if sum(data[i:i + 5]) % 256 == 0]
+
+
+class TestHeaderScan(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(1)
+        self.noise = bytes(rng.randrange(256) for _ in range(4000)) + TIDE_FRAME
+
+    def test_python_scan(self):
+        """
+        The rolling scan finds the same offsets as checking each offset in turn.
+        """
+        expected = slow_header_offsets(self.noise)
+        self.assertEqual(find_header_offsets(self.noise, use_numpy=False), expected)
+        self.assertIn(4000, expected)
+
+    def test_scan_range(self):
+        """
+        Only headers that fit inside [start, end) are reported.
+        """
+        offsets = find_header_offsets(self.noise, 100, 200, use_numpy=False)
+        self.assertEqual(offsets, [i for i in slow_header_offsets(self.noise) if 100 <= i <= 195])
+
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_numpy_scan(self):
+        """
+        The NumPy path agrees with the pure Python scan.
+        """
+        view = memoryview(bytearray(self.noise))
+        self.assertEqual(find_header_offsets(view, 7, 3000, use_numpy=True),
+                         find_header_offsets(view, 7, 3000, use_numpy=False))
+
+    def test_frame_buffer_resync(self):
+        """
+        A frame after a burst of noise is recovered, even when the noise claims a large body size.
+        """
+        frame_buffer = FrameBuffer()
+        frame_buffer.add_to_buffer(bytes(range(1, 40)) + TIDE_FRAME)
+        frame_buffer.get_complete_frames()
+
+        self.assertEqual(frame_buffer.frame_queue.qsize(), 1)
+        self.assertEqual(frame_buffer.frame_queue.get()["command"], "Broadcast")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+from fastnet_decoder import FrameBuffer, FrameCache
+
+APPARENT_FRAME = bytes.fromhex("ff051801e34e0a02c402754d6100464f610024520af683f6835113a0064b")
+TIDE_FRAME = bytes.fromhex("ff600a019684070066010e8383bb023d")
+
+
+class TestTimestamps(unittest.TestCase):
+    def test_frames_interpolated_from_chunk_timestamp(self):
+        """
+        Each frame in a chunk is stamped with the chunk time minus the wire time of the bytes after it.
+        """
+        frame_buffer = FrameBuffer()
+        byte_ns = frame_buffer.byte_time_ns
+        frame_buffer.add_to_buffer(APPARENT_FRAME + TIDE_FRAME, timestamp_ns=10_000_000_000)
+        frame_buffer.get_complete_frames()
+
+        first = frame_buffer.frame_queue.get_nowait()
+        second = frame_buffer.frame_queue.get_nowait()
+        self.assertEqual(first["timestamp_ns"], 10_000_000_000 - len(TIDE_FRAME) * byte_ns)
+        self.assertEqual(second["timestamp_ns"], 10_000_000_000)
+
+    def test_frame_split_across_chunks(self):
+        """
+        A frame is stamped from the chunk that completed it.
+        """
+        frame_buffer = FrameBuffer(compact=True)
+        frame_buffer.add_to_buffer(TIDE_FRAME[:5], timestamp_ns=1_000)
+        frame_buffer.add_to_buffer(TIDE_FRAME[5:] + TIDE_FRAME[:3], timestamp_ns=5_000_000)
+        frame_buffer.get_complete_frames()
+
+        record = frame_buffer.frame_queue.get_nowait()
+        self.assertEqual(record.timestamp_ns, 5_000_000 - 3 * frame_buffer.byte_time_ns)
+        self.assertEqual(record.as_dict()["timestamp_ns"], record.timestamp_ns)
+
+    def test_cached_frames_get_their_own_timestamp(self):
+        """
+        Cached results are copied before stamping, so repeats keep their own arrival time.
+        """
+        frame_buffer = FrameBuffer(frame_cache=FrameCache())
+        frame_buffer.add_to_buffer(TIDE_FRAME, timestamp_ns=1_000_000)
+        frame_buffer.add_to_buffer(TIDE_FRAME, timestamp_ns=2_000_000)
+        frame_buffer.get_complete_frames()
+
+        first = frame_buffer.frame_queue.get_nowait()
+        second = frame_buffer.frame_queue.get_nowait()
+        self.assertEqual((first["timestamp_ns"], second["timestamp_ns"]), (1_000_000, 2_000_000))
+
+    def test_no_timestamp_by_default(self):
+        """
+        Without timestamps the output is unchanged.
+        """
+        frame_buffer = FrameBuffer()
+        frame_buffer.add_to_buffer(TIDE_FRAME)
+        frame_buffer.get_complete_frames()
+        self.assertNotIn("timestamp_ns", frame_buffer.frame_queue.get_nowait())
+
+    def test_arrivals_bounded_on_noise(self):
+        """
+        Chunks skipped by resyncs or trims do not keep their timestamps, and frames after the noise are still stamped.
+        """
+        frame_buffer = FrameBuffer(max_buffer_size=256)
+        with self.assertLogs("fastnet_decoder", level="WARNING"):
+            for chunk in range(20_000):
+                frame_buffer.add_to_buffer(b"\x55" * 64, timestamp_ns=chunk)
+                frame_buffer.get_complete_frames()
+            for chunk in range(100):
+                frame_buffer.add_to_buffer(b"\x55" * 300, timestamp_ns=chunk)  # Trimmed before framing
+        self.assertLessEqual(len(frame_buffer._arrivals), 2)
+
+        frame_buffer.add_to_buffer(TIDE_FRAME, timestamp_ns=30_000)
+        frame_buffer.get_complete_frames()
+        self.assertEqual(frame_buffer.frame_queue.get_nowait()["timestamp_ns"], 30_000)
+        self.assertLessEqual(len(frame_buffer._arrivals), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import asyncio
+import os
+import select
+import unittest
+from unittest import mock
+from fastnet_decoder import FrameBuffer, SerialTransport
+from fastnet_decoder import transport
+
+try:
+    import pty
+except ImportError:
+    pty = None
+
+APPARENT_FRAME = bytes.fromhex("ff051801e34e0a02c402754d6100464f610024520af683f6835113a0064b")
+RUDDER_FRAME = bytes.fromhex("ff120e01e00b038c274908cc294a0a1cdd6067e5")
+
+
+@unittest.skipIf(pty is None, "pty is not available")
+class TestSerialTransport(unittest.TestCase):
+    def setUp(self):
+        self.master, slave = os.openpty()
+        self.slave_path = os.ttyname(slave)
+        self.frame_buffer = FrameBuffer(compact=True)
+        self.transport = SerialTransport(self.slave_path, self.frame_buffer, timestamps=True)
+        os.close(slave)
+
+    def tearDown(self):
+        self.transport.close()
+        if self.master is not None:
+            os.close(self.master)
+
+    def drain(self):
+        frames = []
+        while not self.frame_buffer.frame_queue.empty():
+            frames.append(self.frame_buffer.frame_queue.get())
+        return frames
+
+    def test_nonblocking_read(self):
+        """
+        A read with nothing pending returns at once; pending bytes are read into the buffer and framed.
+        """
+        self.assertEqual(self.transport.read_available(), 0)
+        os.write(self.master, APPARENT_FRAME + RUDDER_FRAME[:7])
+        select.select([self.transport], [], [], 1)
+        self.assertEqual(self.transport.read_available(), len(APPARENT_FRAME) + 7)
+
+        os.write(self.master, RUDDER_FRAME[7:])
+        select.select([self.transport], [], [], 1)
+        self.transport.read_available()
+        frames = self.drain()
+        self.assertEqual([frame.from_address for frame in frames], [0x05, 0x12])
+        self.assertIsNotNone(frames[0].timestamp_ns)
+
+    def test_read_without_readv(self):
+        """
+        Without os.readv, as on Windows, reads are copied into the buffer with the same result.
+        """
+        with mock.patch.object(transport, "_read_into", transport._read_copy):
+            os.write(self.master, APPARENT_FRAME + RUDDER_FRAME[:7])
+            select.select([self.transport], [], [], 1)
+            self.assertEqual(self.transport.read_available(), len(APPARENT_FRAME) + 7)
+            os.write(self.master, RUDDER_FRAME[7:])
+            select.select([self.transport], [], [], 1)
+            self.transport.read_available()
+        self.assertEqual([frame.from_address for frame in self.drain()], [0x05, 0x12])
+
+    def test_run_until_hangup(self):
+        """
+        run() reads until the other end of the pty is closed.
+        """
+        os.write(self.master, RUDDER_FRAME * 3)
+        select.select([self.transport], [], [], 1)
+        self.transport.read_available()
+        os.close(self.master)
+        self.master = None
+        self.transport.run(timeout=1)
+        self.assertTrue(self.transport.eof)
+        self.assertEqual(len(self.drain()), 3)
+
+    def test_asyncio_reader(self):
+        """
+        Attached to an event loop, the transport reads whenever the pty becomes readable.
+        """
+        async def run():
+            self.transport.attach(asyncio.get_running_loop())
+            os.write(self.master, RUDDER_FRAME * 2)
+            for _ in range(100):
+                if self.frame_buffer.frame_queue.qsize() == 2:
+                    break
+                await asyncio.sleep(0.01)
+            self.transport.detach()
+
+        asyncio.run(run())
+        self.assertEqual(len(self.drain()), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()